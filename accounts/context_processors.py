@@ -0,0 +1,10 @@
+from django.utils.functional import SimpleLazyObject
+
+from .membership import is_member
+
+
+def membership(request):
+    """Expose ``is_member`` to templates, resolved only if a template reads it"""
+    return {
+        'is_member': SimpleLazyObject(lambda: is_member(request.user)),
+    }
@@ -0,0 +1,81 @@
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponseForbidden
+
+MEMBERS_GROUP = 'members'
+
+
+def _get_cache():
+    return caches[getattr(settings, 'MEMBERSHIP_CACHE_ALIAS', 'default')]
+
+
+def _cache_key(user_id):
+    return f'membership:{user_id}'
+
+
+def is_member(user):
+    """
+    Whether ``user`` belongs to the members group.
+
+    The flag is resolved once per user and kept in the cache until their
+    group membership changes, and memoised on the user object for the rest
+    of the request, so repeated checks cost no queries.
+    """
+    if not user.is_authenticated:
+        return False
+
+    if not hasattr(user, '_is_member'):
+        cache = _get_cache()
+        key = _cache_key(user.pk)
+        flag = cache.get(key)
+        if flag is None:
+            flag = user.groups.filter(name=MEMBERS_GROUP).exists()
+            cache.set(key, flag, getattr(settings, 'MEMBERSHIP_CACHE_TIMEOUT', None))
+        user._is_member = flag
+    return user._is_member
+
+
+async def ais_member(user):
+    """Async variant of ``is_member`` for async views"""
+    if not user.is_authenticated:
+        return False
+
+    if not hasattr(user, '_is_member'):
+        cache = _get_cache()
+        key = _cache_key(user.pk)
+        flag = await cache.aget(key)
+        if flag is None:
+            flag = await user.groups.filter(name=MEMBERS_GROUP).aexists()
+            await cache.aset(key, flag, getattr(settings, 'MEMBERSHIP_CACHE_TIMEOUT', None))
+        user._is_member = flag
+    return user._is_member
+
+
+def invalidate_membership(user_ids):
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    _get_cache().delete_many(keys)
+    # Again once committed, in case another worker re-cached the old flag meanwhile
+    transaction.on_commit(lambda: _get_cache().delete_many(keys))
+
+
+def members_required(view_func):
+    """Require a logged-in member, answering 403 to other logged-in users"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            if not await ais_member(await request.auser()):
+                return HttpResponseForbidden("Access denied. Members only.")
+            return await view_func(request, *args, **kwargs)
+        return login_required(_wrapped_view)
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not is_member(request.user):
+            return HttpResponseForbidden("Access denied. Members only.")
+        return view_func(request, *args, **kwargs)
+    return login_required(_wrapped_view)
@@ -0,0 +1,25 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from .membership import invalidate_membership
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        # user.groups.add(...) / remove(...) / clear()
+        invalidate_membership([instance.pk])
+    elif action == 'pre_clear':
+        # group.user_set.clear(): collect the users before the rows go
+        invalidate_membership(instance.user_set.values_list('pk', flat=True))
+    else:
+        # group.user_set.add(...) / remove(...)
+        invalidate_membership(pk_set)
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_on_group_delete(sender, instance, **kwargs):
+    invalidate_membership(instance.user_set.values_list('pk', flat=True))
@@ -1,3 +1,51 @@
-from django.test import TestCase
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from pages.testing import TEST_CACHES, clear_caches
+
+from .membership import MEMBERS_GROUP, is_member
+
+
+@override_settings(CACHES=TEST_CACHES, REQUEST_INSTRUMENTATION_ENABLED=False)
+class MembershipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name=MEMBERS_GROUP)
+        cls.user = User.objects.create_user('member', password='secret')
+        cls.user.groups.add(cls.group)
+
+    def setUp(self):
+        clear_caches()
+
+    def check(self):
+        # A fresh user object, as the next request would load
+        return is_member(User.objects.get(pk=self.user.pk))
+
+    def test_flag_is_cached(self):
+        self.assertTrue(self.check())
+        with self.assertNumQueries(1):
+            self.assertTrue(self.check())
+
+    def test_flag_is_shared_by_every_worker(self):
+        self.check()
+        self.assertTrue(caches['pages'].get(f'membership:{self.user.pk}'))
+
+    def test_removing_the_user_revokes_membership(self):
+        self.assertTrue(self.check())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.remove(self.group)
+        self.assertFalse(self.check())
+
+    def test_clearing_the_group_revokes_membership(self):
+        self.assertTrue(self.check())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.clear()
+        self.assertFalse(self.check())
+
+    def test_members_only_view(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/members/').status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.clear()
+        self.assertEqual(self.client.get('/members/').status_code, 403)
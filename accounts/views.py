@@ -7,6 +7,8 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView
 from django.contrib.auth.models import User
 
+from .membership import MEMBERS_GROUP
+
 
 def register_view(request):
     """User registration view"""
@@ -16,7 +18,7 @@ def register_view(request):
             user = form.save()
             # Add user to 'members' group
             from django.contrib.auth.models import Group
-            members_group, created = Group.objects.get_or_create(name='members')
+            members_group, created = Group.objects.get_or_create(name=MEMBERS_GROUP)
             user.groups.add(members_group)
             
             login(request, user)
@@ -0,0 +1,72 @@
+"""
+Serialised pages cached per published revision.
+
+A listing fetches only the ids and revision markers of its page of
+results, reads their serialised form from the cache in one ``get_many``,
+and serialises just the misses. A new revision gets new keys, so nothing
+needs purging on publish; old entries age out after API_CACHE_TIMEOUT.
+Serialised pages carry their full URL, so the keys also cover the page's
+url_path (which a move or an ancestor's new slug rewrites) and the site
+roots the URL is built from.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from wagtail.models import Site
+
+KEY_PREFIX = 'api'
+
+# Enough to key a page's serialised form and build its ETag
+VERSION_FIELDS = ('id', 'live_revision_id', 'last_published_at', 'first_published_at', 'url_path')
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def page_version(page):
+    # Bulk-imported pages have no revision, so last_published_at tells them apart
+    published = page.last_published_at.timestamp() if page.last_published_at else None
+    return (page.pk, page.live_revision_id, published, page.url_path)
+
+
+def sites_version():
+    """Digest of the site roots full URLs are built from, read from Wagtail's cache"""
+    roots = [(root.root_path, root.root_url) for root in Site.get_site_root_paths()]
+    return hashlib.md5(repr(roots).encode('utf-8')).hexdigest()[:12]
+
+
+def fragment_key(kind, page, sites=None):
+    pk, revision_id, published, url_path = page_version(page)
+    raw = f'{sites or sites_version()}:{url_path}'
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()[:12]
+    return f'{KEY_PREFIX}:{kind}:{getattr(settings, "API_CACHE_VERSION", "")}:{pk}:{revision_id}:{published}:{digest}'
+
+
+def etag(*parts):
+    """ETag over the API version, the site roots and whatever decides a response's body"""
+    parts = (getattr(settings, 'API_CACHE_VERSION', ''), sites_version(), *parts)
+    return f'"{hashlib.md5(repr(parts).encode("utf-8")).hexdigest()}"'
+
+
+def get_serialised(kind, pages, serialise):
+    """
+    The serialised form of ``pages``, in order.
+
+    ``serialise(ids)`` serialises the pages with those ids, in any order,
+    and is called once, for the cache misses only.
+    """
+    cache = get_cache()
+    sites = sites_version()
+    keys = {page.pk: fragment_key(kind, page, sites) for page in pages}
+    cached = cache.get_many(keys.values())
+    missing = [pk for pk, key in keys.items() if key not in cached]
+    if missing:
+        fresh = {data['id']: data for data in serialise(missing)}
+        cache.set_many(
+            {keys[pk]: data for pk, data in fresh.items()},
+            getattr(settings, 'API_CACHE_TIMEOUT', 60 * 60 * 24),
+        )
+        cached.update({keys[pk]: data for pk, data in fresh.items()})
+    return [cached[keys[page.pk]] for page in pages if keys[page.pk] in cached]
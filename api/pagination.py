@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PublishedCursorPagination(CursorPagination):
+    """Newest first; the cursor keeps deep pages as cheap as the first"""
+
+    # Posts published together share a timestamp; the pk makes the order
+    # total so pages neither skip nor repeat them
+    ordering = ('-first_published_at', '-pk')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class TagCursorPagination(PublishedCursorPagination):
+    ordering = 'slug'
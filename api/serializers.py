@@ -0,0 +1,62 @@
+from rest_framework import serializers
+from taggit.models import Tag
+
+from blog.models import BlogPage
+from pages.models import ProjectPage
+
+PAGE_FIELDS = ['id', 'title', 'slug', 'url', 'first_published_at', 'last_published_at', 'is_members_only']
+
+
+class PageSerializer(serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+
+    def get_url(self, page):
+        return page.get_full_url()
+
+
+class StreamFieldSerializer(serializers.Field):
+    """A StreamField as its raw JSON: a list of {type, value, id}"""
+
+    def to_representation(self, value):
+        return value.get_prep_value()
+
+
+class BlogPostSerializer(PageSerializer):
+    tags = serializers.SlugRelatedField(many=True, read_only=True, slug_field='slug')
+
+    class Meta:
+        model = BlogPage
+        fields = PAGE_FIELDS + ['intro', 'featured_image', 'reading_time', 'word_count', 'tags']
+
+
+class BlogPostDetailSerializer(BlogPostSerializer):
+    content = StreamFieldSerializer()
+
+    class Meta(BlogPostSerializer.Meta):
+        fields = BlogPostSerializer.Meta.fields + ['meta_description', 'content']
+
+
+class ProjectSerializer(PageSerializer):
+    tech_stack = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProjectPage
+        fields = PAGE_FIELDS + [
+            'summary', 'featured_image', 'status', 'tech_stack', 'project_url', 'github_url', 'reading_time',
+        ]
+
+    def get_tech_stack(self, project):
+        return [item.value for item in project.tech_stack]
+
+
+class ProjectDetailSerializer(ProjectSerializer):
+    content = StreamFieldSerializer()
+
+    class Meta(ProjectSerializer.Meta):
+        fields = ProjectSerializer.Meta.fields + ['content']
+
+
+class TagSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tag
+        fields = ['name', 'slug']
@@ -0,0 +1,39 @@
+from wagtail.models import Site
+
+from pages.testing import SiteTestCase
+
+
+class PostApiTests(SiteTestCase):
+    def urls(self, response):
+        return [post['url'] for post in response.json()['results']]
+
+    def test_lists_live_posts_newest_first(self):
+        response = self.client.get('/api/posts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.urls(response), [f'http://localhost/cms/blog/post-{i}/' for i in range(3)])
+
+    def test_unchanged_listing_answers_304(self):
+        response = self.client.get('/api/posts/')
+        revalidated = self.client.get('/api/posts/', headers={'if_none_match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_publish_refreshes_the_post(self):
+        self.client.get(f'/api/posts/{self.posts[0].pk}/')
+        self.publish(self.posts[0], title='Renamed')
+        self.assertEqual(self.client.get(f'/api/posts/{self.posts[0].pk}/').json()['title'], 'Renamed')
+
+    def test_slug_change_of_an_ancestor_refreshes_urls(self):
+        response = self.client.get('/api/posts/')
+        self.publish(self.blog_index, slug='writing')
+        revalidated = self.client.get('/api/posts/', headers={'if_none_match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertEqual(self.urls(revalidated), [f'http://localhost/cms/writing/post-{i}/' for i in range(3)])
+        detail = self.client.get(f'/api/posts/{self.posts[0].pk}/')
+        self.assertEqual(detail.json()['url'], 'http://localhost/cms/writing/post-0/')
+
+    def test_site_change_refreshes_urls(self):
+        self.client.get('/api/posts/')
+        site = Site.objects.get(is_default_site=True)
+        site.hostname = 'example.org'
+        site.save()
+        self.assertEqual(self.urls(self.client.get('/api/posts/'))[0], 'http://example.org/cms/blog/post-0/')
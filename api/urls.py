@@ -0,0 +1,12 @@
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
+app_name = 'api'
+
+router = DefaultRouter()
+router.register('posts', views.BlogPostViewSet, basename='post')
+router.register('projects', views.ProjectViewSet, basename='project')
+router.register('tags', views.TagViewSet, basename='tag')
+
+urlpatterns = router.urls
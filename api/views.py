@@ -0,0 +1,134 @@
+from django.db.models import Exists, OuterRef
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import viewsets
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied, ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from taggit.models import Tag
+from wagtail.models import Page
+
+from accounts.membership import is_member
+from blog.models import BlogPage, BlogPageTag
+from pages.models import ProjectPage
+
+from . import fragments
+from .pagination import TagCursorPagination
+from .serializers import (
+    BlogPostDetailSerializer, BlogPostSerializer, ProjectDetailSerializer, ProjectSerializer, TagSerializer,
+)
+
+
+def selected_fields(request, serializer_class):
+    """Field names asked for with ``?fields=a,b``, or None for all of them"""
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = set(names) - set(serializer_class.Meta.fields)
+    if unknown:
+        raise ValidationError({'fields': f'Unknown fields: {", ".join(sorted(unknown))}'})
+    return names
+
+
+def select(data, fields):
+    return data if fields is None else {name: data[name] for name in fields}
+
+
+def conditional(request, etag, build_response):
+    """A 304 if the client has ``etag``, otherwise the response ``build_response()`` returns"""
+    response = get_conditional_response(request, etag=etag) or build_response()
+    response['ETag'] = etag
+    return response
+
+
+class PageViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Live, public pages of one type.
+
+    Listings include members-only pages, flagged by ``is_members_only``, as
+    the site's index pages do; their detail is served to members only.
+    """
+
+    model = None
+    detail_serializer_class = None
+    prefetch = ()
+
+    def get_queryset(self):
+        # Only wagtailcore_page, so the cursor query can use its
+        # (content type, first published) index
+        return Page.objects.live().public().exact_type(self.model).only(*fragments.VERSION_FIELDS)
+
+    def serialiser(self, serializer_class):
+        def serialise(ids):
+            pages = self.model.objects.filter(pk__in=ids).prefetch_related(*self.prefetch)
+            # Plain dicts, which pickle smaller than DRF's ReturnDict
+            return [dict(data) for data in serializer_class(pages, many=True).data]
+        return serialise
+
+    def list(self, request, *args, **kwargs):
+        fields = selected_fields(request, self.serializer_class)
+        pages = self.paginate_queryset(self.get_queryset())
+        etag = fragments.etag(
+            request.get_full_path(),
+            self.paginator.get_next_link(),
+            self.paginator.get_previous_link(),
+            [fragments.page_version(page) for page in pages],
+        )
+
+        def build_response():
+            results = fragments.get_serialised(self.basename, pages, self.serialiser(self.serializer_class))
+            return self.get_paginated_response([select(data, fields) for data in results])
+
+        return conditional(request, etag, build_response)
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.model.objects.live().public().only(*fragments.VERSION_FIELDS, 'is_members_only')
+        page = get_object_or_404(queryset, pk=kwargs['pk'])
+        if page.is_members_only and not is_member(request.user):
+            if not request.user.is_authenticated:
+                raise NotAuthenticated()
+            raise PermissionDenied('Members only.')
+        fields = selected_fields(request, self.detail_serializer_class)
+        etag = fragments.etag(request.get_full_path(), fragments.page_version(page))
+
+        def build_response():
+            data, = fragments.get_serialised(
+                f'{self.basename}-detail', [page], self.serialiser(self.detail_serializer_class),
+            )
+            return Response(select(data, fields))
+
+        response = conditional(request, etag, build_response)
+        if page.is_members_only:
+            patch_cache_control(response, private=True)
+        return response
+
+
+class BlogPostViewSet(PageViewSet):
+    model = BlogPage
+    serializer_class = BlogPostSerializer
+    detail_serializer_class = BlogPostDetailSerializer
+    prefetch = ('tags',)
+
+
+class ProjectViewSet(PageViewSet):
+    model = ProjectPage
+    serializer_class = ProjectSerializer
+    detail_serializer_class = ProjectDetailSerializer
+
+
+class TagViewSet(viewsets.ReadOnlyModelViewSet):
+    """Tags of live blog posts"""
+
+    serializer_class = TagSerializer
+    pagination_class = TagCursorPagination
+    lookup_field = 'slug'
+
+    def get_queryset(self):
+        in_use = BlogPageTag.objects.filter(tag=OuterRef('pk'), content_object__live=True)
+        return Tag.objects.filter(Exists(in_use))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if response.status_code == 200:
+            response['ETag'] = fragments.etag(request.get_full_path(), response.data)
+            response = get_conditional_response(request, etag=response['ETag'], response=response)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -3,6 +3,11 @@ ASGI config for aquiles_site project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+What runs on the event loop: the middleware chain, page cache hits and
+304s, static files, and the home and members views. Wagtail pages are
+served synchronously, so a page cache miss renders in one thread hop,
+and that includes the blog index's listing queries (``fetch_post_lists``).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
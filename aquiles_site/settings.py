@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -35,6 +36,7 @@ INSTALLED_APPS = [
     'blog',
     'accounts',
     'pages',
+    'api',
     
     'wagtail.contrib.forms',
     'wagtail.contrib.redirects',
@@ -50,6 +52,9 @@ INSTALLED_APPS = [
     
     'modelcluster',
     'taggit',
+    'rest_framework',
+    'django_tasks',
+    'django_tasks.backends.database',
     
     'django.contrib.admin',
     'django.contrib.auth',
@@ -60,15 +65,23 @@ INSTALLED_APPS = [
     'django.contrib.sitemaps',
 ]
 
+# The project's own middleware runs natively under both WSGI and ASGI; under
+# ASGI (aquiles_site.asgi, e.g. `uvicorn aquiles_site.asgi:application`)
+# page cache hits never leave the event loop.
 MIDDLEWARE = [
+    'pages.middleware.RequestInstrumentationMiddleware',
+    'pages.middleware.PageViewMiddleware',
+    'pages.middleware.AnonymousPageCacheMiddleware',
+    'pages.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'pages.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'pages.middleware.PageValidatorsMiddleware',
     'wagtail.contrib.redirects.middleware.RedirectMiddleware',
 ]
 
@@ -84,6 +97,9 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.membership',
+                'pages.context_processors.site_settings',
+                'pages.context_processors.main_menu',
             ],
         },
     },
@@ -102,6 +118,140 @@ DATABASES = {
     }
 }
 
+# SQLite production mode, on by default when DEBUG is off (override with
+# SQLITE_PRODUCTION_MODE=0/1). WAL lets readers carry on while an editor
+# publishes; IMMEDIATE transactions plus busy_timeout make concurrent
+# writers queue instead of failing with "database is locked". Connections
+# persist across requests, one per worker thread, so the pragmas and the
+# page cache are paid once per thread; SQLite has no server-side pool.
+# Under ASGI each request runs on its own thread, so persistence only helps
+# WSGI workers there. Run `manage.py sqlite_maintenance` periodically to
+# checkpoint the WAL and refresh the planner statistics.
+SQLITE_PRODUCTION_MODE = os.environ.get('SQLITE_PRODUCTION_MODE', '0' if DEBUG else '1') == '1'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # KiB
+    'busy_timeout': 5000,  # ms
+    'temp_store': 'MEMORY',
+}
+
+if SQLITE_PRODUCTION_MODE:
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    })
+
+# Read replica for anonymous page traffic (pages.routers). Define the
+# 'replica' alias to enable it, e.g. a Postgres standby; READ_REPLICA_SQLITE=1
+# adds a local SQLite copy kept in sync with `manage.py sync_replica`.
+# After a publish, reads stay on the primary until sync_replica has copied
+# it, or for REPLICA_PIN_SECONDS with a replica that doesn't report its sync
+# position. The pin is kept in a cache shared by all workers that never
+# culls it.
+if os.environ.get('READ_REPLICA_SQLITE') == '1':
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['pages.routers.ReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'
+REPLICA_PIN_SECONDS = 10
+REPLICA_PIN_CACHE_ALIAS = 'page_generations'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The file-based 'pages' cache is shared by every worker process on the box,
+# so purges issued by the process that handled a publish reach all of them.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'pages',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Page cache purge generations (one key per page plus a few shared tags)
+    # and the replica pin, kept apart from 'pages' so culling its entries
+    # never drops one
+    'page_generations': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'page_generations',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10_000_000,
+        },
+    },
+}
+
+
+# Membership flags are cached per user and invalidated on group changes, in
+# a cache shared by all workers so a revocation reaches every one of them;
+# the timeout bounds staleness should an invalidation be missed.
+MEMBERSHIP_CACHE_ALIAS = 'pages'
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 5
+
+# The SiteSettings snippet, exposed to templates as ``site_settings``, lives
+# in the shared cache until saved and is memoised per process for
+# SITE_SETTINGS_PROCESS_TTL seconds, which bounds how long other workers
+# keep serving the previous values.
+SITE_SETTINGS_CACHE_ALIAS = 'pages'
+SITE_SETTINGS_PROCESS_TTL = 30
+
+# The main menu (live pages with "show in menus", MENU_MAX_DEPTH levels below
+# the site root) is rendered once per site and kept in this cache until a
+# page is published, unpublished, moved or deleted.
+MENU_CACHE_ALIAS = 'pages'
+MENU_MAX_DEPTH = 2
+
+# Blog feeds (RSS, Atom, JSON Feed) are rendered when posts change and
+# stored here; FEED_MAX_AGE is how long clients may reuse them unvalidated.
+FEED_CACHE_ALIAS = 'pages'
+FEED_ITEMS = 20
+FEED_MAX_AGE = 60 * 5
+
+# The sitemap is sharded by page id, SITEMAP_SHARD_SIZE ids per shard
+# (at most 50,000); each shard is cached until a page in it changes.
+SITEMAP_CACHE_ALIAS = 'pages'
+SITEMAP_SHARD_SIZE = 10000
+
+# Read-only JSON API under /api/. Serialised posts and projects are cached
+# per published revision for API_CACHE_TIMEOUT; bump API_CACHE_VERSION when
+# the serialisers change.
+API_CACHE_ALIAS = 'pages'
+API_CACHE_TIMEOUT = 60 * 60 * 24
+API_CACHE_VERSION = '1'
+
+# Views of blog posts and projects are buffered per process and written in
+# one batch of upserts every PAGE_VIEWS_FLUSH_INTERVAL seconds, or sooner,
+# after the request that brings PAGE_VIEWS_FLUSH_MAX_VIEWS views in. A
+# worker killed outright loses what it buffered, so these two bound the
+# views lost per worker. Requests whose User-Agent matches
+# PAGE_VIEWS_BOT_PATTERN (see pages.page_views for the default) are not
+# counted.
+PAGE_VIEWS_ENABLED = True
+PAGE_VIEWS_FLUSH_INTERVAL = 30
+PAGE_VIEWS_FLUSH_MAX_VIEWS = 500
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.SessionAuthentication'],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PublishedCursorPagination',
+    'PAGE_SIZE': 20,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -166,5 +316,98 @@ WAGTAILSEARCH_BACKENDS = {
     }
 }
 
+# Engine behind the public /search/ view: 'wagtail' uses the backend above,
+# 'fts5' a dedicated FTS5 table over BlogPage and ProjectPage (SQLite only,
+# populate it with `manage.py rebuild_fts_index`).
+PAGES_SEARCH_ENGINE = 'fts5'
+
+# StreamField block render cache (opt-in)
+# Rendered HTML of value-only blocks is kept in an in-process LRU and
+# dropped whenever the page tree or an image changes. Other processes notice
+# through a generation in the shared cache, checked at most every
+# BLOCK_RENDER_CACHE_CHECK_INTERVAL seconds. Hits and misses go to the
+# request instrumentation.
+BLOCK_RENDER_CACHE_ENABLED = False
+BLOCK_RENDER_CACHE_MAX_ENTRIES = 512
+BLOCK_RENDER_CACHE_GENERATION_ALIAS = 'page_generations'
+BLOCK_RENDER_CACHE_CHECK_INTERVAL = 5
+
+# Full-page cache for anonymous readers of Wagtail pages
+# Entries are purged when pages are published, unpublished or moved; the
+# timeout only bounds how long an orphaned entry can linger.
+PAGE_CACHE_ENABLED = not DEBUG
+PAGE_CACHE_ALIAS = 'pages'
+PAGE_CACHE_GENERATION_ALIAS = 'page_generations'
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+# Each process adds its hit/miss counts to the shared totals this often
+PAGE_CACHE_STATS_INTERVAL = 10
+# Query parameters that change what a page renders; any others are left out
+# of the cache key, so e.g. ?utm_source=... is served the plain URL's entry
+PAGE_CACHE_QUERY_PARAMS = ['after', 'before']
+
+# Part of every page ETag; bump on deploys that change templates so clients
+# don't keep revalidating stale HTML
+PAGE_ETAG_VERSION = '1'
+
+# Per-request query count, DB/template/block timings as a Server-Timing header
+# and a log line. A request running more queries than the first QUERY_BUDGETS
+# pattern matching its path allows is logged, or raises with
+# QUERY_BUDGETS_RAISE, as pages.tests.QueryBudgetTests turns on.
+REQUEST_INSTRUMENTATION_ENABLED = DEBUG
+QUERY_BUDGETS = [
+    (r'^/cms/$', 15),
+    (r'^/cms/blog/$', 12),
+    (r'^/cms/blog/[^/]+/$', 16),
+    (r'^/cms/projects/', 12),
+]
+QUERY_BUDGETS_RAISE = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'pages.instrumentation': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Work triggered by publishing (related posts, renditions, placeholders,
+# feeds, re-baking) is queued in the database after the transaction commits
+# and run by a separate worker, `manage.py db_worker`, so none of it runs
+# inside the editor's request.
+TASKS = {
+    'default': {
+        'BACKEND': 'django_tasks.backends.database.DatabaseBackend',
+    },
+}
+
+# Static HTML export of the public page tree (manage.py bake); with
+# BAKE_ON_PUBLISH the pages a publish affects are re-baked in the background
+BAKE_ROOT = BASE_DIR / 'baked'
+BAKE_ON_PUBLISH = False
+
 # Base URL to use when referring to full URLs within the Wagtail admin backend
 WAGTAILADMIN_BASE_URL = 'http://example.com'
+
+# Related posts shown on each blog post, precomputed by blog.related
+RELATED_POSTS_COUNT = 3
+RELATED_POSTS_MAX_FEATURES = 4096
+# Heaviest terms kept per post, stored for incremental updates on publish
+RELATED_POSTS_MAX_TERMS = 64
+
+# Modern formats {% responsive_image %} offers ahead of the original format
+# (AVIF encoding needs pillow_heif)
+RESPONSIVE_IMAGE_FORMATS = ('avif', 'webp')
+
+# Renditions a render finds missing are queued for the worker rather than
+# resized in the request; the same ones are queued again at most every
+# RENDITION_QUEUE_TIMEOUT seconds per process
+RENDITION_QUEUE_TIMEOUT = 300
+
+# Blurred image placeholders are cached where every worker sees them, so a
+# new or regenerated one shows up everywhere at once. Images without one yet
+# are looked up again after IMAGE_PLACEHOLDER_MISS_TIMEOUT seconds.
+IMAGE_PLACEHOLDER_CACHE_ALIAS = 'pages'
+IMAGE_PLACEHOLDER_MISS_TIMEOUT = 60
@@ -20,9 +20,16 @@ from django.conf import settings
 from django.conf.urls.static import static
 from wagtail import urls as wagtail_urls
 
+from pages import views as pages_views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls')),
+    path('search/', pages_views.search_view, name='search'),
+    path('blog/', include('blog.urls')),
+    path('api/', include('api.urls')),
+    path('sitemap.xml', pages_views.sitemap_index_view, name='sitemap'),
+    path('sitemap-<int:shard>.xml', pages_views.sitemap_view, name='sitemap-shard'),
     path('cms/', include(wagtail_urls)),
     path('', include('core.urls')),
 ]
@@ -0,0 +1,165 @@
+"""
+RSS, Atom and JSON Feed of the latest public blog posts.
+
+Feed readers poll hard, so each feed is rendered when a post is published,
+unpublished, moved or deleted, a page above the posts is renamed or moved,
+or the site or its settings change, and stored with its validators;
+requests read the stored copy and mostly end in a 304. The full-content variants render post bodies through the block
+render cache.
+
+Feeds carry the site name and description, so they are stored per
+version of the site settings.
+"""
+import hashlib
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+from django.utils import feedgenerator
+
+from pages.site_settings import get_site_settings, get_site_settings_version, load_site_settings, settings_version
+
+KEY_PREFIX = 'feed'
+
+
+class JSONFeed(feedgenerator.SyndicationFeed):
+    """JSON Feed 1.1 (https://jsonfeed.org/version/1.1)"""
+
+    content_type = 'application/feed+json; charset=utf-8'
+
+    def write(self, outfile, encoding):
+        feed = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': self.feed['title'],
+            'home_page_url': self.feed['link'],
+            'feed_url': self.feed['feed_url'],
+            'description': self.feed['description'],
+            'language': self.feed['language'],
+            'items': [
+                {
+                    'id': item['unique_id'],
+                    'url': item['link'],
+                    'title': item['title'],
+                    'content_html': item['description'],
+                    'summary': item['summary'],
+                    'date_published': item['pubdate'].isoformat(),
+                    'date_modified': item['updateddate'].isoformat(),
+                    'tags': item['categories'],
+                }
+                for item in self.items
+            ],
+        }
+        outfile.write(json.dumps(feed, ensure_ascii=False))
+
+
+FEED_TYPES = {
+    'rss': feedgenerator.Rss201rev2Feed,
+    'atom': feedgenerator.Atom1Feed,
+    'json': JSONFeed,
+}
+
+
+def get_cache():
+    return caches[getattr(settings, 'FEED_CACHE_ALIAS', 'default')]
+
+
+def feed_key(kind, full, version):
+    return f'{KEY_PREFIX}:{kind}:{"full" if full else "summary"}:{version}'
+
+
+def feed_posts():
+    """The newest live blog posts every anonymous reader may see"""
+    from .models import BlogPage
+
+    return list(
+        BlogPage.objects.live().public()
+        .filter(is_members_only=False)
+        .order_by('-first_published_at')
+        .prefetch_related('tags')[:getattr(settings, 'FEED_ITEMS', 20)]
+    )
+
+
+def render_feed(kind, full=False, posts=None, site_settings=None):
+    """Render a feed; returns the stored form, body plus validators"""
+    from pages.models import BlogIndexPage
+
+    if site_settings is None:
+        site_settings = get_site_settings()
+    index = BlogIndexPage.objects.live().first()
+    _, root_url, index_path = (index.get_url_parts() if index else None) or (None, '', '/')
+    feed_path = reverse('blog:feed', kwargs={'kind': kind}) + ('?full=1' if full else '')
+    feed = FEED_TYPES[kind](
+        title=site_settings.site_name,
+        link=root_url + index_path,
+        description=site_settings.site_description,
+        feed_url=root_url + feed_path,
+        language=settings.LANGUAGE_CODE,
+    )
+    if posts is None:
+        posts = feed_posts()
+    for post in posts:
+        url = post.get_full_url()
+        feed.add_item(
+            title=post.title,
+            link=url,
+            description=str(post.content) if full else post.intro,
+            summary=post.intro,
+            unique_id=url,
+            pubdate=post.first_published_at,
+            updateddate=post.last_published_at,
+            categories=[tag.name for tag in post.tags.all()],
+        )
+
+    body = feed.writeString('utf-8').encode('utf-8')
+    published = [post.last_published_at for post in posts if post.last_published_at]
+    return {
+        'body': body,
+        'content_type': feed.content_type,
+        'etag': f'"{hashlib.md5(body).hexdigest()}"',
+        # HTTP dates have whole-second precision
+        'last_modified': int(max(published).timestamp()) if published else None,
+    }
+
+
+def get_feed(kind, full=False):
+    """The stored feed, rendered now if no publish has stored it yet"""
+    cache = get_cache()
+    key = feed_key(kind, full, get_site_settings_version())
+    feed = cache.get(key)
+    if feed is None:
+        feed = render_feed(kind, full)
+        cache.set(key, feed, None)
+    return feed
+
+
+def rebuild_feeds():
+    """Render and store every feed variant"""
+    posts = feed_posts()
+    # Read afresh, as this process's memo may predate a settings change
+    site_settings = load_site_settings()
+    version = settings_version(site_settings)
+    feeds = {
+        feed_key(kind, full, version): render_feed(kind, full, posts, site_settings)
+        for kind in FEED_TYPES
+        for full in (False, True)
+    }
+    cache = get_cache()
+    stored = cache.get_many(list(feeds))
+    for key, feed in feeds.items():
+        previous = stored.get(key)
+        # A new URL for the index or its posts changes the body but no post
+        # date, and readers sending only If-Modified-Since must still get it
+        if previous and previous['body'] != feed['body']:
+            before = previous['last_modified'] or 0
+            if (feed['last_modified'] or 0) <= before:
+                feed['last_modified'] = max(int(time.time()), before + 1)
+    cache.set_many(feeds, None)
+
+
+# Cache reads are blocking file I/O with the file-based backend, and a
+# missing feed is rendered from the database, so this runs on the
+# thread-sensitive executor whose connections are closed with the request
+aget_feed = sync_to_async(get_feed)
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.related import rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the related-posts index for every live blog post'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_related_posts()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'✓ Related posts computed for {count} posts in {elapsed:.2f}s'))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_remove_blogpage_body_blogpage_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpage',
+            name='body_text',
+            field=models.TextField(blank=True, editable=False, help_text='Plain text of the content'),
+        ),
+        migrations.AddField(
+            model_name='blogpage',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes'),
+        ),
+        migrations.AddField(
+            model_name='blogpage',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
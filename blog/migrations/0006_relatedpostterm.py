@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_postlistblock_ordering'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPostTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=128)),
+                ('weight', models.FloatField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.blogpage')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term'], name='blog_relatedpostterm_term')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'term'), name='unique_related_post_term')],
+            },
+        ),
+    ]
@@ -6,6 +6,7 @@ from wagtail.search import index
 from modelcluster.fields import ParentalKey
 from taggit.models import TaggedItemBase
 from pages.blocks import STREAMFIELD_BLOCKS
+from pages.text import PlainTextBodyMixin
 
 
 class BlogPageTag(TaggedItemBase):
@@ -13,7 +14,7 @@ class BlogPageTag(TaggedItemBase):
     content_object = ParentalKey('BlogPage', on_delete=models.CASCADE, related_name='tagged_items')
 
 
-class BlogPage(Page):
+class BlogPage(PlainTextBodyMixin, Page):
     """Individual blog post page with flexible content"""
     
     intro = models.CharField(max_length=500, help_text="Brief introduction to the blog post")
@@ -56,3 +57,47 @@ class BlogPage(Page):
     
     class Meta:
         verbose_name = "Blog Post"
+    
+    @property
+    def related_posts(self):
+        """Precomputed related posts, best match first"""
+        links = (
+            RelatedPost.objects.filter(post=self)
+            .select_related('related')
+            .defer('related__content')
+            .order_by('rank')
+        )
+        return [link.related for link in links]
+
+
+class RelatedPost(models.Model):
+    """Nearest neighbours of a blog post, refreshed when posts are published"""
+    
+    post = models.ForeignKey(BlogPage, on_delete=models.CASCADE, related_name='related_post_links')
+    related = models.ForeignKey(BlogPage, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'rank'], name='unique_related_post_rank'),
+        ]
+
+
+class RelatedPostTerm(models.Model):
+    """
+    One term of a blog post's TF-IDF vector, so publishing a post scores it
+    against the posts sharing its terms without rebuilding the whole matrix
+    """
+    
+    post = models.ForeignKey(BlogPage, on_delete=models.CASCADE, related_name='+')
+    term = models.CharField(max_length=128)
+    weight = models.FloatField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'term'], name='unique_related_post_term'),
+        ]
+        indexes = [
+            models.Index(fields=['term'], name='blog_relatedpostterm_term'),
+        ]
@@ -0,0 +1,314 @@
+"""
+Related posts from the TF-IDF similarity of the posts' words and tags.
+
+``rebuild_related_posts`` builds the whole matrix and every post's
+neighbours in vectorised passes, and stores each post's vector as
+RelatedPostTerm rows. Publishing or unpublishing one post then only
+re-weights that post against the stored vocabulary and scores it against
+the posts sharing its terms, updating its own neighbours and the lists it
+enters or leaves. Weights of the other posts keep the document frequencies
+of their last computation, and new words join the vocabulary only on the
+next full rebuild (``manage.py build_related_posts``).
+"""
+import heapq
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from scipy import sparse
+
+from .models import BlogPage, BlogPageTag, RelatedPost, RelatedPostTerm
+
+_WORD_RE = re.compile(r'[^\W\d_]{3,}', re.UNICODE)
+
+STOP_WORDS = frozenset("""
+    about after again also and any are because been before being between both but can
+    could did does doing down during each few for from further had has have having her
+    here hers him his how into its itself just more most not now off once only other our
+    out over own same she should some such than that the their theirs them then there
+    these they this those through too under until very was were what when where which
+    while who whom why will with would you your yours
+""".split())
+
+# Tags are strong topical signals, so each one counts as several words
+TAG_WEIGHT = 3
+
+
+def get_top_k():
+    return getattr(settings, 'RELATED_POSTS_COUNT', 3)
+
+
+def get_max_features():
+    return getattr(settings, 'RELATED_POSTS_MAX_FEATURES', 4096)
+
+
+def get_max_terms():
+    return getattr(settings, 'RELATED_POSTS_MAX_TERMS', 64)
+
+
+def tokenise(text):
+    return [word for word in _WORD_RE.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def document(title, intro, body_text, tag_slugs):
+    """Term counts of one post"""
+    counts = Counter(tokenise(f'{title} {intro} {body_text}'))
+    for slug in tag_slugs:
+        counts[f'tag:{slug}'] += TAG_WEIGHT
+    return counts
+
+
+def load_corpus():
+    """Token counts of every live, public blog post, in two queries"""
+    tags = defaultdict(list)
+    for post_id, slug in BlogPageTag.objects.values_list('content_object_id', 'tag__slug'):
+        tags[post_id].append(slug)
+
+    ids, documents = [], []
+    posts = BlogPage.objects.live().public().values_list('pk', 'title', 'intro', 'body_text')
+    for pk, title, intro, body_text in posts.iterator():
+        ids.append(pk)
+        documents.append(document(title, intro, body_text, tags[pk]))
+    return ids, documents
+
+
+def _normalise(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags((1 / norms).astype(np.float32)) @ matrix).tocsr()
+
+
+def _prune(matrix, max_terms):
+    """Keep the ``max_terms`` heaviest terms of each row"""
+    matrix = matrix.tocsr()
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        if end - start > max_terms:
+            data = matrix.data[start:end]
+            data[np.argsort(-data)[max_terms:]] = 0
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def build_matrix(documents, max_features, max_terms=None):
+    """
+    L2-normalised TF-IDF matrix (posts x terms), sparse CSR of float32, and
+    its vocabulary (the term of each column).
+
+    The vocabulary keeps the ``max_features`` terms that appear in the most
+    posts, ignoring terms that occur in a single post since they can't link
+    two posts together. Each post keeps its ``max_terms`` heaviest terms,
+    which bounds the RelatedPostTerm rows stored per post. Only the terms a
+    post uses are stored, so memory grows with the corpus' text rather than
+    posts times vocabulary.
+    """
+    if max_terms is None:
+        max_terms = get_max_terms()
+    document_frequency = Counter()
+    for counts in documents:
+        document_frequency.update(counts.keys())
+    vocabulary = [
+        term for term, df in document_frequency.most_common(max_features) if df > 1
+    ]
+    columns = {term: column for column, term in enumerate(vocabulary)}
+
+    rows, cols, values = [], [], []
+    for row, counts in enumerate(documents):
+        for term, count in counts.items():
+            column = columns.get(term)
+            if column is not None:
+                rows.append(row)
+                cols.append(column)
+                values.append(count)
+    matrix = sparse.csr_matrix(
+        (np.log1p(np.array(values, dtype=np.float32)), (rows, cols)),
+        shape=(len(documents), len(vocabulary)),
+    )
+
+    df = np.array([document_frequency[term] for term in vocabulary], dtype=np.float32)
+    matrix = matrix @ sparse.diags(idf(df, len(documents)))
+    return _normalise(_prune(matrix, max_terms)), vocabulary
+
+
+def idf(df, count):
+    """Smoothed inverse document frequency of terms in ``df`` of ``count`` posts"""
+    return (np.log((1 + count) / (1 + np.asarray(df, dtype=np.float32))) + 1).astype(np.float32)
+
+
+def top_neighbours(matrix, rows, k, chunk_size=256):
+    """
+    Yield (row, neighbour_rows, scores) for the given rows.
+
+    Similarities are computed a chunk of rows at a time with one sparse
+    matrix product each, and only the best k columns are fully sorted.
+    """
+    k = min(k, matrix.shape[0] - 1)
+    if k <= 0:
+        return
+    transposed = matrix.T.tocsr()
+    for start in range(0, len(rows), chunk_size):
+        chunk = np.asarray(rows[start:start + chunk_size])
+        similarities = (matrix[chunk] @ transposed).toarray()
+        similarities[np.arange(len(chunk)), chunk] = -np.inf
+        best = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        for i, row in enumerate(chunk):
+            order = best[i][np.argsort(-similarities[i, best[i]])]
+            yield int(row), order, similarities[i, order]
+
+
+def _links(ids, matrix, rows, k):
+    links = []
+    for row, neighbours, scores in top_neighbours(matrix, rows, k):
+        rank = 0
+        for neighbour, score in zip(neighbours, scores):
+            if score <= 0:
+                break
+            rank += 1
+            links.append(RelatedPost(
+                post_id=ids[row], related_id=ids[int(neighbour)], rank=rank, score=float(score),
+            ))
+    return links
+
+
+def _terms(ids, matrix, vocabulary):
+    matrix = matrix.tocoo()
+    return [
+        RelatedPostTerm(post_id=ids[row], term=vocabulary[column], weight=float(weight))
+        for row, column, weight in zip(matrix.row, matrix.col, matrix.data)
+    ]
+
+
+def rebuild_related_posts():
+    """Recompute related posts for every live post; returns the post count"""
+    ids, documents = load_corpus()
+    matrix, vocabulary = build_matrix(documents, get_max_features())
+    links = _links(ids, matrix, list(range(len(ids))), get_top_k())
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        RelatedPostTerm.objects.all().delete()
+        RelatedPost.objects.bulk_create(links, batch_size=1000)
+        RelatedPostTerm.objects.bulk_create(_terms(ids, matrix, vocabulary), batch_size=5000)
+    return len(ids)
+
+
+def post_vector(post_id):
+    """
+    The TF-IDF vector {term: weight} of one live post, or None.
+
+    Weighted like the full rebuild, but only over the stored vocabulary and
+    with document frequencies counted from the other posts' stored terms.
+    """
+    post = BlogPage.objects.live().public().filter(pk=post_id).values_list('title', 'intro', 'body_text').first()
+    if post is None:
+        return None
+    slugs = BlogPageTag.objects.filter(content_object_id=post_id).values_list('tag__slug', flat=True)
+    counts = document(*post, slugs)
+    document_frequency = dict(
+        RelatedPostTerm.objects.filter(term__in=list(counts)).exclude(post_id=post_id)
+        .values_list('term').annotate(df=Count('pk'))
+    )
+    if not document_frequency:
+        return {}
+    terms = list(document_frequency)
+    # This post counts towards the frequencies too
+    weights = np.log1p(np.array([counts[term] for term in terms], dtype=np.float32)) * idf(
+        [document_frequency[term] + 1 for term in terms],
+        BlogPage.objects.live().public().count(),
+    )
+    keep = np.argsort(-weights)[:get_max_terms()]
+    weights = weights[keep] / np.linalg.norm(weights[keep])
+    return {terms[i]: float(weight) for i, weight in zip(keep, weights)}
+
+
+def _stored_vector(post_id):
+    return dict(RelatedPostTerm.objects.filter(post_id=post_id).values_list('term', 'weight'))
+
+
+def score_posts(vector, exclude_id):
+    """Cosine similarity of ``vector`` to every other post sharing one of its terms"""
+    scores = defaultdict(float)
+    postings = (
+        RelatedPostTerm.objects.filter(term__in=list(vector)).exclude(post_id=exclude_id)
+        .values_list('post_id', 'term', 'weight')
+    )
+    for post_id, term, weight in postings.iterator(chunk_size=5000):
+        scores[post_id] += weight * vector[term]
+    return scores
+
+
+def _best(scores, k):
+    """(post id, score) of the k best positive scores, best first"""
+    return [
+        (post_id, score)
+        for score, post_id in heapq.nlargest(k, ((score, post_id) for post_id, score in scores.items()))
+        if score > 0
+    ]
+
+
+def _set_links(post_id, neighbours):
+    RelatedPost.objects.filter(post_id=post_id).delete()
+    RelatedPost.objects.bulk_create([
+        RelatedPost(post_id=post_id, related_id=related_id, rank=rank, score=score)
+        for rank, (related_id, score) in enumerate(neighbours, start=1)
+    ])
+
+
+def _chunks(items, size=500):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def refresh_related_posts(post_id):
+    """
+    Update the index after ``post_id`` was published or unpublished.
+
+    Re-weights that post and recomputes its neighbours from the posts
+    sharing its terms. Posts it now outscores a neighbour of take it into
+    their lists; posts that listed it and now score it lower, or that lost
+    it to an unpublish, have their lists recomputed from their stored
+    vectors.
+    """
+    k = get_top_k()
+    vector = post_vector(post_id)
+    listed_by = dict(RelatedPost.objects.filter(related_id=post_id).values_list('post_id', 'score'))
+
+    with transaction.atomic():
+        RelatedPostTerm.objects.filter(post_id=post_id).delete()
+        scores = {}
+        if vector is None:
+            RelatedPost.objects.filter(post_id=post_id).delete()
+        else:
+            RelatedPostTerm.objects.bulk_create([
+                RelatedPostTerm(post_id=post_id, term=term, weight=weight) for term, weight in vector.items()
+            ])
+            scores = score_posts(vector, post_id)
+            _set_links(post_id, _best(scores, k))
+
+        # Its old score still stands in their lists if it didn't drop
+        recompute = {pk for pk, score in listed_by.items() if scores.get(pk, 0) < score}
+        candidates = {pk for pk, score in scores.items() if score > 0} - recompute
+        entering = set()
+        for chunk in _chunks(candidates):
+            lists = (
+                RelatedPost.objects.filter(post_id__in=chunk).values('post_id')
+                .annotate(links=Count('pk'), weakest=Min('score')).values_list('post_id', 'links', 'weakest')
+            )
+            full = {pk: weakest for pk, links, weakest in lists if links >= k}
+            entering.update(pk for pk in chunk if pk in listed_by or scores[pk] > full.get(pk, 0))
+
+        for chunk in _chunks(entering):
+            current = defaultdict(dict)
+            for pk, related_id, score in (
+                RelatedPost.objects.filter(post_id__in=chunk).values_list('post_id', 'related_id', 'score')
+            ):
+                current[pk][related_id] = score
+            for pk in chunk:
+                current[pk][post_id] = scores[pk]
+                _set_links(pk, _best(current[pk], k))
+
+        for pk in recompute:
+            _set_links(pk, _best(score_posts(_stored_vector(pk), pk), k))
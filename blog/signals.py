@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.models import PageViewRestriction, Site
+from wagtail.signals import page_published, page_slug_changed, page_unpublished, post_page_move
+
+from pages.models import SiteSettings
+
+from .models import BlogPage
+from .tasks import rebuild_feeds_task, refresh_related_posts_task
+
+
+@receiver(page_published, sender=BlogPage)
+@receiver(page_unpublished, sender=BlogPage)
+def refresh_related_posts(sender, instance, **kwargs):
+    refresh_related_posts_task.enqueue(instance.pk)
+
+
+@receiver(page_published, sender=BlogPage)
+@receiver(page_unpublished, sender=BlogPage)
+@receiver(post_page_move, sender=BlogPage)
+@receiver(post_delete, sender=BlogPage)
+@receiver(post_save, sender=PageViewRestriction)
+@receiver(post_delete, sender=PageViewRestriction)
+def rebuild_feeds(sender, **kwargs):
+    # A view restriction anywhere above a post can hide it from the feeds
+    rebuild_feeds_task.enqueue()
+
+
+@receiver(page_slug_changed)
+@receiver(post_page_move)
+def rebuild_feeds_on_url_change(sender, instance, **kwargs):
+    # Renaming or moving the blog index, or any page above the posts,
+    # changes the URLs the feeds link to
+    if BlogPage.objects.descendant_of(instance).exists():
+        rebuild_feeds_task.enqueue()
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def rebuild_feeds_on_site_change(sender, **kwargs):
+    # The site's hostname, port and root page make up every feed URL
+    transaction.on_commit(rebuild_feeds_task.enqueue)
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+def rebuild_feeds_on_settings_change(sender, **kwargs):
+    # Feeds carry the site name and description; after commit, so the
+    # rebuild reads the new settings
+    transaction.on_commit(rebuild_feeds_task.enqueue)
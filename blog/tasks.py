@@ -0,0 +1,15 @@
+from django_tasks import task
+
+
+@task()
+def refresh_related_posts_task(post_id):
+    from .related import refresh_related_posts
+
+    refresh_related_posts(post_id)
+
+
+@task()
+def rebuild_feeds_task():
+    from .feeds import rebuild_feeds
+
+    rebuild_feeds()
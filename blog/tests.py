@@ -1,3 +1,107 @@
-from django.test import TestCase
+from django.test import override_settings
+from wagtail.models import Site
 
-# Create your tests here.
+from pages.testing import IMMEDIATE_TASKS, SiteTestCase
+
+from .models import BlogPage, RelatedPost
+from .related import rebuild_related_posts
+
+@override_settings(TASKS=IMMEDIATE_TASKS)
+class FeedTests(SiteTestCase):
+    def get_feed(self, kind='rss', **params):
+        response = self.client.get(f'/blog/feed/{kind}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_feeds_list_the_latest_posts(self):
+        for kind in ('rss', 'atom', 'json'):
+            with self.subTest(kind=kind):
+                response = self.get_feed(kind)
+                for post in self.posts:
+                    self.assertContains(response, post.title)
+
+    def test_publish_rebuilds_the_feeds(self):
+        feed = self.get_feed()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publish(self.posts[1], title='Renamed')
+        response = self.client.get('/blog/feed/rss/', headers={'if_none_match': feed['ETag']})
+        self.assertContains(response, 'Renamed')
+
+    def test_unpublish_drops_the_post(self):
+        self.get_feed()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[1].unpublish()
+        self.assertNotContains(self.get_feed(), 'Post 1')
+
+    def test_renaming_the_blog_index_rebuilds_the_feeds(self):
+        feed = self.get_feed()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publish(self.blog_index, slug='writing')
+        response = self.client.get('/blog/feed/rss/', headers={
+            'if_modified_since': feed['Last-Modified'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '/cms/writing/post-0/')
+        self.assertContains(response, '<link>http://localhost/cms/writing/</link>')
+        self.assertNotContains(response, '/cms/blog/')
+
+    def test_site_change_rebuilds_the_feeds(self):
+        self.get_feed()
+        site = Site.objects.get(is_default_site=True)
+        site.hostname = 'example.org'
+        with self.captureOnCommitCallbacks(execute=True):
+            site.save()
+        self.assertContains(self.get_feed(), 'http://example.org/cms/blog/post-0/')
+
+
+@override_settings(TASKS=IMMEDIATE_TASKS, RELATED_POSTS_COUNT=2)
+class RelatedPostTests(SiteTestCase):
+    INTROS = [
+        'Python django wagtail templates',
+        'Python django querysets caching',
+        'Gardening tomatoes compost worms',
+        'Gardening compost querysets caching',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.posts.append(cls.blog_index.add_child(instance=BlogPage(
+            title='Post 3', slug='post-3', intro='-',
+            first_published_at=cls.posts[-1].first_published_at, last_published_at=cls.posts[-1].last_published_at,
+        )))
+        for post, intro in zip(cls.posts, cls.INTROS):
+            BlogPage.objects.filter(pk=post.pk).update(intro=intro)
+        rebuild_related_posts()
+
+    def related(self, post):
+        return [related.slug for related in BlogPage.objects.get(pk=post.pk).related_posts]
+
+    def best_links(self):
+        return dict(RelatedPost.objects.filter(rank=1).values_list('post_id', 'related_id'))
+
+    def test_posts_on_the_same_topic_are_related(self):
+        self.assertEqual(self.related(self.posts[0])[0], 'post-1')
+        self.assertEqual(self.related(self.posts[2])[0], 'post-3')
+
+    def test_related_posts_are_one_query(self):
+        post = BlogPage.objects.get(pk=self.posts[0].pk)
+        with self.assertNumQueries(1):
+            related = post.related_posts
+        self.assertNotIn('content', related[0].__dict__)
+
+    def test_publish_updates_the_post_and_its_new_neighbours(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publish(self.posts[3], intro='Python django querysets caching')
+        self.assertEqual(self.related(self.posts[3])[0], 'post-1')
+        self.assertEqual(self.related(self.posts[1])[0], 'post-3')
+        # Best matches agree with a full rebuild; ties further down may not
+        incremental = self.best_links()
+        rebuild_related_posts()
+        self.assertEqual(incremental, self.best_links())
+
+    def test_unpublish_drops_the_post_from_other_lists(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[1].unpublish()
+        self.assertNotIn('post-1', self.related(self.posts[0]))
+        self.assertFalse(RelatedPost.objects.filter(post_id=self.posts[1].pk).exists())
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'blog'
+
+urlpatterns = [
+    path('feed/<str:kind>/', views.feed_view, name='feed'),
+]
@@ -1,3 +1,24 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
 
-# Create your views here.
+from .feeds import FEED_TYPES, aget_feed
+
+
+@require_safe
+async def feed_view(request, kind):
+    """RSS, Atom or JSON Feed of the latest posts; ``?full=1`` includes the post bodies"""
+    if kind not in FEED_TYPES:
+        raise Http404
+    feed = await aget_feed(kind, full=request.GET.get('full') == '1')
+
+    response = get_conditional_response(request, etag=feed['etag'], last_modified=feed['last_modified'])
+    if response is None:
+        response = HttpResponse(feed['body'], content_type=feed['content_type'])
+    response['ETag'] = feed['etag']
+    if feed['last_modified'] is not None:
+        response['Last-Modified'] = http_date(feed['last_modified'])
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'FEED_MAX_AGE', 60 * 5))
+    return response
@@ -1,26 +1,32 @@
 from django.shortcuts import render
-from django.contrib.auth.decorators import login_required
+
+from accounts.membership import ais_member, members_required
+from pages.menus import aget_menu_html
+from pages.site_settings import aget_site_settings
 
 # Create your views here.
 
-def home_view(request):
+async def home_view(request):
     """Home page view"""
+    # Resolve the user here so templates don't trigger a sync session lookup
+    request.user = user = await request.auser()
     context = {
-        'user': request.user,
-        'is_member': request.user.groups.filter(name='members').exists() if request.user.is_authenticated else False,
+        'user': user,
+        'is_member': await ais_member(user),
+        'site_settings': await aget_site_settings(),
+        'main_menu': await aget_menu_html(request),
     }
     return render(request, 'core/home.html', context)
 
 
-@login_required
-def members_only_view(request):
+@members_required
+async def members_only_view(request):
     """View for members-only content"""
-    if not request.user.groups.filter(name='members').exists():
-        from django.http import HttpResponseForbidden
-        return HttpResponseForbidden("Access denied. Members only.")
-    
+    request.user = user = await request.auser()
     context = {
-        'user': request.user,
+        'user': user,
         'exclusive_content': "This is exclusive content for members only!",
+        'site_settings': await aget_site_settings(),
+        'main_menu': await aget_menu_html(request),
     }
     return render(request, 'core/members_only.html', context)
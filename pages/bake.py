@@ -0,0 +1,239 @@
+"""
+Render the live, public page tree to static HTML files.
+
+Each page is written to ``<BAKE_ROOT>/<host>/<path>/index.html`` with
+``.gz`` and ``.br`` siblings, so a web server can answer anonymous reads
+on its own:
+
+    root /srv/baked/$host;
+    gzip_static on;
+    brotli_static on;
+    # Keyset pages (?after=, ?before=) differ from the baked first page, and
+    # signed-in visitors see their own header and members-only content
+    error_page 418 = @django;
+    if ($args) { return 418; }
+    if ($cookie_sessionid) { return 418; }
+    try_files $uri/index.html @django;
+
+Pages whose response differs per visitor (members-only pages, forms with a
+CSRF token, anything setting cookies) are left to Django. A change every
+page renders (the main menu, site settings, the site itself) re-bakes them
+all, as it purges the page cache's layout. Pages are requested under their
+site's hostname, which must be in ALLOWED_HOSTS like any the server answers.
+"""
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import brotli
+import django
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.test import RequestFactory
+from django.urls import resolve
+from wagtail.models import Page
+
+from . import page_cache
+from .post_lists import POST_LIST_BLOCK_TYPE, post_list_values
+from .renditions import generate_renditions, track_missing
+
+MANIFEST_NAME = '.manifest.json'
+
+
+def get_bake_root():
+    return Path(getattr(settings, 'BAKE_ROOT', settings.BASE_DIR / 'baked'))
+
+
+def bakeable_pages(page_ids=None):
+    """Live, public pages every anonymous visitor sees identically"""
+    pages = Page.objects.live().public().filter(depth__gt=1).specific()
+    if page_ids is not None:
+        pages = pages.filter(pk__in=page_ids)
+    return [page for page in pages if page_cache.is_cacheable_page(page)]
+
+
+def _post_list_page_ids():
+    ids = []
+    content_types = Page.objects.live().values_list('content_type', flat=True).distinct()
+    for content_type in ContentType.objects.filter(pk__in=content_types):
+        model = content_type.model_class()
+        if model is None or not any(field.name == 'content' for field in model._meta.get_fields()):
+            continue
+        candidates = (
+            model.objects.live()
+            .annotate(raw_content=Cast('content', TextField()))
+            .filter(raw_content__contains=f'"{POST_LIST_BLOCK_TYPE}"')
+            .only('id', 'content')
+        )
+        ids.extend(page.pk for page in candidates if post_list_values(page))
+    return ids
+
+
+def affected_page_ids(page, include_descendants=False):
+    """
+    Ids of the pages whose HTML a change to ``page`` can alter.
+
+    Mirrors the page cache purge: the page, its ancestors and, for blog
+    posts, every page with a post list and every post listing it as related.
+    """
+    from blog.models import BlogPage, RelatedPost
+
+    affected = page.get_ancestors(inclusive=True).filter(depth__gt=1)
+    if include_descendants:
+        affected = affected | page.get_descendants()
+    ids = set(affected.values_list('pk', flat=True))
+    if issubclass(page.specific_class, BlogPage):
+        ids.update(_post_list_page_ids())
+        ids.update(RelatedPost.objects.filter(related_id=page.pk).values_list('post_id', flat=True))
+    return ids
+
+
+def output_path(root_url, page_path):
+    """File a page is baked to, relative to the bake root"""
+    return Path(urlsplit(root_url).netloc) / page_path.strip('/') / 'index.html'
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f'{path.name}.tmp')
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+def write_variants(root, relative, content):
+    """Write the HTML and its precompressed variants; returns their relative paths"""
+    variants = {relative: content}
+    variants[relative.with_name(relative.name + '.gz')] = gzip.compress(content, compresslevel=9, mtime=0)
+    variants[relative.with_name(relative.name + '.br')] = brotli.compress(content, quality=11)
+    for path, data in variants.items():
+        _write(root / path, data)
+    return [str(path) for path in variants]
+
+
+def _serve(factory, root_url, page_path):
+    url = urlsplit(root_url)
+    request = factory.get(page_path, HTTP_HOST=url.netloc, secure=url.scheme == 'https')
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    request.user = AnonymousUser()
+    match = resolve(request.path_info)
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return request, response
+
+
+def render_page(factory, root_url, page_path):
+    """
+    Render a page as an anonymous visitor would see it.
+
+    Wagtail's serve view is called directly rather than through the
+    middleware stack, so bakes don't fill the page cache or count as reads;
+    the request gets the empty session and anonymous user the middleware
+    would give it. Renditions the page finds missing are generated here,
+    off any request, and the page rendered again, so no baked file keeps
+    the fallback. Returns the HTML, or None when the response can't be
+    shared between visitors and so must not be baked.
+    """
+    with track_missing() as missing:
+        request, response = _serve(factory, root_url, page_path)
+    if missing:
+        for image_id, specs in missing.items():
+            generate_renditions(image_id, sorted(specs))
+        request, response = _serve(factory, root_url, page_path)
+    if not page_cache.is_shareable_response(request, response):
+        return None
+    return response.content
+
+
+def bake_one(factory, root, page_id, root_url, page_path):
+    """Bake one page; returns (page_id, written files, error)"""
+    try:
+        content = render_page(factory, root_url, page_path)
+        if content is None:
+            return page_id, [], 'not shareable'
+        return page_id, write_variants(root, output_path(root_url, page_path), content), None
+    except Exception as e:
+        return page_id, [], f'{type(e).__name__}: {e}'
+
+
+def _init_worker():
+    django.setup()
+
+
+def _bake_in_worker(root, job):
+    return bake_one(RequestFactory(), root, *job)
+
+
+def bake_pages(pages, workers=None):
+    """
+    Bake the given pages, yielding (page_id, written files, error).
+
+    With ``workers=0`` pages are rendered in this process, as a background
+    task does; otherwise in a pool of processes.
+    """
+    root = get_bake_root()
+    jobs = []
+    for page in pages:
+        url_parts = page.get_url_parts()
+        if url_parts is None:
+            yield page.pk, [], 'no URL'
+            continue
+        jobs.append((page.pk, url_parts[1], url_parts[2]))
+
+    if workers == 0:
+        factory = RequestFactory()
+        for job in jobs:
+            yield bake_one(factory, root, *job)
+        return
+
+    # Children must open their own database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_bake_in_worker, root, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def load_manifest(root):
+    """Map page id -> files baked for it"""
+    try:
+        with open(root / MANIFEST_NAME) as f:
+            return {int(page_id): files for page_id, files in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(root, manifest):
+    _write(root / MANIFEST_NAME, json.dumps(manifest, sort_keys=True).encode('utf-8'))
+
+
+def remove_files(root, files):
+    for name in files:
+        path = root / name
+        path.unlink(missing_ok=True)
+        # Drop directories left empty, up to the bake root
+        for parent in path.parents:
+            if parent == root or not parent.is_relative_to(root):
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+
+
+def update_manifest(root, manifest, page_id, files):
+    """Record a page's new files and remove the ones it no longer has"""
+    stale = set(manifest.get(page_id, ())) - set(files)
+    remove_files(root, stale)
+    if files:
+        manifest[page_id] = files
+    else:
+        manifest.pop(page_id, None)
@@ -0,0 +1,111 @@
+import json
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarise(samples, elapsed=None):
+    """Latency summary in milliseconds for a list of durations in seconds"""
+    summary = {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+    if elapsed:
+        summary['throughput_rps'] = len(samples) / elapsed
+    return summary
+
+
+def time_calls(func, arguments):
+    """Call ``func`` once per argument; returns (durations, total elapsed)"""
+    durations = []
+    started = time.perf_counter()
+    for argument in arguments:
+        call_started = time.perf_counter()
+        func(argument)
+        durations.append(time.perf_counter() - call_started)
+    return durations, time.perf_counter() - started
+
+
+def format_summary(label, summary):
+    line = (
+        f"{label:<24} n={summary['count']:<6} "
+        f"p50={summary['p50_ms']:.2f}ms p95={summary['p95_ms']:.2f}ms "
+        f"p99={summary['p99_ms']:.2f}ms"
+    )
+    if 'throughput_rps' in summary:
+        line += f" {summary['throughput_rps']:.1f}/s"
+    return line
+
+
+def git_revision(cwd=None):
+    """Short hash of the checked-out commit, with a + when the tree is dirty"""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{revision}+' if dirty else revision
+
+
+def save_results(results, directory):
+    """Write a benchmark run as JSON named after its start time and revision"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    meta = results['meta']
+    stamp = meta['started'].replace(':', '').replace('-', '')[:15]
+    path = directory / f"{stamp}-{meta['revision']}.json"
+    path.write_text(json.dumps(results, indent=2, sort_keys=True))
+    return path
+
+
+def load_results(path):
+    return json.loads(Path(path).read_text())
+
+
+def latest_results(directory):
+    """Path of the most recent saved run in ``directory``, or None"""
+    runs = sorted(Path(directory).glob('*.json'))
+    return runs[-1] if runs else None
+
+
+def _change(before, after):
+    if not before:
+        return 'n/a'
+    return f'{(after - before) / before:+.1%}'
+
+
+def _queries(result):
+    mean = result.get('queries_mean')
+    return 'n/a' if mean is None else f'{mean:.1f}'
+
+
+def compare_results(previous, current):
+    """Lines comparing latency and query counts per label between two runs"""
+    lines = [f"Compared with {previous['meta']['revision']} ({previous['meta']['started']})"]
+    for label, now in current['results'].items():
+        before = previous['results'].get(label)
+        if before is None:
+            continue
+        lines.append(
+            f"{label:<24} p50 {_change(before['p50_ms'], now['p50_ms']):>7} "
+            f"p95 {_change(before['p95_ms'], now['p95_ms']):>7} "
+            f"queries {_queries(before)} -> {_queries(now)}"
+        )
+    return lines
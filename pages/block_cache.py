@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from .instrumentation import current_metrics, time_block
+from .renditions import track_missing
+
+GENERATION_KEY = 'blockcache:generation'
+
+
+def get_generation_cache():
+    return caches[getattr(settings, 'BLOCK_RENDER_CACHE_GENERATION_ALIAS', 'default')]
+
+
+class BlockRenderCache:
+    """
+    In-process LRU cache of rendered block HTML with hit/miss counters.
+
+    ``invalidate()`` moves a generation kept in a cache shared by every
+    worker; each process compares it with its own at most every
+    BLOCK_RENDER_CACHE_CHECK_INTERVAL seconds and drops its entries when it
+    moved, so that bounds how long other processes serve HTML from before
+    the change.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check_generation(self):
+        # Called with the lock held
+        now = time.monotonic()
+        interval = getattr(settings, 'BLOCK_RENDER_CACHE_CHECK_INTERVAL', 5)
+        if self._checked_at is not None and now - self._checked_at < interval:
+            return
+        self._checked_at = now
+        generation = get_generation_cache().get(GENERATION_KEY)
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key):
+        with self._lock:
+            self._check_generation()
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def set(self, key, html):
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self):
+        """Drop the entries of every process, this one at once"""
+        generation = uuid.uuid4().hex
+        get_generation_cache().set(GENERATION_KEY, generation, None)
+        with self._lock:
+            self._entries.clear()
+            self._generation = generation
+            self._checked_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+block_render_cache = BlockRenderCache(
+    max_entries=getattr(settings, 'BLOCK_RENDER_CACHE_MAX_ENTRIES', 512),
+)
+
+
+def is_enabled():
+    return getattr(settings, 'BLOCK_RENDER_CACHE_ENABLED', False)
+
+
+def template_mtime(template_name):
+    """Modification time of a block template, so edits to it change the cache key"""
+    origin = get_template(template_name).origin
+    try:
+        return os.path.getmtime(origin.name)
+    except (OSError, TypeError):
+        return 0
+
+
+_cached_template_mtime = lru_cache(maxsize=None)(template_mtime)
+
+
+def template_fingerprint(template_name):
+    """
+    template_mtime() read once per process, or on every render under DEBUG.
+
+    The cache lives in this process and deploys restart it, so only
+    development, where templates change under a running server, needs the
+    filesystem checked on cache hits.
+    """
+    if settings.DEBUG:
+        return template_mtime(template_name)
+    return _cached_template_mtime(template_name)
+
+
+def value_hash(block, value):
+    """Stable hash of a block value's JSON representation"""
+    prep_value = block.get_prep_value(value)
+    payload = json.dumps(prep_value, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def render_cache_key(block, value):
+    template_name = getattr(block.meta, 'template', None)
+    return (
+        f'{type(block).__name__}:{block.name}',
+        value_hash(block, value),
+        template_fingerprint(template_name) if template_name else 0,
+    )
+
+
+class CachedBlockMixin:
+    """
+    Serve the block's rendered HTML from the block render cache.
+
+    Only mix this into blocks whose output depends solely on their own value;
+    anything reading the request, the user or the database at render time
+    (post lists, forms with CSRF tokens) must render every time.
+    """
+
+    def render(self, value, context=None):
+        with time_block(self.name or type(self).__name__):
+            if not is_enabled():
+                return super().render(value, context)
+
+            key = render_cache_key(self, value)
+            html = block_render_cache.get(key)
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.count_block_cache(hit=html is not None)
+            if html is None:
+                with track_missing() as missing:
+                    html = super().render(value, context)
+                if not missing:
+                    block_render_cache.set(key, html)
+            return mark_safe(html)
@@ -2,8 +2,11 @@ from wagtail import blocks
 from wagtail.images.blocks import ImageChooserBlock
 from wagtail.documents.blocks import DocumentChooserBlock
 
+from .block_cache import CachedBlockMixin
+from .instrumentation import TimedBlockMixin
 
-class HeroBlock(blocks.StructBlock):
+
+class HeroBlock(CachedBlockMixin, blocks.StructBlock):
     """Hero section with title, subtitle, background image/color, and CTA"""
     title = blocks.CharBlock(max_length=200, help_text="Hero title")
     subtitle = blocks.TextBlock(max_length=500, required=False, help_text="Hero subtitle")
@@ -30,7 +33,7 @@ class HeroBlock(blocks.StructBlock):
         label = 'Hero Section'
 
 
-class IntroTextBlock(blocks.StructBlock):
+class IntroTextBlock(CachedBlockMixin, blocks.StructBlock):
     """Rich text with optional image/illustration"""
     heading = blocks.CharBlock(max_length=200, required=False, help_text="Optional heading")
     text = blocks.RichTextBlock(help_text="Main text content")
@@ -61,7 +64,7 @@ class CardBlock(blocks.StructBlock):
     link_text = blocks.CharBlock(max_length=50, required=False, default="Learn more")
 
 
-class CardGridBlock(blocks.StructBlock):
+class CardGridBlock(CachedBlockMixin, blocks.StructBlock):
     """Grid of cards for Projects, Services, Writing, etc."""
     heading = blocks.CharBlock(max_length=200, required=False, help_text="Section heading")
     description = blocks.TextBlock(max_length=500, required=False, help_text="Section description")
@@ -82,11 +85,20 @@ class CardGridBlock(blocks.StructBlock):
         label = 'Card Grid'
 
 
-class PostListBlock(blocks.StructBlock):
+class PostListBlock(TimedBlockMixin, blocks.StructBlock):
     """Shows latest or tagged posts"""
     heading = blocks.CharBlock(max_length=200, required=False, help_text="Section heading")
     description = blocks.TextBlock(max_length=500, required=False, help_text="Section description")
     post_count = blocks.IntegerBlock(default=3, min_value=1, max_value=12, help_text="Number of posts to show")
+    ordering = blocks.ChoiceBlock(
+        choices=[
+            ('latest', 'Latest'),
+            ('most_read', 'Most read'),
+        ],
+        default='latest',
+        required=False,
+        help_text="Most read ranks posts by their all-time views",
+    )
     show_featured_only = blocks.BooleanBlock(required=False, help_text="Show only featured posts")
     tag_filter = blocks.CharBlock(max_length=100, required=False, help_text="Filter by tag (optional)")
     show_images = blocks.BooleanBlock(default=True, help_text="Show post featured images")
@@ -98,7 +110,7 @@ class PostListBlock(blocks.StructBlock):
         label = 'Post List'
 
 
-class QuoteBlock(blocks.StructBlock):
+class QuoteBlock(CachedBlockMixin, blocks.StructBlock):
     """Testimonial or pull quote"""
     quote = blocks.TextBlock(help_text="Quote text")
     author = blocks.CharBlock(max_length=100, required=False, help_text="Quote author")
@@ -126,7 +138,7 @@ class StatBlock(blocks.StructBlock):
     description = blocks.CharBlock(max_length=200, required=False, help_text="Optional description")
 
 
-class StatsBlock(blocks.StructBlock):
+class StatsBlock(CachedBlockMixin, blocks.StructBlock):
     """Numbers with labels"""
     heading = blocks.CharBlock(max_length=200, required=False, help_text="Section heading")
     description = blocks.TextBlock(max_length=500, required=False, help_text="Section description")
@@ -145,7 +157,7 @@ class LogoBlock(blocks.StructBlock):
     link = blocks.URLBlock(required=False, help_text="Company website")
 
 
-class LogosBlock(blocks.StructBlock):
+class LogosBlock(CachedBlockMixin, blocks.StructBlock):
     """Grid of company logos"""
     heading = blocks.CharBlock(max_length=200, required=False, help_text="Section heading")
     description = blocks.TextBlock(max_length=500, required=False, help_text="Section description")
@@ -158,7 +170,7 @@ class LogosBlock(blocks.StructBlock):
         label = 'Logos Grid'
 
 
-class CTASectionBlock(blocks.StructBlock):
+class CTASectionBlock(CachedBlockMixin, blocks.StructBlock):
     """Call-to-action section with headline, subheadline, and button"""
     headline = blocks.CharBlock(max_length=200, help_text="Main headline")
     subheadline = blocks.TextBlock(max_length=500, required=False, help_text="Supporting text")
@@ -194,7 +206,7 @@ class FAQItemBlock(blocks.StructBlock):
     answer = blocks.RichTextBlock(help_text="FAQ answer")
 
 
-class FAQBlock(blocks.StructBlock):
+class FAQBlock(CachedBlockMixin, blocks.StructBlock):
     """Accordion of question+answer"""
     heading = blocks.CharBlock(max_length=200, required=False, help_text="Section heading")
     description = blocks.TextBlock(max_length=500, required=False, help_text="Section description")
@@ -206,7 +218,7 @@ class FAQBlock(blocks.StructBlock):
         label = 'FAQ'
 
 
-class ContactBlock(blocks.StructBlock):
+class ContactBlock(TimedBlockMixin, blocks.StructBlock):
     """Contact form embed or contact information"""
     heading = blocks.CharBlock(max_length=200, required=False, help_text="Section heading")
     description = blocks.TextBlock(max_length=500, required=False, help_text="Section description")
@@ -229,7 +241,7 @@ class ContactBlock(blocks.StructBlock):
         label = 'Contact'
 
 
-class DividerBlock(blocks.StructBlock):
+class DividerBlock(CachedBlockMixin, blocks.StructBlock):
     """Spacer / visual break"""
     divider_style = blocks.ChoiceBlock(
         choices=[
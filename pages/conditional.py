@@ -0,0 +1,97 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.http import http_date
+from wagtail.models import PageViewRestriction
+
+from accounts.membership import is_member
+
+from . import page_cache
+from .post_lists import get_post_list_batch
+from .site_settings import get_site_settings_version
+
+
+def _related_posts(page):
+    from blog.models import RelatedPost
+
+    if not hasattr(page, 'related_post_links'):
+        return []
+    return list(
+        RelatedPost.objects.filter(post=page)
+        .order_by('rank')
+        .values_list('related_id', 'related__last_published_at')
+    )
+
+
+def _listing_generation(page):
+    """
+    Page cache generation of an index page listing its descendants.
+
+    Publishing, unpublishing, moving or deleting a descendant purges its
+    ancestors' tags, so the generation moves whenever the listing can
+    change, without counting the descendants on every request.
+    """
+    if not getattr(page, 'lists_descendants', False):
+        return None
+    tag = page_cache.page_tag(page.pk)
+    return page_cache.tag_generations([tag])[tag]
+
+
+def is_restricted(page):
+    """
+    Whether a view restriction applies to the page.
+
+    Wagtail checks restrictions after every before_serve_page hook, so the
+    hooks answering from validators must check for themselves.
+    """
+    if page.alias_of_id:
+        return page.get_view_restrictions().exists()
+    restricted = PageViewRestriction.objects.values_list('page__path', flat=True)
+    return any(page.path.startswith(path) for path in restricted)
+
+
+def page_validators(page, request):
+    """
+    (ETag, Last-Modified) of a page as rendered for this request's user.
+
+    The ETag covers the published revision, the posts pulled in by post list
+    blocks and related posts, the pages an index lists, the layout and site
+    settings every page shares, and who is asking, since the header and
+    members-only content differ per user. Bump PAGE_ETAG_VERSION on deploys that change
+    templates.
+    """
+    posts = [
+        (post.pk, post.last_published_at)
+        for _, block_posts in get_post_list_batch(page)
+        for post in block_posts
+    ]
+    posts += _related_posts(page)
+    listing = _listing_generation(page)
+
+    parts = [
+        getattr(settings, 'PAGE_ETAG_VERSION', ''),
+        page_cache.layout_generation(),
+        get_site_settings_version(),
+        page.pk,
+        page.live_revision_id,
+        request.user.pk,
+        is_member(request.user),
+        listing,
+        *posts,
+    ]
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+    published = [page.last_published_at, *(when for _, when in posts)]
+    # HTTP dates have whole-second precision
+    published = [int(when.timestamp()) for when in published if when is not None]
+    published.append(page_cache.generation_started(listing))
+    published = [when for when in published if when is not None]
+    last_modified = max(published) if published else None
+    return f'W/"{digest}"', last_modified
+
+
+def set_validator_headers(response, etag, last_modified):
+    if not response.has_header('ETag'):
+        response['ETag'] = etag
+    if last_modified is not None and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(last_modified)
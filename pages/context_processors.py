@@ -0,0 +1,18 @@
+from django.utils.functional import SimpleLazyObject
+
+from .menus import get_menu_html
+from .site_settings import get_site_settings
+
+
+def site_settings(request):
+    """Expose the SiteSettings snippet as ``site_settings``, loaded only if a template reads it"""
+    return {
+        'site_settings': SimpleLazyObject(get_site_settings),
+    }
+
+
+def main_menu(request):
+    """Expose the cached main menu HTML as ``main_menu``"""
+    return {
+        'main_menu': SimpleLazyObject(lambda: get_menu_html(request)),
+    }
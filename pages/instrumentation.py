@@ -0,0 +1,169 @@
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Metrics being collected, innermost last
+_collecting = ContextVar('request_metrics', default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL queries than its QUERY_BUDGETS entry allows"""
+
+
+class RequestMetrics:
+    """Query, template and block timings collected while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.blocks = {}
+        self.block_cache_hits = 0
+        self.block_cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Database execute wrapper
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def add_block(self, name, elapsed):
+        count, total = self.blocks.get(name, (0, 0.0))
+        self.blocks[name] = (count + 1, total + elapsed)
+
+    def count_block_cache(self, hit):
+        if hit:
+            self.block_cache_hits += 1
+        else:
+            self.block_cache_misses += 1
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """Value of the Server-Timing header, durations in milliseconds"""
+        entries = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+        ]
+        if self.block_cache_hits or self.block_cache_misses:
+            entries.append(f'blockcache;desc="{self.block_cache_hits} hits, {self.block_cache_misses} misses"')
+        entries += [
+            f'block-{name};dur={total * 1000:.1f};desc="{count}x"'
+            for name, (count, total) in self.blocks.items()
+        ]
+        entries.append(f'total;dur={self.total_time * 1000:.1f}')
+        return ', '.join(entries)
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 1),
+            'template_ms': round(self.template_time * 1000, 1),
+            'total_ms': round(self.total_time * 1000, 1),
+            'block_cache_hits': self.block_cache_hits,
+            'block_cache_misses': self.block_cache_misses,
+            'blocks': {
+                name: {'count': count, 'ms': round(total * 1000, 1)}
+                for name, (count, total) in self.blocks.items()
+            },
+        }
+
+
+def is_enabled():
+    return getattr(settings, 'REQUEST_INSTRUMENTATION_ENABLED', False)
+
+
+def current_metrics():
+    collecting = _collecting.get()
+    return collecting[-1] if collecting else None
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    for metrics in _collecting.get():
+        execute = partial(metrics, execute)
+    return execute(sql, params, many, context)
+
+
+def install(connection):
+    """
+    Route a connection's queries to whichever request is collecting.
+
+    Connections are per thread, and under ASGI queries run on worker
+    threads, so the wrapper stays on every connection and looks up the
+    current metrics through the context, which follows the request there.
+    """
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+@contextmanager
+def collect():
+    """Collect metrics for the enclosed code; yields the RequestMetrics"""
+    metrics = RequestMetrics()
+    for connection in connections.all():
+        install(connection)
+    token = _collecting.set((*_collecting.get(), metrics))
+    try:
+        yield metrics
+    finally:
+        _collecting.reset(token)
+
+
+@contextmanager
+def time_block(name):
+    """Add the enclosed render time to the current request's block timings"""
+    metrics = current_metrics()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_block(name, time.perf_counter() - started)
+
+
+class TimedBlockMixin:
+    """Report the block's render time to the request instrumentation"""
+
+    def render(self, value, context=None):
+        with time_block(self.name or type(self).__name__):
+            return super().render(value, context)
+
+
+@lru_cache(maxsize=1)
+def _compiled_budgets(budgets):
+    return [(re.compile(pattern), limit) for pattern, limit in budgets]
+
+
+def query_budget(path):
+    """The most queries a request for ``path`` may run, or None"""
+    budgets = tuple(getattr(settings, 'QUERY_BUDGETS', ()))
+    for pattern, limit in _compiled_budgets(budgets):
+        if pattern.search(path):
+            return limit
+    return None
+
+
+def check_query_budget(path, metrics):
+    limit = query_budget(path)
+    if limit is None or metrics.queries <= limit:
+        return
+    message = f'{path} ran {metrics.queries} queries, over its budget of {limit}'
+    if getattr(settings, 'QUERY_BUDGETS_RAISE', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
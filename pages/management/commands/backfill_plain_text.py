@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import BlogPage
+from pages.models import ProjectPage
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored plain text, word count and reading time of blog posts and projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in (BlogPage, ProjectPage):
+            updated = 0
+            batch = []
+            for page in model.objects.only('id', 'content').iterator(chunk_size=batch_size):
+                page.update_plain_text()
+                batch.append(page)
+                if len(batch) >= batch_size:
+                    updated += self.flush(model, batch)
+            updated += self.flush(model, batch)
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Updated {updated} {model._meta.verbose_name_plural}'
+            ))
+
+    def flush(self, model, batch):
+        count = len(batch)
+        if batch:
+            with transaction.atomic():
+                model.objects.bulk_update(batch, model.PLAIN_TEXT_FIELDS, batch_size=len(batch))
+            batch.clear()
+        return count
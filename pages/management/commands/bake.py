@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+from wagtail.models import Page
+
+from pages import bake
+
+
+class Command(BaseCommand):
+    help = 'Render every live public page to static HTML with gzip/brotli variants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Worker processes (default: CPU count, 0: render in this process)')
+        parser.add_argument('--page', type=int, action='append', dest='page_ids',
+                            help='Only re-bake the pages a publish of this page affects (repeatable)')
+
+    def handle(self, *args, **options):
+        root = bake.get_bake_root()
+        manifest = bake.load_manifest(root)
+
+        if options['page_ids']:
+            affected = set()
+            for page in Page.objects.filter(pk__in=options['page_ids']):
+                affected |= bake.affected_page_ids(page)
+            pages = bake.bakeable_pages(affected)
+            # Affected pages that are no longer bakeable, e.g. unpublished
+            removed = (affected | set(options['page_ids'])) - {page.pk for page in pages}
+        else:
+            pages = bake.bakeable_pages()
+            removed = set(manifest) - {page.pk for page in pages}
+
+        for page_id in removed:
+            bake.update_manifest(root, manifest, page_id, [])
+
+        baked = skipped = 0
+        started = time.perf_counter()
+        for page_id, files, error in bake.bake_pages(pages, workers=options['workers']):
+            bake.update_manifest(root, manifest, page_id, files)
+            if error:
+                skipped += 1
+                self.stdout.write(f'  skipped page {page_id}: {error}')
+            else:
+                baked += 1
+        bake.save_manifest(root, manifest)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Baked {baked} pages to {root} in {elapsed:.2f}s '
+            f'({baked / elapsed if elapsed else 0:.1f} pages/s), {skipped} skipped, {len(removed)} removed'
+        ))
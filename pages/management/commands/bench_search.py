@@ -0,0 +1,53 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from wagtail.models import Page
+
+from pages import search
+from pages.benchmark import format_summary, summarise, time_calls
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the FTS5 search engine against the Wagtail search backend'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200, help='Number of queries per engine')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            raise CommandError("PAGES_SEARCH_ENGINE is not 'fts5' or the database is not SQLite")
+
+        terms = self.sample_terms(options['queries'], options['seed'])
+        if not terms:
+            raise CommandError('The FTS5 table is empty; run rebuild_fts_index first')
+
+        models = search.get_search_models()
+        engines = {
+            'fts5': lambda term: search.search(term, include_members_only=True),
+            'wagtail': lambda term: list(
+                Page.objects.live().public().type(*models).search(term)[:20]
+            ),
+        }
+        self.stdout.write(f'{len(terms)} queries, first: {terms[:5]}')
+        for label, engine in engines.items():
+            durations, elapsed = time_calls(engine, terms)
+            self.stdout.write(format_summary(label, summarise(durations, elapsed)))
+
+    def sample_terms(self, count, seed):
+        """Draw query terms, some of them truncated to exercise prefix matching"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT title FROM {search.FTS_TABLE} LIMIT 2000')
+            words = [
+                word for (title,) in cursor.fetchall()
+                for word in search._TERM_RE.findall(title) if len(word) > 3
+            ]
+        if not words:
+            return []
+        rng = random.Random(seed)
+        terms = []
+        for _ in range(count):
+            word = rng.choice(words)
+            terms.append(word[:rng.randint(3, len(word))])
+        return terms
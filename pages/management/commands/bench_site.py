@@ -0,0 +1,252 @@
+import asyncio
+import random
+import re
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from wagtail.models import Page, Site
+
+from blog.models import BlogPage
+from pages import instrumentation
+from pages.benchmark import (
+    compare_results, format_summary, git_revision, latest_results, load_results, save_results, summarise,
+)
+from pages.models import BlogIndexPage, ProjectIndexPage, ProjectPage
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+# Settings that change what a run measures, recorded with the results
+RECORDED_SETTINGS = (
+    'DEBUG', 'PAGE_CACHE_ENABLED', 'BLOCK_RENDER_CACHE_ENABLED', 'REQUEST_INSTRUMENTATION_ENABLED',
+    'PAGES_SEARCH_ENGINE',
+)
+
+
+class ClientDriver:
+    """Requests through Django's test client (the WSGI path), counting queries in-process"""
+
+    def __init__(self, hostname):
+        self.client = Client(HTTP_HOST=hostname)
+
+    def fetch(self, url):
+        started = time.perf_counter()
+        with instrumentation.collect() as metrics:
+            response = self.client.get(url)
+        return response.status_code, time.perf_counter() - started, metrics.queries
+
+
+class AsgiDriver:
+    """
+    Requests through the project's ASGI application in this process, with
+    concurrent requests as tasks on one event loop, as a single uvicorn
+    worker would run them.
+
+    Query counts come from the Server-Timing header, like the http driver.
+    """
+
+    def __init__(self, hostname):
+        self.application = get_asgi_application()
+        self.hostname = hostname
+
+    def fetch(self, url):
+        return asyncio.run(self.afetch(url))
+
+    def fetch_many(self, urls, concurrency):
+        return asyncio.run(self._fetch_many(urls, concurrency))
+
+    async def _fetch_many(self, urls, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(url):
+            async with semaphore:
+                return await self.afetch(url)
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
+
+    async def afetch(self, url):
+        path, _, query = url.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'host', self.hostname.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': (self.hostname, 80),
+        }
+        response = {}
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        finished = asyncio.Event()
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Like a client, hang up once the response is complete
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = {
+                    name.decode('latin1').lower(): value.decode('latin1')
+                    for name, value in message['headers']
+                }
+            elif not message.get('more_body', False):
+                finished.set()
+
+        started = time.perf_counter()
+        await self.application(scope, receive, send)
+        elapsed = time.perf_counter() - started
+        match = _QUERIES_RE.search(response['headers'].get('server-timing', ''))
+        return response['status'], elapsed, int(match.group(1)) if match else None
+
+
+class HttpDriver:
+    """
+    Requests against a running server (runserver, gunicorn, uvicorn...).
+
+    Query counts come from the Server-Timing header when the server has
+    REQUEST_INSTRUMENTATION_ENABLED.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def fetch(self, url):
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(self.base_url + url) as response:
+                response.read()
+                status, headers = response.status, response.headers
+        except urllib.error.HTTPError as e:
+            status, headers = e.code, e.headers
+        elapsed = time.perf_counter() - started
+        match = _QUERIES_RE.search(headers.get('Server-Timing', ''))
+        return status, elapsed, int(match.group(1)) if match else None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the key pages and report latency percentiles, throughput and query counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--driver', choices=['client', 'asgi', 'http'], default='client',
+                            help='client: WSGI test client; asgi: the ASGI app in-process; http: a running server')
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server for the http driver')
+        parser.add_argument('--requests', type=int, default=50, help='Measured requests per page kind')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per URL first')
+        parser.add_argument('--concurrency', type=int, default=1, help='Parallel requests (asgi and http drivers)')
+        parser.add_argument('--sample', type=int, default=10, help='Posts and projects sampled')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output-dir', default=getattr(settings, 'BENCHMARK_DIR', settings.BASE_DIR / 'benchmarks'))
+        parser.add_argument('--no-save', action='store_true')
+        parser.add_argument('--compare', nargs='?', const='latest',
+                            help='Saved run to compare with (default: the latest in --output-dir)')
+
+    def handle(self, *args, **options):
+        site = Site.objects.filter(is_default_site=True).select_related('root_page').first()
+        if site is None:
+            raise CommandError('No default site')
+        if options['driver'] == 'client':
+            if options['concurrency'] > 1:
+                raise CommandError('The client driver runs requests one at a time')
+            driver = ClientDriver(site.hostname)
+        elif options['driver'] == 'asgi':
+            driver = AsgiDriver(site.hostname)
+        else:
+            driver = HttpDriver(options['base_url'])
+
+        previous_path = options['compare']
+        if previous_path == 'latest':
+            previous_path = latest_results(options['output_dir'])
+
+        targets = self.key_urls(site, options['sample'], random.Random(options['seed']))
+        started = timezone.now()
+        results = {}
+        for label, urls in targets.items():
+            for url in urls:
+                for _ in range(options['warmup']):
+                    driver.fetch(url)
+            results[label] = self.run(driver, urls, options['requests'], options['concurrency'])
+            self.stdout.write(self.format(label, results[label]))
+
+        run = {
+            'meta': {
+                'started': started.isoformat(timespec='seconds'),
+                'revision': git_revision(settings.BASE_DIR),
+                'driver': options['driver'],
+                'base_url': options['base_url'] if options['driver'] == 'http' else None,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'pages': Page.objects.live().count(),
+                'settings': {name: getattr(settings, name, None) for name in RECORDED_SETTINGS},
+            },
+            'results': results,
+        }
+        if not options['no_save']:
+            path = save_results(run, options['output_dir'])
+            self.stdout.write(self.style.SUCCESS(f'✓ Saved results to {path}'))
+        if previous_path:
+            for line in compare_results(load_results(previous_path), run):
+                self.stdout.write(line)
+
+    def key_urls(self, site, sample, rng):
+        """URLs to measure, grouped by page kind"""
+        home = site.root_page
+        targets = {'home': [home.relative_url(site)]}
+        for label, model in (('blog_index', BlogIndexPage), ('project_index', ProjectIndexPage)):
+            index = model.objects.live().descendant_of(home).first()
+            if index is not None:
+                targets[label] = [index.relative_url(site)]
+        for label, model in (('blog_post', BlogPage), ('project', ProjectPage)):
+            ids = list(
+                model.objects.live().public().filter(is_members_only=False)
+                .order_by('pk').values_list('pk', flat=True)
+            )
+            chosen = model.objects.filter(pk__in=rng.sample(ids, min(sample, len(ids)))).order_by('pk')
+            if chosen:
+                targets[label] = [page.relative_url(site) for page in chosen]
+        targets['search'] = [f"{reverse('search')}?q={word}" for word in ('python', 'cache', 'wagtail')]
+        return targets
+
+    def run(self, driver, urls, count, concurrency):
+        schedule = [urls[i % len(urls)] for i in range(count)]
+        started = time.perf_counter()
+        if isinstance(driver, AsgiDriver):
+            samples = driver.fetch_many(schedule, concurrency)
+        elif concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                samples = list(pool.map(driver.fetch, schedule))
+        else:
+            samples = [driver.fetch(url) for url in schedule]
+        elapsed = time.perf_counter() - started
+
+        queries = [sample[2] for sample in samples if sample[2] is not None]
+        return {
+            **summarise([sample[1] for sample in samples], elapsed),
+            'queries_mean': statistics.fmean(queries) if queries else None,
+            'queries_max': max(queries) if queries else None,
+            'errors': sum(1 for sample in samples if sample[0] >= 400),
+        }
+
+    def format(self, label, result):
+        line = format_summary(label, result)
+        if result['queries_mean'] is not None:
+            line += f" queries={result['queries_mean']:.1f} (max {result['queries_max']})"
+        if result['errors']:
+            line += f" errors={result['errors']}"
+        return line
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from wagtail.images import get_image_model
+
+from pages.placeholders import update_placeholders
+
+
+class Command(BaseCommand):
+    help = 'Compute the blurred loading placeholder and dominant colour of every image'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--force', action='store_true', help='Recompute placeholders that are up to date')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        updated = 0
+        batch = []
+        for image in get_image_model().objects.iterator(chunk_size=batch_size):
+            batch.append(image)
+            if len(batch) >= batch_size:
+                updated += update_placeholders(batch, force=options['force'])
+                batch.clear()
+        updated += update_placeholders(batch, force=options['force'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'✓ Updated {updated} placeholders in {elapsed:.2f}s'))
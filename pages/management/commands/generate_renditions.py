@@ -0,0 +1,49 @@
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from wagtail.models import Page
+
+from pages.renditions import generate_in_pool, iter_pages_with_images, missing_renditions, page_rendition_sets
+
+
+class Command(BaseCommand):
+    help = 'Pre-generate every image rendition used by live pages, in a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+        parser.add_argument('--page', type=int, action='append', dest='page_ids', help='Only this page id (repeatable)')
+
+    def handle(self, *args, **options):
+        if options['page_ids']:
+            pages = Page.objects.filter(pk__in=options['page_ids'])
+        else:
+            pages = iter_pages_with_images()
+
+        sets = defaultdict(set)
+        page_count = 0
+        for page in pages:
+            page_count += 1
+            for image_id, names in page_rendition_sets(page).items():
+                sets[image_id].update(names)
+
+        missing = missing_renditions(sets)
+        wanted = sum(len(image_specs) for image_specs in missing.values())
+        self.stdout.write(
+            f'{page_count} pages, {len(sets)} images, {wanted} missing renditions on {len(missing)} images'
+        )
+        if not missing:
+            self.stdout.write(self.style.SUCCESS('✓ Nothing to do'))
+            return
+
+        created = 0
+        started = time.perf_counter()
+        for image_id, count, error in generate_in_pool(missing, workers=options['workers']):
+            if error:
+                self.stderr.write(f'✗ Image {image_id}: {error}')
+            created += count
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Generated {created} renditions in {elapsed:.2f}s ({created / elapsed:.1f} renditions/s)'
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from pages import page_cache
+
+
+class Command(BaseCommand):
+    help = 'Show full-page cache hit ratio, or clear the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help='Remove every cached page and reset the counters')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            page_cache.get_cache().clear()
+            self.stdout.write(self.style.SUCCESS('✓ Page cache cleared'))
+            return
+
+        stats = page_cache.stats()
+        self.stdout.write(f"Hits:      {stats['hits']}")
+        self.stdout.write(f"Misses:    {stats['misses']}")
+        self.stdout.write(f"Hit ratio: {stats['hit_ratio']:.1%}")
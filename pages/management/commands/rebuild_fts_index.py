@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pages import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the FTS5 search table for blog posts and projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            raise CommandError("PAGES_SEARCH_ENGINE is not 'fts5' or the database is not SQLite")
+
+        count = search.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Indexed {count} pages'))
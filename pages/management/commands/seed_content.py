@@ -0,0 +1,60 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.images import get_image_model
+from wagtail.models import Site
+
+from pages import seeding
+from pages.models import BlogIndexPage, ProjectIndexPage
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create synthetic blog posts, projects, tags and images for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--projects', type=int, default=500)
+        parser.add_argument('--images', type=int, default=20, help='Images to generate (existing ones are reused)')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible content')
+
+    def handle(self, *args, **options):
+        site = Site.objects.filter(is_default_site=True).select_related('root_page').first()
+        if site is None:
+            raise CommandError('No default site; run setup_site first')
+        home = site.root_page
+
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        images = seeding.create_images(options['images'], rng)
+        image_ids = [image.pk for image in images] or list(get_image_model().objects.values_list('pk', flat=True))
+        generator = seeding.ContentGenerator(rng, image_ids)
+        self.stdout.write(self.style.SUCCESS(f'✓ Created {len(images)} images'))
+
+        blog_index = self.get_index(home, BlogIndexPage, title='Blog', slug='blog')
+        posts, tag_names = seeding.build_blog_pages(options['posts'], generator, offset=blog_index.numchild)
+        seeding.bulk_add_children(blog_index, posts, batch_size=options['batch_size'])
+        seeding.tag_blog_pages(posts, tag_names)
+        self.stdout.write(self.style.SUCCESS(f'✓ Created {len(posts)} blog posts under {blog_index.url_path}'))
+
+        project_index = self.get_index(home, ProjectIndexPage, title='Projects', slug='projects')
+        projects = seeding.build_project_pages(options['projects'], generator, offset=project_index.numchild)
+        seeding.bulk_add_children(project_index, projects, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Created {len(projects)} projects under {project_index.url_path}'))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'✓ Seeded in {elapsed:.1f}s'))
+        self.stdout.write(
+            'Derived data is not updated by the bulk insert; run rebuild_fts_index, '
+            'build_related_posts and generate_renditions next.'
+        )
+
+    def get_index(self, home, model, **fields):
+        index = model.objects.child_of(home).first()
+        if index is None:
+            index = model(**fields)
+            home.add_child(instance=index)
+            index.save_revision().publish()
+        return index
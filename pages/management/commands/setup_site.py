@@ -44,6 +44,7 @@ class Command(BaseCommand):
                 slug="blog",
                 intro="<p>Thoughts, tutorials, and insights about technology and development.</p>",
                 posts_per_page=10,
+                show_in_menus=True,
             )
             home_page.add_child(instance=blog_index)
             self.stdout.write(self.style.SUCCESS('✓ Created Blog Index page'))
@@ -57,6 +58,7 @@ class Command(BaseCommand):
                 slug="projects",
                 intro="<p>A collection of my projects and work.</p>",
                 projects_per_page=12,
+                show_in_menus=True,
             )
             home_page.add_child(instance=project_index)
             self.stdout.write(self.style.SUCCESS('✓ Created Project Index page'))
@@ -71,6 +73,7 @@ class Command(BaseCommand):
                 intro="<p>Get in touch with me for collaborations, questions, or just to say hello.</p>",
                 contact_form_title="Get in Touch",
                 email="aquiles@example.com",
+                show_in_menus=True,
             )
             home_page.add_child(instance=contact_page)
             self.stdout.write(self.style.SUCCESS('✓ Created Contact page'))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from pages import sqlite
+
+
+class Command(BaseCommand):
+    help = 'Checkpoint the SQLite WAL and run PRAGMA optimize, once or every --interval seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--mode', choices=sqlite.CHECKPOINT_MODES, default='PASSIVE',
+                            help='Checkpoint mode; TRUNCATE also shrinks the WAL file')
+        parser.add_argument('--no-optimize', action='store_true', help='Only checkpoint')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Repeat every N seconds until interrupted (for a systemd unit)')
+        parser.add_argument('--show-pragmas', action='store_true', help='Print the connection pragmas first')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not sqlite.is_sqlite(connection):
+            raise CommandError(f"Database '{options['database']}' is not SQLite")
+
+        if options['show_pragmas']:
+            for name, value in sqlite.pragmas(connection).items():
+                self.stdout.write(f'{name:<14} {value}')
+
+        while True:
+            self.run_once(connection, options)
+            if not options['interval']:
+                return
+            # Don't hold a connection (and a WAL read mark) while idle
+            connection.close()
+            time.sleep(options['interval'])
+
+    def run_once(self, connection, options):
+        started = time.perf_counter()
+        busy, wal_frames, checkpointed = sqlite.checkpoint(connection, options['mode'])
+        if wal_frames == -1:
+            self.stdout.write(self.style.WARNING('Database is not in WAL mode; nothing to checkpoint'))
+        elif busy:
+            self.stdout.write(self.style.WARNING(
+                f'Checkpoint blocked by readers or writers: {checkpointed}/{wal_frames} frames copied'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✓ Checkpointed {checkpointed}/{wal_frames} WAL frames'))
+
+        if not options['no_optimize']:
+            sqlite.optimize(connection)
+            self.stdout.write(self.style.SUCCESS('✓ Ran PRAGMA optimize'))
+        self.stdout.write(f'Took {time.perf_counter() - started:.2f}s')
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from pages import routers, sqlite
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database to the local read replica, once or every --interval seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Repeat every N seconds until interrupted, simulating replication lag')
+
+    def handle(self, *args, **options):
+        alias = routers.replica_alias()
+        if alias is None:
+            raise CommandError('No replica database configured (set READ_REPLICA_SQLITE=1)')
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if not (sqlite.is_sqlite(primary) and sqlite.is_sqlite(replica)):
+            raise CommandError('Only SQLite replicas are copied; other databases replicate themselves')
+
+        while True:
+            started, started_at = time.perf_counter(), time.time()
+            sqlite.copy_database(primary, replica)
+            # Lifts the pin of publishes committed before the copy began
+            routers.record_sync(started_at)
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Copied {primary.settings_dict["NAME"]} to {replica.settings_dict["NAME"]} '
+                f'in {time.perf_counter() - started:.2f}s'
+            ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,115 @@
+"""
+The main navigation, built from the page tree in one query and cached as
+rendered HTML per site.
+
+Each site's menu is its own cache entry, keyed under a version that
+publishing, unpublishing, moving or deleting any page moves, which drops
+every site's menu with a single write. A digest of the menus tells whether
+such a change touched them, and so whether pages embedding the old menu
+must be re-rendered.
+"""
+import hashlib
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http.request import split_domain_port
+from django.template.loader import render_to_string
+from django.urls import reverse
+from wagtail.models import Page, Site
+
+VERSION_KEY = 'menus:version'
+DIGEST_KEY = 'menus:digest'
+TEMPLATE_NAME = 'pages/includes/main_menu.html'
+
+
+def _get_cache():
+    return caches[getattr(settings, 'MENU_CACHE_ALIAS', 'default')]
+
+
+def build_menu(site, max_depth=None):
+    """
+    Live in-menu pages below the site root, as nested dicts of title, url
+    and children.
+
+    One query fetches every level, ordered by the tree path, so each page
+    follows its parent; pages under a hidden parent are left out.
+    """
+    if max_depth is None:
+        max_depth = getattr(settings, 'MENU_MAX_DEPTH', 2)
+    root = site.root_page
+    pages = (
+        Page.objects.live().in_menu()
+        .filter(path__startswith=root.path, depth__gt=root.depth, depth__lte=root.depth + max_depth)
+        .order_by('path')
+        .values_list('path', 'depth', 'title', 'url_path')
+    )
+    items, by_path = [], {}
+    for path, depth, title, url_path in pages:
+        item = {
+            'title': title,
+            'url': reverse('wagtail_serve', args=(url_path[len(root.url_path):],)),
+            'children': [],
+        }
+        if depth == root.depth + 1:
+            items.append(item)
+        elif path[:-Page.steplen] in by_path:
+            by_path[path[:-Page.steplen]]['children'].append(item)
+        else:
+            continue
+        by_path[path] = item
+    return items
+
+
+def _site_key(request):
+    # What Wagtail matches sites on, known without a query
+    hostname = split_domain_port(request.get_host())[0]
+    return f'{hostname}:{request.get_port()}'
+
+
+def _cache_key(version, request):
+    return f'menus:{version}:{_site_key(request)}'
+
+
+def _render(request):
+    site = Site.find_for_request(request)
+    return render_to_string(TEMPLATE_NAME, {'items': build_menu(site) if site else []})
+
+
+def get_menu_html(request):
+    """The main menu for the request's site"""
+    cache = _get_cache()
+    key = _cache_key(cache.get(VERSION_KEY), request)
+    html = cache.get(key)
+    if html is None:
+        html = _render(request)
+        cache.set(key, html, None)
+    return html
+
+
+async def aget_menu_html(request):
+    """get_menu_html() for async views, which render templates in the event loop"""
+    cache = _get_cache()
+    key = _cache_key(await cache.aget(VERSION_KEY), request)
+    html = await cache.aget(key)
+    if html is None:
+        html = await sync_to_async(_render)(request)
+        await cache.aset(key, html, None)
+    return html
+
+
+def _digest():
+    sites = Site.objects.select_related('root_page').order_by('pk')
+    menus = [(site.pk, site.hostname, site.port, build_menu(site)) for site in sites]
+    return hashlib.md5(repr(menus).encode('utf-8')).hexdigest()
+
+
+def invalidate_menus():
+    """Drop the cached menus; returns whether any site's menu changed since the last call"""
+    cache = _get_cache()
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    digest = _digest()
+    changed = cache.get(DIGEST_KEY) != digest
+    cache.set(DIGEST_KEY, digest, None)
+    return changed
@@ -0,0 +1,298 @@
+import time
+from abc import ABC, abstractmethod
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import block_cache, conditional, instrumentation, page_cache, page_views, renditions, routers
+from .site_settings import aget_site_settings
+
+
+class HybridMiddleware(ABC):
+    """
+    Base for middleware running natively under both WSGI and ASGI.
+
+    Under ASGI ``__call__`` hands over to ``__acall__``, so the request
+    stays on the event loop instead of Django adapting the chain with a
+    thread hop around each sync-only middleware. Subclasses implement
+    both ``handle`` and ``__acall__``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.handle(request)
+
+    @abstractmethod
+    def handle(self, request):
+        """Process a request under WSGI"""
+
+    @abstractmethod
+    async def __acall__(self, request):
+        """Process a request under ASGI"""
+
+
+class AnonymousPageCacheMiddleware(HybridMiddleware):
+    """
+    Serve Wagtail pages to anonymous visitors from the full-page cache.
+
+    Only GET/HEAD requests without a session or messages cookie are looked
+    up, so everyone served from the cache would have received identical
+    HTML. A response is stored only if the page marked itself cacheable in
+    the ``before_serve_page`` hook and rendering neither touched the session,
+    issued a CSRF token nor showed an image whose renditions are still
+    queued.
+
+    Placed above the session, CSRF and security middleware, a hit skips
+    them all; stored entries already carry the headers they added. Under
+    ASGI hits are answered without a per-request thread.
+    """
+
+    def handle(self, request):
+        if not page_cache.is_enabled() or not self.is_anonymous_read(request):
+            return self.get_response(request)
+
+        entry = page_cache.get_entry(request)
+        if entry is not None:
+            page_cache.record('hit')
+            return self.cached_response(request, entry)
+
+        with renditions.track_missing() as missing:
+            response = self.get_response(request)
+        tags = self.miss_tags(request, response)
+        if tags is not None:
+            page_cache.record('miss')
+            if self.is_storable(request, response) and not missing:
+                page_cache.store_entry(request, response, tags)
+        return response
+
+    async def __acall__(self, request):
+        if not page_cache.is_enabled() or not self.is_anonymous_read(request):
+            return await self.get_response(request)
+
+        # Entry keys include the settings version; memoise the settings here,
+        # so the lookup below reads no database off the request's thread
+        await aget_site_settings()
+        entry = await page_cache.aget_entry(request)
+        if entry is not None:
+            await page_cache.arecord('hit')
+            return self.cached_response(request, entry)
+
+        with renditions.track_missing() as missing:
+            response = await self.get_response(request)
+        tags = self.miss_tags(request, response)
+        if tags is not None:
+            await page_cache.arecord('miss')
+            if self.is_storable(request, response) and not missing:
+                await page_cache.astore_entry(request, response, tags)
+        return response
+
+    def cached_response(self, request, entry):
+        if entry.get('page_id') is not None:
+            request.viewed_page_id = entry['page_id']
+        response = HttpResponse(entry['content'])
+        for name, value in entry['headers'].items():
+            response[name] = value
+        response['X-Page-Cache'] = 'HIT'
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+            response=response,
+        )
+
+    def miss_tags(self, request, response):
+        """Tags and generations to store a freshly rendered page under, None for other responses"""
+        tags = getattr(request, 'page_cache_tags', None)
+        if tags is not None:
+            response['X-Page-Cache'] = 'MISS'
+        return tags
+
+    def is_storable(self, request, response):
+        return request.method == 'GET' and page_cache.is_shareable_response(request, response)
+
+    def is_anonymous_read(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return False
+        return getattr(settings, 'MESSAGE_COOKIE_NAME', 'messages') not in request.COOKIES
+
+
+class ReplicaMiddleware(HybridMiddleware):
+    """
+    Route the reads of anonymous GET/HEAD requests to the read replica,
+    unless a recent publish has pinned reads to the primary.
+
+    Requests carrying a session cookie (editors, the admin, members) always
+    read from the primary, so they see their own writes.
+    """
+
+    def handle(self, request):
+        if not self.is_replica_safe(request) or routers.is_pinned():
+            return self.get_response(request)
+        with routers.use_replica():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not self.is_replica_safe(request) or await sync_to_async(routers.is_pinned, thread_sensitive=False)():
+            return await self.get_response(request)
+        with routers.use_replica():
+            return await self.get_response(request)
+
+    def is_replica_safe(self, request):
+        if routers.replica_alias() is None or request.method not in ('GET', 'HEAD'):
+            return False
+        return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+class PageViewMiddleware(HybridMiddleware):
+    """
+    Count views of the pages the ``before_serve_page`` hook marked, when
+    PAGE_VIEWS_ENABLED is set.
+
+    Sits above the page cache middleware so cache hits and 304s count too;
+    bots and prefetches don't. Counting only adds to an in-process buffer.
+    """
+
+    def handle(self, request):
+        response = self.get_response(request)
+        self.count(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.count(request, response)
+        return response
+
+    def count(self, request, response):
+        page_id = getattr(request, 'viewed_page_id', None)
+        if page_id is None or request.method != 'GET' or response.status_code not in (200, 304):
+            return
+        if page_views.is_enabled() and not page_views.is_bot(request):
+            page_views.record(page_id)
+
+
+class PageValidatorsMiddleware(HybridMiddleware):
+    """
+    Send the ETag and Last-Modified computed by the ``answer_conditional_get``
+    hook with full page responses, so clients and CDNs can revalidate.
+
+    Sits below the page cache middleware so cached entries keep the headers.
+    """
+
+    def handle(self, request):
+        return self.add_validators(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_validators(request, await self.get_response(request))
+
+    def add_validators(self, request, response):
+        validators = getattr(request, 'page_validators', None)
+        if validators is not None and response.status_code == 200:
+            conditional.set_validator_headers(response, *validators)
+        return response
+
+
+class RequestInstrumentationMiddleware(HybridMiddleware):
+    """
+    Measure SQL queries, template rendering and StreamField block rendering
+    per request, when REQUEST_INSTRUMENTATION_ENABLED is set.
+
+    The timings go out as a Server-Timing header and a structured log line,
+    and the query count is checked against QUERY_BUDGETS. Place it first so
+    the totals cover every other middleware.
+    """
+
+    def handle(self, request):
+        if not instrumentation.is_enabled():
+            return self.get_response(request)
+
+        with instrumentation.collect() as metrics:
+            response = self.get_response(request)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not instrumentation.is_enabled():
+            return await self.get_response(request)
+
+        with instrumentation.collect() as metrics:
+            response = await self.get_response(request)
+        return self.report(request, response, metrics)
+
+    def report(self, request, response, metrics):
+        response['Server-Timing'] = metrics.server_timing()
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **metrics.as_dict(),
+        }
+        if block_cache.is_enabled():
+            # Since this process started, to judge the cache over many requests
+            record['block_cache_hit_ratio'] = round(block_cache.block_render_cache.stats()['hit_ratio'], 3)
+        instrumentation.logger.info(
+            ' '.join(f'{name}={value}' for name, value in record.items() if name != 'blocks')
+            + ''.join(f' block.{name}={block["ms"]}' for name, block in record['blocks'].items()),
+            extra={'metrics': record},
+        )
+        instrumentation.check_query_budget(request.path, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = instrumentation.current_metrics()
+        if metrics is not None:
+            # Called right before the handler renders the response
+            started = time.perf_counter()
+
+            def record_render_time(rendered):
+                metrics.template_time += time.perf_counter() - started
+
+            response.add_post_render_callback(record_render_time)
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can run under ASGI.
+
+    WhiteNoise's middleware is sync-only, which makes Django run every
+    middleware around it in a worker thread. Here only requests for static
+    files leave the event loop; everything else is passed straight on.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS pages_searchentry USING fts5("
+        "title, body, members_only UNINDEXED, "
+        "tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3'"
+        ")"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS pages_searchentry")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_aboutpage_servicespage_remove_homepage_about_content_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0004_plain_text_body'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImagePlaceholder',
+            fields=[
+                ('image', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='placeholder', serialize=False, to='wagtailimages.image')),
+                ('data_uri', models.TextField(help_text='Data URI of a blurred, few pixels wide thumbnail')),
+                ('width', models.PositiveSmallIntegerField()),
+                ('height', models.PositiveSmallIntegerField()),
+                ('color', models.CharField(help_text='Dominant colour as #rrggbb', max_length=7)),
+                ('source', models.CharField(help_text='File hash the placeholder was computed from', max_length=255)),
+            ],
+        ),
+    ]
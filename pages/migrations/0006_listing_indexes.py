@@ -0,0 +1,27 @@
+from django.db import migrations
+
+# Listings show live pages of one type newest first (BlogIndexPage and
+# ProjectIndexPage through KeysetPaginator, PostListBlock through
+# fetch_post_lists). A partial index over live pages by type and publish
+# date lets them read the newest rows of their type and stop at the LIMIT
+# instead of scanning and sorting every page. Page is Wagtail's model, so
+# the index is created here rather than in its Meta.
+CREATE_LIVE_PUBLISHED_INDEX = """
+CREATE INDEX IF NOT EXISTS pages_page_live_type_published_idx
+ON wagtailcore_page (content_type_id, first_published_at)
+WHERE live
+"""
+
+DROP_LIVE_PUBLISHED_INDEX = 'DROP INDEX IF EXISTS pages_page_live_type_published_idx'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0005_imageplaceholder'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_LIVE_PUBLISHED_INDEX, DROP_LIVE_PUBLISHED_INDEX),
+    ]
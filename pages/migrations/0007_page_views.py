@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:08
+
+import django.db.models.deletion
+import wagtail.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0006_listing_indexes'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aboutpage',
+            name='content',
+            field=wagtail.fields.StreamField([('hero', 7), ('intro_text', 12), ('card_grid', 23), ('post_list', 30), ('quote', 36), ('stats', 42), ('logos', 49), ('cta_section', 55), ('faq', 60), ('contact', 66), ('divider', 69)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'help_text': 'Hero title', 'max_length': 200}), 1: ('wagtail.blocks.TextBlock', (), {'help_text': 'Hero subtitle', 'max_length': 500, 'required': False}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Background image', 'required': False}), 3: ('wagtail.blocks.CharBlock', (), {'help_text': 'Background color (hex code, e.g., #ffffff)', 'max_length': 7, 'required': False}), 4: ('wagtail.blocks.CharBlock', (), {'help_text': 'Call-to-action button text', 'max_length': 50, 'required': False}), 5: ('wagtail.blocks.URLBlock', (), {'help_text': 'Call-to-action link', 'required': False}), 6: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('primary', 'Primary Button'), ('secondary', 'Secondary Button'), ('outline', 'Outline Button')]}), 7: ('wagtail.blocks.StructBlock', [[('title', 0), ('subtitle', 1), ('background_image', 2), ('background_color', 3), ('cta_text', 4), ('cta_link', 5), ('cta_style', 6)]], {}), 8: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional heading', 'max_length': 200, 'required': False}), 9: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'Main text content'}), 10: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Optional image or illustration', 'required': False}), 11: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('left', 'Left'), ('right', 'Right'), ('top', 'Top'), ('bottom', 'Bottom')], 'help_text': 'Image position relative to text'}), 12: ('wagtail.blocks.StructBlock', [[('heading', 8), ('text', 9), ('image', 10), ('image_position', 11)]], {}), 13: ('wagtail.blocks.CharBlock', (), {'help_text': 'Section heading', 'max_length': 200, 'required': False}), 14: ('wagtail.blocks.TextBlock', (), {'help_text': 'Section description', 'max_length': 500, 'required': False}), 15: ('wagtail.blocks.CharBlock', (), {'help_text': 'Card title', 'max_length': 200}), 16: ('wagtail.blocks.TextBlock', (), {'help_text': 'Card description', 'max_length': 300}), 17: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Card image', 'required': False}), 18: ('wagtail.blocks.URLBlock', (), {'help_text': 'Card link', 'required': False}), 19: ('wagtail.blocks.CharBlock', (), {'default': 'Learn more', 'max_length': 50, 'required': False}), 20: ('wagtail.blocks.StructBlock', [[('title', 15), ('description', 16), ('image', 17), ('link', 18), ('link_text', 19)]], {}), 21: ('wagtail.blocks.ListBlock', (20,), {'help_text': 'Add cards to display', 'max_num': 12, 'min_num': 1}), 22: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('2', '2 Columns'), ('3', '3 Columns'), ('4', '4 Columns')], 'help_text': 'Number of columns on desktop'}), 23: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('cards', 21), ('columns', 22)]], {}), 24: ('wagtail.blocks.IntegerBlock', (), {'default': 3, 'help_text': 'Number of posts to show', 'max_value': 12, 'min_value': 1}), 25: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('latest', 'Latest'), ('most_read', 'Most read')], 'help_text': 'Most read ranks posts by their all-time views', 'required': False}), 26: ('wagtail.blocks.BooleanBlock', (), {'help_text': 'Show only featured posts', 'required': False}), 27: ('wagtail.blocks.CharBlock', (), {'help_text': 'Filter by tag (optional)', 'max_length': 100, 'required': False}), 28: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post featured images'}), 29: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post excerpts'}), 30: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('post_count', 24), ('ordering', 25), ('show_featured_only', 26), ('tag_filter', 27), ('show_images', 28), ('show_excerpts', 29)]], {}), 31: ('wagtail.blocks.TextBlock', (), {'help_text': 'Quote text'}), 32: ('wagtail.blocks.CharBlock', (), {'help_text': 'Quote author', 'max_length': 100, 'required': False}), 33: ('wagtail.blocks.CharBlock', (), {'help_text': 'Author title/position', 'max_length': 200, 'required': False}), 34: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Author photo', 'required': False}), 35: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('testimonial', 'Testimonial Style'), ('pullquote', 'Pull Quote Style'), ('blockquote', 'Block Quote Style')]}), 36: ('wagtail.blocks.StructBlock', [[('quote', 31), ('author', 32), ('author_title', 33), ('author_image', 34), ('quote_style', 35)]], {}), 37: ('wagtail.blocks.CharBlock', (), {'help_text': 'The number/statistic', 'max_length': 20}), 38: ('wagtail.blocks.CharBlock', (), {'help_text': 'Label for the statistic', 'max_length': 100}), 39: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional description', 'max_length': 200, 'required': False}), 40: ('wagtail.blocks.StructBlock', [[('number', 37), ('label', 38), ('description', 39)]], {}), 41: ('wagtail.blocks.ListBlock', (40,), {'help_text': 'Add statistics', 'max_num': 8, 'min_num': 1}), 42: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('stats', 41)]], {}), 43: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Company logo'}), 44: ('wagtail.blocks.CharBlock', (), {'help_text': 'Company name (for alt text)', 'max_length': 100}), 45: ('wagtail.blocks.URLBlock', (), {'help_text': 'Company website', 'required': False}), 46: ('wagtail.blocks.StructBlock', [[('logo', 43), ('company_name', 44), ('link', 45)]], {}), 47: ('wagtail.blocks.ListBlock', (46,), {'help_text': 'Add company logos', 'max_num': 20, 'min_num': 1}), 48: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Display logos in grayscale'}), 49: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('logos', 47), ('grayscale', 48)]], {}), 50: ('wagtail.blocks.CharBlock', (), {'help_text': 'Main headline', 'max_length': 200}), 51: ('wagtail.blocks.TextBlock', (), {'help_text': 'Supporting text', 'max_length': 500, 'required': False}), 52: ('wagtail.blocks.CharBlock', (), {'help_text': 'Button text', 'max_length': 50}), 53: ('wagtail.blocks.URLBlock', (), {'help_text': 'Button link'}), 54: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('gray', 'Light Gray'), ('primary', 'Primary Color'), ('dark', 'Dark')]}), 55: ('wagtail.blocks.StructBlock', [[('headline', 50), ('subheadline', 51), ('button_text', 52), ('button_link', 53), ('button_style', 6), ('background_color', 54)]], {}), 56: ('wagtail.blocks.CharBlock', (), {'help_text': 'FAQ question', 'max_length': 300}), 57: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'FAQ answer'}), 58: ('wagtail.blocks.StructBlock', [[('question', 56), ('answer', 57)]], {}), 59: ('wagtail.blocks.ListBlock', (58,), {'help_text': 'Add FAQ items', 'min_num': 1}), 60: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('faqs', 59)]], {}), 61: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('form', 'Contact Form'), ('info', 'Contact Information'), ('both', 'Form and Information')]}), 62: ('wagtail.blocks.EmailBlock', (), {'help_text': 'Contact email', 'required': False}), 63: ('wagtail.blocks.CharBlock', (), {'help_text': 'Contact phone', 'max_length': 20, 'required': False}), 64: ('wagtail.blocks.TextBlock', (), {'help_text': 'Contact address', 'required': False}), 65: ('wagtail.blocks.CharBlock', (), {'default': 'Get in Touch', 'max_length': 100, 'required': False}), 66: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('contact_type', 61), ('email', 62), ('phone', 63), ('address', 64), ('form_title', 65)]], {}), 67: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('line', 'Simple Line'), ('dots', 'Dots'), ('wave', 'Wave'), ('space', 'Just Space')]}), 68: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('small', 'Small (2rem)'), ('medium', 'Medium (4rem)'), ('large', 'Large (6rem)')]}), 69: ('wagtail.blocks.StructBlock', [[('divider_style', 67), ('spacing', 68)]], {})}),
+        ),
+        migrations.AlterField(
+            model_name='homepage',
+            name='content',
+            field=wagtail.fields.StreamField([('hero', 7), ('intro_text', 12), ('card_grid', 23), ('post_list', 30), ('quote', 36), ('stats', 42), ('logos', 49), ('cta_section', 55), ('faq', 60), ('contact', 66), ('divider', 69)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'help_text': 'Hero title', 'max_length': 200}), 1: ('wagtail.blocks.TextBlock', (), {'help_text': 'Hero subtitle', 'max_length': 500, 'required': False}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Background image', 'required': False}), 3: ('wagtail.blocks.CharBlock', (), {'help_text': 'Background color (hex code, e.g., #ffffff)', 'max_length': 7, 'required': False}), 4: ('wagtail.blocks.CharBlock', (), {'help_text': 'Call-to-action button text', 'max_length': 50, 'required': False}), 5: ('wagtail.blocks.URLBlock', (), {'help_text': 'Call-to-action link', 'required': False}), 6: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('primary', 'Primary Button'), ('secondary', 'Secondary Button'), ('outline', 'Outline Button')]}), 7: ('wagtail.blocks.StructBlock', [[('title', 0), ('subtitle', 1), ('background_image', 2), ('background_color', 3), ('cta_text', 4), ('cta_link', 5), ('cta_style', 6)]], {}), 8: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional heading', 'max_length': 200, 'required': False}), 9: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'Main text content'}), 10: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Optional image or illustration', 'required': False}), 11: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('left', 'Left'), ('right', 'Right'), ('top', 'Top'), ('bottom', 'Bottom')], 'help_text': 'Image position relative to text'}), 12: ('wagtail.blocks.StructBlock', [[('heading', 8), ('text', 9), ('image', 10), ('image_position', 11)]], {}), 13: ('wagtail.blocks.CharBlock', (), {'help_text': 'Section heading', 'max_length': 200, 'required': False}), 14: ('wagtail.blocks.TextBlock', (), {'help_text': 'Section description', 'max_length': 500, 'required': False}), 15: ('wagtail.blocks.CharBlock', (), {'help_text': 'Card title', 'max_length': 200}), 16: ('wagtail.blocks.TextBlock', (), {'help_text': 'Card description', 'max_length': 300}), 17: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Card image', 'required': False}), 18: ('wagtail.blocks.URLBlock', (), {'help_text': 'Card link', 'required': False}), 19: ('wagtail.blocks.CharBlock', (), {'default': 'Learn more', 'max_length': 50, 'required': False}), 20: ('wagtail.blocks.StructBlock', [[('title', 15), ('description', 16), ('image', 17), ('link', 18), ('link_text', 19)]], {}), 21: ('wagtail.blocks.ListBlock', (20,), {'help_text': 'Add cards to display', 'max_num': 12, 'min_num': 1}), 22: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('2', '2 Columns'), ('3', '3 Columns'), ('4', '4 Columns')], 'help_text': 'Number of columns on desktop'}), 23: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('cards', 21), ('columns', 22)]], {}), 24: ('wagtail.blocks.IntegerBlock', (), {'default': 3, 'help_text': 'Number of posts to show', 'max_value': 12, 'min_value': 1}), 25: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('latest', 'Latest'), ('most_read', 'Most read')], 'help_text': 'Most read ranks posts by their all-time views', 'required': False}), 26: ('wagtail.blocks.BooleanBlock', (), {'help_text': 'Show only featured posts', 'required': False}), 27: ('wagtail.blocks.CharBlock', (), {'help_text': 'Filter by tag (optional)', 'max_length': 100, 'required': False}), 28: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post featured images'}), 29: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post excerpts'}), 30: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('post_count', 24), ('ordering', 25), ('show_featured_only', 26), ('tag_filter', 27), ('show_images', 28), ('show_excerpts', 29)]], {}), 31: ('wagtail.blocks.TextBlock', (), {'help_text': 'Quote text'}), 32: ('wagtail.blocks.CharBlock', (), {'help_text': 'Quote author', 'max_length': 100, 'required': False}), 33: ('wagtail.blocks.CharBlock', (), {'help_text': 'Author title/position', 'max_length': 200, 'required': False}), 34: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Author photo', 'required': False}), 35: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('testimonial', 'Testimonial Style'), ('pullquote', 'Pull Quote Style'), ('blockquote', 'Block Quote Style')]}), 36: ('wagtail.blocks.StructBlock', [[('quote', 31), ('author', 32), ('author_title', 33), ('author_image', 34), ('quote_style', 35)]], {}), 37: ('wagtail.blocks.CharBlock', (), {'help_text': 'The number/statistic', 'max_length': 20}), 38: ('wagtail.blocks.CharBlock', (), {'help_text': 'Label for the statistic', 'max_length': 100}), 39: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional description', 'max_length': 200, 'required': False}), 40: ('wagtail.blocks.StructBlock', [[('number', 37), ('label', 38), ('description', 39)]], {}), 41: ('wagtail.blocks.ListBlock', (40,), {'help_text': 'Add statistics', 'max_num': 8, 'min_num': 1}), 42: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('stats', 41)]], {}), 43: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Company logo'}), 44: ('wagtail.blocks.CharBlock', (), {'help_text': 'Company name (for alt text)', 'max_length': 100}), 45: ('wagtail.blocks.URLBlock', (), {'help_text': 'Company website', 'required': False}), 46: ('wagtail.blocks.StructBlock', [[('logo', 43), ('company_name', 44), ('link', 45)]], {}), 47: ('wagtail.blocks.ListBlock', (46,), {'help_text': 'Add company logos', 'max_num': 20, 'min_num': 1}), 48: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Display logos in grayscale'}), 49: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('logos', 47), ('grayscale', 48)]], {}), 50: ('wagtail.blocks.CharBlock', (), {'help_text': 'Main headline', 'max_length': 200}), 51: ('wagtail.blocks.TextBlock', (), {'help_text': 'Supporting text', 'max_length': 500, 'required': False}), 52: ('wagtail.blocks.CharBlock', (), {'help_text': 'Button text', 'max_length': 50}), 53: ('wagtail.blocks.URLBlock', (), {'help_text': 'Button link'}), 54: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('gray', 'Light Gray'), ('primary', 'Primary Color'), ('dark', 'Dark')]}), 55: ('wagtail.blocks.StructBlock', [[('headline', 50), ('subheadline', 51), ('button_text', 52), ('button_link', 53), ('button_style', 6), ('background_color', 54)]], {}), 56: ('wagtail.blocks.CharBlock', (), {'help_text': 'FAQ question', 'max_length': 300}), 57: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'FAQ answer'}), 58: ('wagtail.blocks.StructBlock', [[('question', 56), ('answer', 57)]], {}), 59: ('wagtail.blocks.ListBlock', (58,), {'help_text': 'Add FAQ items', 'min_num': 1}), 60: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('faqs', 59)]], {}), 61: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('form', 'Contact Form'), ('info', 'Contact Information'), ('both', 'Form and Information')]}), 62: ('wagtail.blocks.EmailBlock', (), {'help_text': 'Contact email', 'required': False}), 63: ('wagtail.blocks.CharBlock', (), {'help_text': 'Contact phone', 'max_length': 20, 'required': False}), 64: ('wagtail.blocks.TextBlock', (), {'help_text': 'Contact address', 'required': False}), 65: ('wagtail.blocks.CharBlock', (), {'default': 'Get in Touch', 'max_length': 100, 'required': False}), 66: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('contact_type', 61), ('email', 62), ('phone', 63), ('address', 64), ('form_title', 65)]], {}), 67: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('line', 'Simple Line'), ('dots', 'Dots'), ('wave', 'Wave'), ('space', 'Just Space')]}), 68: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('small', 'Small (2rem)'), ('medium', 'Medium (4rem)'), ('large', 'Large (6rem)')]}), 69: ('wagtail.blocks.StructBlock', [[('divider_style', 67), ('spacing', 68)]], {})}),
+        ),
+        migrations.AlterField(
+            model_name='projectpage',
+            name='content',
+            field=wagtail.fields.StreamField([('hero', 7), ('intro_text', 12), ('card_grid', 23), ('post_list', 30), ('quote', 36), ('stats', 42), ('logos', 49), ('cta_section', 55), ('faq', 60), ('contact', 66), ('divider', 69)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'help_text': 'Hero title', 'max_length': 200}), 1: ('wagtail.blocks.TextBlock', (), {'help_text': 'Hero subtitle', 'max_length': 500, 'required': False}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Background image', 'required': False}), 3: ('wagtail.blocks.CharBlock', (), {'help_text': 'Background color (hex code, e.g., #ffffff)', 'max_length': 7, 'required': False}), 4: ('wagtail.blocks.CharBlock', (), {'help_text': 'Call-to-action button text', 'max_length': 50, 'required': False}), 5: ('wagtail.blocks.URLBlock', (), {'help_text': 'Call-to-action link', 'required': False}), 6: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('primary', 'Primary Button'), ('secondary', 'Secondary Button'), ('outline', 'Outline Button')]}), 7: ('wagtail.blocks.StructBlock', [[('title', 0), ('subtitle', 1), ('background_image', 2), ('background_color', 3), ('cta_text', 4), ('cta_link', 5), ('cta_style', 6)]], {}), 8: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional heading', 'max_length': 200, 'required': False}), 9: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'Main text content'}), 10: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Optional image or illustration', 'required': False}), 11: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('left', 'Left'), ('right', 'Right'), ('top', 'Top'), ('bottom', 'Bottom')], 'help_text': 'Image position relative to text'}), 12: ('wagtail.blocks.StructBlock', [[('heading', 8), ('text', 9), ('image', 10), ('image_position', 11)]], {}), 13: ('wagtail.blocks.CharBlock', (), {'help_text': 'Section heading', 'max_length': 200, 'required': False}), 14: ('wagtail.blocks.TextBlock', (), {'help_text': 'Section description', 'max_length': 500, 'required': False}), 15: ('wagtail.blocks.CharBlock', (), {'help_text': 'Card title', 'max_length': 200}), 16: ('wagtail.blocks.TextBlock', (), {'help_text': 'Card description', 'max_length': 300}), 17: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Card image', 'required': False}), 18: ('wagtail.blocks.URLBlock', (), {'help_text': 'Card link', 'required': False}), 19: ('wagtail.blocks.CharBlock', (), {'default': 'Learn more', 'max_length': 50, 'required': False}), 20: ('wagtail.blocks.StructBlock', [[('title', 15), ('description', 16), ('image', 17), ('link', 18), ('link_text', 19)]], {}), 21: ('wagtail.blocks.ListBlock', (20,), {'help_text': 'Add cards to display', 'max_num': 12, 'min_num': 1}), 22: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('2', '2 Columns'), ('3', '3 Columns'), ('4', '4 Columns')], 'help_text': 'Number of columns on desktop'}), 23: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('cards', 21), ('columns', 22)]], {}), 24: ('wagtail.blocks.IntegerBlock', (), {'default': 3, 'help_text': 'Number of posts to show', 'max_value': 12, 'min_value': 1}), 25: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('latest', 'Latest'), ('most_read', 'Most read')], 'help_text': 'Most read ranks posts by their all-time views', 'required': False}), 26: ('wagtail.blocks.BooleanBlock', (), {'help_text': 'Show only featured posts', 'required': False}), 27: ('wagtail.blocks.CharBlock', (), {'help_text': 'Filter by tag (optional)', 'max_length': 100, 'required': False}), 28: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post featured images'}), 29: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post excerpts'}), 30: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('post_count', 24), ('ordering', 25), ('show_featured_only', 26), ('tag_filter', 27), ('show_images', 28), ('show_excerpts', 29)]], {}), 31: ('wagtail.blocks.TextBlock', (), {'help_text': 'Quote text'}), 32: ('wagtail.blocks.CharBlock', (), {'help_text': 'Quote author', 'max_length': 100, 'required': False}), 33: ('wagtail.blocks.CharBlock', (), {'help_text': 'Author title/position', 'max_length': 200, 'required': False}), 34: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Author photo', 'required': False}), 35: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('testimonial', 'Testimonial Style'), ('pullquote', 'Pull Quote Style'), ('blockquote', 'Block Quote Style')]}), 36: ('wagtail.blocks.StructBlock', [[('quote', 31), ('author', 32), ('author_title', 33), ('author_image', 34), ('quote_style', 35)]], {}), 37: ('wagtail.blocks.CharBlock', (), {'help_text': 'The number/statistic', 'max_length': 20}), 38: ('wagtail.blocks.CharBlock', (), {'help_text': 'Label for the statistic', 'max_length': 100}), 39: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional description', 'max_length': 200, 'required': False}), 40: ('wagtail.blocks.StructBlock', [[('number', 37), ('label', 38), ('description', 39)]], {}), 41: ('wagtail.blocks.ListBlock', (40,), {'help_text': 'Add statistics', 'max_num': 8, 'min_num': 1}), 42: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('stats', 41)]], {}), 43: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Company logo'}), 44: ('wagtail.blocks.CharBlock', (), {'help_text': 'Company name (for alt text)', 'max_length': 100}), 45: ('wagtail.blocks.URLBlock', (), {'help_text': 'Company website', 'required': False}), 46: ('wagtail.blocks.StructBlock', [[('logo', 43), ('company_name', 44), ('link', 45)]], {}), 47: ('wagtail.blocks.ListBlock', (46,), {'help_text': 'Add company logos', 'max_num': 20, 'min_num': 1}), 48: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Display logos in grayscale'}), 49: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('logos', 47), ('grayscale', 48)]], {}), 50: ('wagtail.blocks.CharBlock', (), {'help_text': 'Main headline', 'max_length': 200}), 51: ('wagtail.blocks.TextBlock', (), {'help_text': 'Supporting text', 'max_length': 500, 'required': False}), 52: ('wagtail.blocks.CharBlock', (), {'help_text': 'Button text', 'max_length': 50}), 53: ('wagtail.blocks.URLBlock', (), {'help_text': 'Button link'}), 54: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('gray', 'Light Gray'), ('primary', 'Primary Color'), ('dark', 'Dark')]}), 55: ('wagtail.blocks.StructBlock', [[('headline', 50), ('subheadline', 51), ('button_text', 52), ('button_link', 53), ('button_style', 6), ('background_color', 54)]], {}), 56: ('wagtail.blocks.CharBlock', (), {'help_text': 'FAQ question', 'max_length': 300}), 57: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'FAQ answer'}), 58: ('wagtail.blocks.StructBlock', [[('question', 56), ('answer', 57)]], {}), 59: ('wagtail.blocks.ListBlock', (58,), {'help_text': 'Add FAQ items', 'min_num': 1}), 60: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('faqs', 59)]], {}), 61: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('form', 'Contact Form'), ('info', 'Contact Information'), ('both', 'Form and Information')]}), 62: ('wagtail.blocks.EmailBlock', (), {'help_text': 'Contact email', 'required': False}), 63: ('wagtail.blocks.CharBlock', (), {'help_text': 'Contact phone', 'max_length': 20, 'required': False}), 64: ('wagtail.blocks.TextBlock', (), {'help_text': 'Contact address', 'required': False}), 65: ('wagtail.blocks.CharBlock', (), {'default': 'Get in Touch', 'max_length': 100, 'required': False}), 66: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('contact_type', 61), ('email', 62), ('phone', 63), ('address', 64), ('form_title', 65)]], {}), 67: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('line', 'Simple Line'), ('dots', 'Dots'), ('wave', 'Wave'), ('space', 'Just Space')]}), 68: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('small', 'Small (2rem)'), ('medium', 'Medium (4rem)'), ('large', 'Large (6rem)')]}), 69: ('wagtail.blocks.StructBlock', [[('divider_style', 67), ('spacing', 68)]], {})}, help_text='Main project content'),
+        ),
+        migrations.AlterField(
+            model_name='servicespage',
+            name='content',
+            field=wagtail.fields.StreamField([('hero', 7), ('intro_text', 12), ('card_grid', 23), ('post_list', 30), ('quote', 36), ('stats', 42), ('logos', 49), ('cta_section', 55), ('faq', 60), ('contact', 66), ('divider', 69)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'help_text': 'Hero title', 'max_length': 200}), 1: ('wagtail.blocks.TextBlock', (), {'help_text': 'Hero subtitle', 'max_length': 500, 'required': False}), 2: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Background image', 'required': False}), 3: ('wagtail.blocks.CharBlock', (), {'help_text': 'Background color (hex code, e.g., #ffffff)', 'max_length': 7, 'required': False}), 4: ('wagtail.blocks.CharBlock', (), {'help_text': 'Call-to-action button text', 'max_length': 50, 'required': False}), 5: ('wagtail.blocks.URLBlock', (), {'help_text': 'Call-to-action link', 'required': False}), 6: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('primary', 'Primary Button'), ('secondary', 'Secondary Button'), ('outline', 'Outline Button')]}), 7: ('wagtail.blocks.StructBlock', [[('title', 0), ('subtitle', 1), ('background_image', 2), ('background_color', 3), ('cta_text', 4), ('cta_link', 5), ('cta_style', 6)]], {}), 8: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional heading', 'max_length': 200, 'required': False}), 9: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'Main text content'}), 10: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Optional image or illustration', 'required': False}), 11: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('left', 'Left'), ('right', 'Right'), ('top', 'Top'), ('bottom', 'Bottom')], 'help_text': 'Image position relative to text'}), 12: ('wagtail.blocks.StructBlock', [[('heading', 8), ('text', 9), ('image', 10), ('image_position', 11)]], {}), 13: ('wagtail.blocks.CharBlock', (), {'help_text': 'Section heading', 'max_length': 200, 'required': False}), 14: ('wagtail.blocks.TextBlock', (), {'help_text': 'Section description', 'max_length': 500, 'required': False}), 15: ('wagtail.blocks.CharBlock', (), {'help_text': 'Card title', 'max_length': 200}), 16: ('wagtail.blocks.TextBlock', (), {'help_text': 'Card description', 'max_length': 300}), 17: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Card image', 'required': False}), 18: ('wagtail.blocks.URLBlock', (), {'help_text': 'Card link', 'required': False}), 19: ('wagtail.blocks.CharBlock', (), {'default': 'Learn more', 'max_length': 50, 'required': False}), 20: ('wagtail.blocks.StructBlock', [[('title', 15), ('description', 16), ('image', 17), ('link', 18), ('link_text', 19)]], {}), 21: ('wagtail.blocks.ListBlock', (20,), {'help_text': 'Add cards to display', 'max_num': 12, 'min_num': 1}), 22: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('2', '2 Columns'), ('3', '3 Columns'), ('4', '4 Columns')], 'help_text': 'Number of columns on desktop'}), 23: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('cards', 21), ('columns', 22)]], {}), 24: ('wagtail.blocks.IntegerBlock', (), {'default': 3, 'help_text': 'Number of posts to show', 'max_value': 12, 'min_value': 1}), 25: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('latest', 'Latest'), ('most_read', 'Most read')], 'help_text': 'Most read ranks posts by their all-time views', 'required': False}), 26: ('wagtail.blocks.BooleanBlock', (), {'help_text': 'Show only featured posts', 'required': False}), 27: ('wagtail.blocks.CharBlock', (), {'help_text': 'Filter by tag (optional)', 'max_length': 100, 'required': False}), 28: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post featured images'}), 29: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Show post excerpts'}), 30: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('post_count', 24), ('ordering', 25), ('show_featured_only', 26), ('tag_filter', 27), ('show_images', 28), ('show_excerpts', 29)]], {}), 31: ('wagtail.blocks.TextBlock', (), {'help_text': 'Quote text'}), 32: ('wagtail.blocks.CharBlock', (), {'help_text': 'Quote author', 'max_length': 100, 'required': False}), 33: ('wagtail.blocks.CharBlock', (), {'help_text': 'Author title/position', 'max_length': 200, 'required': False}), 34: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Author photo', 'required': False}), 35: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('testimonial', 'Testimonial Style'), ('pullquote', 'Pull Quote Style'), ('blockquote', 'Block Quote Style')]}), 36: ('wagtail.blocks.StructBlock', [[('quote', 31), ('author', 32), ('author_title', 33), ('author_image', 34), ('quote_style', 35)]], {}), 37: ('wagtail.blocks.CharBlock', (), {'help_text': 'The number/statistic', 'max_length': 20}), 38: ('wagtail.blocks.CharBlock', (), {'help_text': 'Label for the statistic', 'max_length': 100}), 39: ('wagtail.blocks.CharBlock', (), {'help_text': 'Optional description', 'max_length': 200, 'required': False}), 40: ('wagtail.blocks.StructBlock', [[('number', 37), ('label', 38), ('description', 39)]], {}), 41: ('wagtail.blocks.ListBlock', (40,), {'help_text': 'Add statistics', 'max_num': 8, 'min_num': 1}), 42: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('stats', 41)]], {}), 43: ('wagtail.images.blocks.ImageChooserBlock', (), {'help_text': 'Company logo'}), 44: ('wagtail.blocks.CharBlock', (), {'help_text': 'Company name (for alt text)', 'max_length': 100}), 45: ('wagtail.blocks.URLBlock', (), {'help_text': 'Company website', 'required': False}), 46: ('wagtail.blocks.StructBlock', [[('logo', 43), ('company_name', 44), ('link', 45)]], {}), 47: ('wagtail.blocks.ListBlock', (46,), {'help_text': 'Add company logos', 'max_num': 20, 'min_num': 1}), 48: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Display logos in grayscale'}), 49: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('logos', 47), ('grayscale', 48)]], {}), 50: ('wagtail.blocks.CharBlock', (), {'help_text': 'Main headline', 'max_length': 200}), 51: ('wagtail.blocks.TextBlock', (), {'help_text': 'Supporting text', 'max_length': 500, 'required': False}), 52: ('wagtail.blocks.CharBlock', (), {'help_text': 'Button text', 'max_length': 50}), 53: ('wagtail.blocks.URLBlock', (), {'help_text': 'Button link'}), 54: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('white', 'White'), ('gray', 'Light Gray'), ('primary', 'Primary Color'), ('dark', 'Dark')]}), 55: ('wagtail.blocks.StructBlock', [[('headline', 50), ('subheadline', 51), ('button_text', 52), ('button_link', 53), ('button_style', 6), ('background_color', 54)]], {}), 56: ('wagtail.blocks.CharBlock', (), {'help_text': 'FAQ question', 'max_length': 300}), 57: ('wagtail.blocks.RichTextBlock', (), {'help_text': 'FAQ answer'}), 58: ('wagtail.blocks.StructBlock', [[('question', 56), ('answer', 57)]], {}), 59: ('wagtail.blocks.ListBlock', (58,), {'help_text': 'Add FAQ items', 'min_num': 1}), 60: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('faqs', 59)]], {}), 61: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('form', 'Contact Form'), ('info', 'Contact Information'), ('both', 'Form and Information')]}), 62: ('wagtail.blocks.EmailBlock', (), {'help_text': 'Contact email', 'required': False}), 63: ('wagtail.blocks.CharBlock', (), {'help_text': 'Contact phone', 'max_length': 20, 'required': False}), 64: ('wagtail.blocks.TextBlock', (), {'help_text': 'Contact address', 'required': False}), 65: ('wagtail.blocks.CharBlock', (), {'default': 'Get in Touch', 'max_length': 100, 'required': False}), 66: ('wagtail.blocks.StructBlock', [[('heading', 13), ('description', 14), ('contact_type', 61), ('email', 62), ('phone', 63), ('address', 64), ('form_title', 65)]], {}), 67: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('line', 'Simple Line'), ('dots', 'Dots'), ('wave', 'Wave'), ('space', 'Just Space')]}), 68: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('small', 'Small (2rem)'), ('medium', 'Medium (4rem)'), ('large', 'Large (6rem)')]}), 69: ('wagtail.blocks.StructBlock', [[('divider_style', 67), ('spacing', 68)]], {})}),
+        ),
+        migrations.CreateModel(
+            name='PageViewTotal',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='view_total', serialize=False, to='wagtailcore.page')),
+                ('views', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-views'], name='pages_pageviewtotal_views_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PageViewDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.page')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('page', 'date'), name='pages_pageviewday_page_date_uniq')],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from wagtail.models import Page
 from wagtail.fields import RichTextField, StreamField
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel
+from wagtail.images import get_image_model_string
 from wagtail.images.blocks import ImageChooserBlock
 from wagtail import blocks
 from wagtail.search import index
@@ -10,6 +11,9 @@ from modelcluster.models import ClusterableModel
 from taggit.models import TaggedItemBase
 from wagtail.snippets.models import register_snippet
 from .blocks import STREAMFIELD_BLOCKS
+from .pagination import KeysetPaginator
+from .renditions import prefetch_renditions
+from .text import PlainTextBodyMixin
 
 
 class HomePage(Page):
@@ -69,6 +73,9 @@ class ServicesPage(Page):
 class BlogIndexPage(Page):
     """Blog listing page"""
     
+    # The page lists its descendants; see pages.conditional
+    lists_descendants = True
+    
     intro = RichTextField(blank=True, help_text="Introduction text for the blog")
     posts_per_page = models.IntegerField(default=10, help_text="Number of posts per page")
     
@@ -80,10 +87,37 @@ class BlogIndexPage(Page):
     def get_context(self, request):
         context = super().get_context(request)
         from blog.models import BlogPage
-        blog_posts = BlogPage.objects.live().descendant_of(self).order_by('-first_published_at')
-        context['blog_posts'] = blog_posts
+        blog_posts = (
+            BlogPage.objects
+            .defer('content')
+            .select_related('featured_image__placeholder')
+            .prefetch_related('tags', prefetch_renditions('featured_image', 'blog_listing'))
+        )
+        paginator = KeysetPaginator(
+            blog_posts, self.posts_per_page,
+            keys=Page.objects.live().exact_type(BlogPage).descendant_of(self),
+        )
+        context['blog_posts'] = paginator.page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
         return context
     
+    def route(self, request, path_components):
+        if len(path_components) == 1:
+            # The post, its specific fields and its featured image in one
+            # query, rather than one after another as Page.route would
+            from blog.models import BlogPage
+            post = (
+                BlogPage.objects.child_of(self)
+                .select_related('featured_image__placeholder')
+                .filter(slug=path_components[0])
+                .first()
+            )
+            if post is not None:
+                return post.route(request, [])
+        return super().route(request, path_components)
+    
     class Meta:
         verbose_name = "Blog Index Page"
 
@@ -94,6 +128,9 @@ class BlogIndexPage(Page):
 class ProjectIndexPage(Page):
     """Project listing page"""
     
+    # The page lists its descendants; see pages.conditional
+    lists_descendants = True
+    
     intro = RichTextField(blank=True, help_text="Introduction text for the projects section")
     projects_per_page = models.IntegerField(default=12, help_text="Number of projects per page")
     
@@ -104,15 +141,27 @@ class ProjectIndexPage(Page):
     
     def get_context(self, request):
         context = super().get_context(request)
-        projects = ProjectPage.objects.live().descendant_of(self).order_by('-first_published_at')
-        context['projects'] = projects
+        projects = (
+            ProjectPage.objects
+            .defer('content')
+            .select_related('featured_image__placeholder')
+            .prefetch_related(prefetch_renditions('featured_image', 'project_listing'))
+        )
+        paginator = KeysetPaginator(
+            projects, self.projects_per_page,
+            keys=Page.objects.live().exact_type(ProjectPage).descendant_of(self),
+        )
+        context['projects'] = paginator.page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
         return context
     
     class Meta:
         verbose_name = "Project Index Page"
 
 
-class ProjectPage(Page):
+class ProjectPage(PlainTextBodyMixin, Page):
     """Individual project page with flexible content"""
     
     # Essential project info
@@ -256,3 +305,53 @@ class SiteSettings(ClusterableModel):
     
     def __str__(self):
         return self.site_name
+
+
+class ImagePlaceholder(models.Model):
+    """Tiny blurred preview and dominant colour of an image, shown while it loads"""
+    
+    image = models.OneToOneField(
+        get_image_model_string(), on_delete=models.CASCADE, primary_key=True, related_name='placeholder',
+    )
+    data_uri = models.TextField(help_text="Data URI of a blurred, few pixels wide thumbnail")
+    width = models.PositiveSmallIntegerField()
+    height = models.PositiveSmallIntegerField()
+    color = models.CharField(max_length=7, help_text="Dominant colour as #rrggbb")
+    source = models.CharField(max_length=255, help_text="File hash the placeholder was computed from")
+    
+    def __str__(self):
+        return f"Placeholder for image {self.image_id}"
+
+
+class PageViewDay(models.Model):
+    """Views of a page on one day, added to in batches by pages.page_views"""
+    
+    page = models.ForeignKey('wagtailcore.Page', on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            # The conflict target of the flush upsert
+            models.UniqueConstraint(fields=['page', 'date'], name='pages_pageviewday_page_date_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.views} views of page {self.page_id} on {self.date}"
+
+
+class PageViewTotal(models.Model):
+    """All-time views of a page, kept alongside the daily rows for "most read" lists"""
+    
+    page = models.OneToOneField(
+        'wagtailcore.Page', on_delete=models.CASCADE, primary_key=True, related_name='view_total',
+    )
+    views = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-views'], name='pages_pageviewtotal_views_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.views} views of page {self.page_id}"
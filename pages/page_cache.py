@@ -0,0 +1,252 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from .post_lists import post_list_values
+from .site_settings import get_site_settings_version
+
+KEY_PREFIX = 'pagecache'
+
+# Entries of every page that renders a PostListBlock are tagged with this,
+# so publishing any blog post refreshes them.
+POST_LIST_TAG = 'post_list'
+
+# Every entry is tagged with this; it is purged when something all pages
+# render changes, like the main menu. Page ETags include its generation.
+LAYOUT_TAG = 'layout'
+
+
+def is_enabled():
+    return getattr(settings, 'PAGE_CACHE_ENABLED', False)
+
+
+def get_cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def get_generation_cache():
+    # Apart from the entries, so culling old entries never drops a generation
+    return caches[getattr(settings, 'PAGE_CACHE_GENERATION_ALIAS', 'default')]
+
+
+def page_tag(page_id):
+    return f'page:{page_id}'
+
+
+def page_tags(page):
+    """Tags a rendered page is stored under, used to find it again on purge"""
+    tags = [LAYOUT_TAG, page_tag(page.pk)]
+    if post_list_values(page):
+        tags.append(POST_LIST_TAG)
+    return tags
+
+
+def is_cacheable_page(page):
+    return not getattr(page, 'is_members_only', False)
+
+
+def is_shareable_response(request, response):
+    """Whether a response is identical for every anonymous visitor"""
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        return False
+    if request.session.modified:
+        return False
+    return 'private' not in response.get('Cache-Control', '')
+
+
+def entry_key(request):
+    # Only the query parameters pages read are part of the key, so tracking
+    # parameters and cache busters share the entry of the plain URL.
+    # The scheme keeps plain HTTP requests away from entries stored for HTTPS,
+    # so SecurityMiddleware below the cache still redirects them
+    allowed = getattr(settings, 'PAGE_CACHE_QUERY_PARAMS', ())
+    query = urlencode(sorted(item for item in request.GET.lists() if item[0] in allowed), doseq=True)
+    raw = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    # Pages render the site settings, so a change to them starts new entries
+    raw += f'#{get_site_settings_version()}'
+    return f'{KEY_PREFIX}:entry:{hashlib.md5(raw.encode("utf-8")).hexdigest()}'
+
+
+def _generation_key(tag):
+    return f'{KEY_PREFIX}:gen:{tag}'
+
+
+def _new_generation():
+    # Led by the time it began, which index pages send as Last-Modified
+    return f'{int(time.time())}-{uuid.uuid4().hex}'
+
+
+def generation_started(generation):
+    """Unix time a generation began, or None"""
+    started, _, _ = (generation or '').partition('-')
+    return int(started) if started.isdigit() else None
+
+
+def current_generations(tags):
+    """Map each tag to its current generation, None for tags without one"""
+    found = get_generation_cache().get_many([_generation_key(tag) for tag in tags])
+    return {tag: found.get(_generation_key(tag)) for tag in tags}
+
+
+def tag_generations(tags):
+    """
+    Map each tag to its current generation, starting one for tags without.
+
+    Entries remember the generations of their tags when the page was
+    rendered; purging a tag moves it to a new generation, so those entries
+    stop matching and are rendered again.
+    """
+    generations = current_generations(tags)
+    missing = [tag for tag, generation in generations.items() if generation is None]
+    if missing:
+        cache = get_generation_cache()
+        for tag in missing:
+            # add(), so a generation another process just started wins
+            cache.add(_generation_key(tag), _new_generation(), None)
+        generations.update(current_generations(missing))
+    return generations
+
+
+def get_entry(request):
+    entry = get_cache().get(entry_key(request))
+    if entry is None or not entry.get('tags'):
+        return None
+    # A generation that is gone (a cleared or lost generation cache) can't
+    # vouch for the entry, so it counts as a miss
+    if current_generations(entry['tags']) != entry['tags']:
+        return None
+    return entry
+
+
+def store_entry(request, response, tags):
+    """
+    Store a rendered page.
+
+    ``tags`` maps the page's tags to their generations as read before it
+    was rendered, so a purge that lands mid-render still invalidates it.
+    """
+    headers = {
+        name: value for name, value in response.items()
+        if name.lower() != 'set-cookie'
+    }
+    entry = {
+        'content': response.content,
+        'headers': headers,
+        'tags': tags,
+        # So hits are counted as views of the page
+        'page_id': getattr(request, 'viewed_page_id', None),
+    }
+    get_cache().set(entry_key(request), entry, getattr(settings, 'PAGE_CACHE_TIMEOUT', None))
+
+
+def purge_tags(tags):
+    """Invalidate every entry stored under any of ``tags``"""
+    generation = _new_generation()
+    get_generation_cache().set_many({_generation_key(tag): generation for tag in tags}, None)
+
+
+def layout_generation():
+    return tag_generations([LAYOUT_TAG])[LAYOUT_TAG]
+
+
+def purge_layout():
+    """Invalidate every cached page, and every page ETag handed out"""
+    purge_tags([LAYOUT_TAG])
+
+
+def purge_page(page, include_descendants=False):
+    """
+    Purge the cached responses a change to ``page`` can affect.
+
+    That is the page itself, every ancestor (index pages list their
+    descendants) and, for blog posts, every page rendering a post list.
+    """
+    from blog.models import BlogPage
+
+    affected = page.get_ancestors(inclusive=True)
+    if include_descendants:
+        affected = affected | page.get_descendants()
+    tags = [page_tag(pk) for pk in affected.values_list('pk', flat=True)]
+    if issubclass(page.specific_class, BlogPage):
+        tags.append(POST_LIST_TAG)
+    purge_tags(tags)
+
+
+# Hit and miss counts of this process not yet added to the shared totals
+_counts = Counter()
+_counts_lock = threading.Lock()
+_counts_flushed_at = time.monotonic()
+
+
+def _count(outcome):
+    """Count a lookup in this process; returns the counts due to be flushed, if any"""
+    global _counts_flushed_at
+    interval = getattr(settings, 'PAGE_CACHE_STATS_INTERVAL', 10)
+    with _counts_lock:
+        _counts[outcome] += 1
+        now = time.monotonic()
+        if now - _counts_flushed_at < interval:
+            return None
+        counts = dict(_counts)
+        _counts.clear()
+        _counts_flushed_at = now
+    return counts
+
+
+def flush_counts(counts):
+    """Add a process's hit and miss counts to the totals in the shared cache"""
+    cache = get_cache()
+    for outcome, count in counts.items():
+        key = f'{KEY_PREFIX}:stats:{outcome}'
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            cache.set(key, count, None)
+
+
+def record(outcome):
+    """
+    Count a cache hit or miss.
+
+    Lookups only bump a counter in this process, which is added to the
+    shared totals at most every PAGE_CACHE_STATS_INTERVAL seconds, so hits
+    don't pay for a file write.
+    """
+    counts = _count(outcome)
+    if counts:
+        flush_counts(counts)
+
+
+async def arecord(outcome):
+    counts = _count(outcome)
+    if counts:
+        await sync_to_async(flush_counts, thread_sensitive=False)(counts)
+
+
+# Cache backends are thread-safe, so the async variants run in the shared
+# executor rather than waiting on the request's sync thread
+aget_entry = sync_to_async(get_entry, thread_sensitive=False)
+astore_entry = sync_to_async(store_entry, thread_sensitive=False)
+
+
+def stats():
+    """Shared hit and miss totals; each process's latest counts are added with a delay"""
+    cache = get_cache()
+    hits = cache.get(f'{KEY_PREFIX}:stats:hit', 0)
+    misses = cache.get(f'{KEY_PREFIX}:stats:miss', 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / lookups if lookups else 0.0,
+    }
@@ -0,0 +1,217 @@
+"""
+Page view counting that never writes to the database while a response is
+being produced.
+
+Views are added to a buffer in this process, keyed by (page, day), and
+flushed in one transaction of upserts into the daily rollup and the
+all-time totals, so SQLite sees one short write per worker per flush
+however busy the site is. A daemon thread flushes every
+PAGE_VIEWS_FLUSH_INTERVAL seconds, and a finished request flushes once
+PAGE_VIEWS_FLUSH_MAX_VIEWS views have piled up or the buffer has waited a
+whole interval (when the thread is starved, or lost to a fork). Counts
+still buffered when the process exits are flushed by atexit.
+
+A worker that dies without running atexit (SIGKILL, the OOM killer, a
+server timeout) loses its buffer silently: at most
+PAGE_VIEWS_FLUSH_MAX_VIEWS views, or one interval of them, per worker.
+"""
+import atexit
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+from django.utils import timezone
+from wagtail.models import Page
+
+logger = logging.getLogger(__name__)
+
+# Page types whose views are counted
+COUNTED_MODELS = ('blog.BlogPage', 'pages.ProjectPage')
+
+DEFAULT_BOT_PATTERN = (
+    r'bot|crawl|spider|slurp|scrape|fetch|preview|monitor|uptime|headless|lighthouse|'
+    r'curl|wget|httpie|python-|go-http|java/|okhttp|libwww|facebookexternalhit|embedly'
+)
+
+
+class ViewBuffer:
+    """Thread-safe counts of (page id, date) -> views awaiting a flush"""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._views = 0
+        self._since = None
+        self._lock = threading.Lock()
+
+    def add(self, page_id, day, views=1):
+        with self._lock:
+            self._counts[page_id, day] += views
+            self._views += views
+            self._started()
+
+    def merge(self, counts):
+        """Put back counts a flush failed to write; they wait for the next
+        interval or the next batch of views rather than being retried at once"""
+        with self._lock:
+            self._counts.update(counts)
+            self._started()
+
+    def _started(self):
+        if self._since is None:
+            self._since = time.monotonic()
+
+    def drain(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._views, self._since = 0, None
+        return counts
+
+    def is_due(self, max_views, max_age):
+        """Whether ``max_views`` views were added since the last drain, or
+        the oldest count has waited ``max_age`` seconds"""
+        with self._lock:
+            if self._since is None:
+                return False
+            return self._views >= max_views or time.monotonic() - self._since >= max_age
+
+    def __len__(self):
+        with self._lock:
+            return len(self._counts)
+
+
+view_buffer = ViewBuffer()
+
+
+def is_enabled():
+    return getattr(settings, 'PAGE_VIEWS_ENABLED', False)
+
+
+def is_counted_page(page):
+    return page._meta.label in COUNTED_MODELS
+
+
+@lru_cache(maxsize=1)
+def _bot_re(pattern):
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def is_bot(request):
+    """Crawlers, link previews, scripts and browser prefetches, by their headers"""
+    user_agent = request.headers.get('User-Agent', '')
+    if not user_agent:
+        return True
+    purpose = request.headers.get('Sec-Purpose', '') or request.headers.get('Purpose', '')
+    if 'prefetch' in purpose:
+        return True
+    return bool(_bot_re(getattr(settings, 'PAGE_VIEWS_BOT_PATTERN', DEFAULT_BOT_PATTERN)).search(user_agent))
+
+
+def record(page_id):
+    """Count one view of a page; costs a dict update"""
+    view_buffer.add(page_id, timezone.localdate())
+    flusher.start()
+
+
+def _upsert_sql(connection, model, conflict_fields, columns):
+    table = connection.ops.quote_name(model._meta.db_table)
+    names = ', '.join(connection.ops.quote_name(column) for column in columns)
+    conflict = ', '.join(connection.ops.quote_name(column) for column in conflict_fields)
+    views = connection.ops.quote_name('views')
+    return (
+        f'INSERT INTO {table} ({names}) VALUES ({", ".join(["%s"] * len(columns))}) '
+        f'ON CONFLICT ({conflict}) DO UPDATE SET {views} = {table}.{views} + excluded.{views}'
+    )
+
+
+def write_counts(counts):
+    """Add ``counts`` to the daily and total tables in one transaction"""
+    from .models import PageViewDay, PageViewTotal
+
+    alias = router.db_for_write(PageViewDay)
+    connection = connections[alias]
+    # Views of pages deleted since would break the foreign keys
+    existing = set(
+        Page.objects.using(alias).filter(pk__in={page_id for page_id, _ in counts}).order_by()
+        .values_list('pk', flat=True)
+    )
+    days = [
+        (page_id, connection.ops.adapt_datefield_value(day), views)
+        for (page_id, day), views in counts.items()
+        if page_id in existing
+    ]
+    totals = Counter()
+    for page_id, _, views in days:
+        totals[page_id] += views
+
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        cursor.executemany(
+            _upsert_sql(connection, PageViewDay, ['page_id', 'date'], ['page_id', 'date', 'views']), days,
+        )
+        cursor.executemany(
+            _upsert_sql(connection, PageViewTotal, ['page_id'], ['page_id', 'views']), list(totals.items()),
+        )
+    return sum(totals.values())
+
+
+def flush():
+    """Write the buffered views; on failure they go back into the buffer"""
+    counts = view_buffer.drain()
+    if not counts:
+        return 0
+    try:
+        return write_counts(counts)
+    except DatabaseError:
+        logger.exception('Flushing %d page view counts failed; retrying next interval', len(counts))
+        view_buffer.merge(counts)
+        return 0
+
+
+def flush_if_due():
+    """Flush from a finished request once the buffer is too full or too old"""
+    if view_buffer.is_due(
+        getattr(settings, 'PAGE_VIEWS_FLUSH_MAX_VIEWS', 500),
+        getattr(settings, 'PAGE_VIEWS_FLUSH_INTERVAL', 30),
+    ):
+        return flush()
+    return 0
+
+
+class Flusher:
+    """Daemon thread flushing the view buffer, started on the first recorded view"""
+
+    def __init__(self):
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='page-views-flusher', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def run(self):
+        interval = getattr(settings, 'PAGE_VIEWS_FLUSH_INTERVAL', 30)
+        while not self._stop.wait(interval):
+            try:
+                flush()
+            except Exception:
+                logger.exception('Page view flush failed')
+            finally:
+                # The thread's connection would otherwise stay open between flushes
+                connections.close_all()
+
+    def stop(self):
+        self._stop.set()
+        flush()
+
+
+flusher = Flusher()
@@ -0,0 +1,114 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(page):
+    """Opaque cursor for a page's position in (first_published_at, id) order"""
+    raw = f'{page.first_published_at.isoformat()}|{page.pk}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (first_published_at, id) for a cursor, or None if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        published, pk = base64.urlsafe_b64decode(padded).decode('ascii').split('|')
+        published_at = parse_datetime(published)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if published_at is None:
+        return None
+    return published_at, pk
+
+
+class KeysetPage:
+    """One page of keyset-paginated results"""
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.object_list:
+            return encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous and self.object_list:
+            return encode_cursor(self.object_list[0])
+        return None
+
+
+class KeysetPaginator:
+    """
+    Paginate pages newest first using (first_published_at, id) cursors.
+
+    Every page is a bounded range scan from the cursor instead of an OFFSET,
+    so deep archive pages cost the same as the first one, and a given cursor
+    always maps to the same URL for caches.
+
+    ``keys`` optionally selects the same rows from the table holding
+    ``first_published_at``, e.g. ``Page`` for a queryset of a Page subclass.
+    The range scan then runs on that table alone, where it can use the
+    pages_page_live_type_published_idx index, and ``queryset`` only fetches
+    the rows it picked.
+    """
+
+    def __init__(self, queryset, per_page, keys=None):
+        self.queryset = queryset
+        self.keys = (queryset if keys is None else keys).filter(first_published_at__isnull=False)
+        self.per_page = max(int(per_page), 1)
+
+    def _fetch(self, keys, *ordering):
+        limited = keys.order_by(*ordering)[:self.per_page + 1]
+        if keys.model is self.queryset.model:
+            return list(limited)
+        return list(self.queryset.filter(pk__in=limited.values('pk')).order_by(*ordering))
+
+    def page(self, after=None, before=None):
+        after = decode_cursor(after) if after else None
+        before = decode_cursor(before) if before else None
+
+        if before is not None:
+            published_at, pk = before
+            rows = self._fetch(
+                self.keys.filter(
+                    Q(first_published_at__gt=published_at)
+                    | Q(first_published_at=published_at, pk__gt=pk)
+                ),
+                'first_published_at', 'pk',
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            rows.reverse()
+            return KeysetPage(rows, has_next=True, has_previous=has_previous)
+
+        keys = self.keys
+        if after is not None:
+            published_at, pk = after
+            keys = keys.filter(
+                Q(first_published_at__lt=published_at)
+                | Q(first_published_at=published_at, pk__lt=pk)
+            )
+        rows = self._fetch(keys, '-first_published_at', '-pk')
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page], has_next=has_next, has_previous=after is not None)
@@ -0,0 +1,159 @@
+import base64
+import io
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import caches
+from PIL import Image as PILImage
+
+try:
+    # Lets Pillow open HEIC/AVIF originals, as Willow does
+    from pillow_heif import HeifImagePlugin  # noqa: F401
+except ImportError:
+    pass
+
+from .block_cache import block_render_cache
+from .models import ImagePlaceholder
+
+# Longest side of the stored thumbnail; the browser blurs it up to size
+PLACEHOLDER_SIZE = 16
+
+CACHE_PREFIX = 'imageplaceholder'
+
+# Characters left unescaped in the SVG data URI, which is embedded in a
+# double-quoted CSS url() inside an HTML attribute
+_URI_SAFE = " /:=,;+()"
+
+# Cached for images without a placeholder, so misses aren't queried on
+# every render; kept only briefly, as the task generating one may be queued
+_MISSING = ''
+
+
+def get_cache():
+    return caches[getattr(settings, 'IMAGE_PLACEHOLDER_CACHE_ALIAS', 'default')]
+
+
+def source_key(image):
+    """What a placeholder was computed from; a new file means a new placeholder"""
+    return image.file_hash or image.file.name
+
+
+def compute_placeholder(image):
+    """Build an unsaved ImagePlaceholder for a Wagtail image"""
+    with image.open_file() as f:
+        with PILImage.open(f) as source:
+            source.draft('RGB', (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+            thumbnail = source.convert('RGB')
+    thumbnail.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), PILImage.Resampling.LANCZOS)
+
+    # Most frequent colour after reducing the thumbnail to a small palette
+    palette = thumbnail.quantize(colors=4)
+    _, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3:index * 3 + 3]
+
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format='WEBP', quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return ImagePlaceholder(
+        image=image,
+        data_uri=_blurred_svg(f'data:image/webp;base64,{encoded}', thumbnail.width, thumbnail.height),
+        width=thumbnail.width,
+        height=thumbnail.height,
+        color=f'#{red:02x}{green:02x}{blue:02x}',
+        source=source_key(image),
+    )
+
+
+def _blurred_svg(thumbnail_uri, width, height):
+    """Wrap the thumbnail in an SVG blur so it scales up smoothly instead of pixelated"""
+    svg = (
+        f"<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 {width} {height}'>"
+        "<filter id='b' color-interpolation-filters='sRGB'><feGaussianBlur stdDeviation='1'/></filter>"
+        f"<image preserveAspectRatio='none' filter='url(#b)' width='100%' height='100%' href='{thumbnail_uri}'/>"
+        "</svg>"
+    )
+    return 'data:image/svg+xml;charset=utf-8,' + quote(svg, safe=_URI_SAFE)
+
+
+def _cache_key(image_id):
+    return f'{CACHE_PREFIX}:{image_id}'
+
+
+def _timeout(placeholder):
+    if placeholder is _MISSING:
+        return getattr(settings, 'IMAGE_PLACEHOLDER_MISS_TIMEOUT', 60)
+    return getattr(settings, 'IMAGE_PLACEHOLDER_CACHE_TIMEOUT', None)
+
+
+def update_placeholders(images, force=False):
+    """
+    Compute and store placeholders for images that lack a current one.
+
+    Returns the number of placeholders written.
+    """
+    images = list(images)
+    existing = ImagePlaceholder.objects.in_bulk([image.pk for image in images])
+    placeholders = []
+    for image in images:
+        current = existing.get(image.pk)
+        if not force and current is not None and current.source == source_key(image):
+            continue
+        placeholders.append(compute_placeholder(image))
+
+    ImagePlaceholder.objects.bulk_create(
+        placeholders,
+        update_conflicts=True,
+        unique_fields=['image'],
+        update_fields=['data_uri', 'width', 'height', 'color', 'source'],
+    )
+    get_cache().delete_many([_cache_key(placeholder.image_id) for placeholder in placeholders])
+    if placeholders:
+        # Rendered blocks inline the placeholder; bulk_create sends no post_save
+        block_render_cache.invalidate()
+    return len(placeholders)
+
+
+def get_placeholder(image):
+    """
+    The stored placeholder of an image, or None.
+
+    Uses a select_related/prefetched placeholder when there is one, otherwise
+    the shared cache, so repeat renders cost neither Pillow work nor queries.
+    """
+    if 'placeholder' in image._state.fields_cache:
+        return image._state.fields_cache['placeholder']
+
+    cache = get_cache()
+    key = _cache_key(image.pk)
+    placeholder = cache.get(key)
+    if placeholder is None:
+        placeholder = ImagePlaceholder.objects.filter(image_id=image.pk).first() or _MISSING
+        cache.set(key, placeholder, _timeout(placeholder))
+    return placeholder or None
+
+
+def prefetch_placeholders(images):
+    """
+    Attach stored placeholders to ``images`` ahead of get_placeholder().
+
+    The cache is read for all of them at once and the database queried once
+    for the misses, instead of once per image as each one renders.
+    """
+    images = [image for image in images if 'placeholder' not in image._state.fields_cache]
+    if not images:
+        return
+
+    cache = get_cache()
+    placeholders = {
+        int(key.rpartition(':')[2]): placeholder
+        for key, placeholder in cache.get_many([_cache_key(image.pk) for image in images]).items()
+    }
+    missing = {image.pk for image in images} - placeholders.keys()
+    if missing:
+        stored = ImagePlaceholder.objects.in_bulk(missing)
+        for image_id in missing:
+            placeholder = placeholders[image_id] = stored.get(image_id, _MISSING)
+            cache.set(_cache_key(image_id), placeholder, _timeout(placeholder))
+
+    for image in images:
+        image._state.fields_cache['placeholder'] = placeholders[image.pk] or None
@@ -0,0 +1,177 @@
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils.text import slugify
+from wagtail.models import Page, PageViewRestriction
+
+from blog.models import BlogPage, BlogPageTag
+
+from .models import PageViewTotal
+from .renditions import prefetch_renditions
+
+POST_LIST_BLOCK_TYPE = 'post_list'
+
+# Rendition set requested for each post by templates/blocks/post_list_block.html
+POST_LIST_RENDITION_SET = 'card'
+
+# BlogPage columns the post list template and {% pageurl %} need
+POST_LIST_FIELDS = (
+    'id',
+    'path',
+    'depth',
+    'url_path',
+    'locale_id',
+    'title',
+    'slug',
+    'intro',
+    'first_published_at',
+    'last_published_at',
+    'featured_image',
+)
+
+
+# The order of the views index; ties go to the older page
+MOST_READ_ORDERING = [F('views').desc(), F('page_id')]
+
+
+def post_list_values(page):
+    """Values of every PostListBlock in a page's content StreamField"""
+    content = getattr(page, 'content', None)
+    if not content:
+        return []
+    return [
+        block.value for block in content
+        if block.block_type == POST_LIST_BLOCK_TYPE
+    ]
+
+
+def _private_q():
+    """
+    Wagtail's ``private_q()``, finding the restricted pages by id.
+
+    Wagtail joins the pages table to the (usually empty) view restrictions
+    table, and SQLite, having no statistics for an empty table, drives that
+    join from the pages side: a full scan of every page.
+    """
+    restricted = Page.objects.filter(pk__in=PageViewRestriction.objects.values('page_id')).only('path', 'depth')
+    q = Q()
+    for page in restricted:
+        q |= Page.objects.descendant_of_q(page, inclusive=True)
+    # Match nothing when no section is private
+    return q if q else Q(pk__in=[])
+
+
+def _tag_slug(block_value):
+    tag_filter = block_value.get('tag_filter')
+    return slugify(tag_filter) if tag_filter else None
+
+
+def _tagged_ids(tag_slug):
+    return BlogPageTag.objects.filter(tag__slug=tag_slug).values('content_object_id')
+
+
+def _block_condition(block_value):
+    tag_slug = _tag_slug(block_value)
+    if tag_slug:
+        # An exact slug match can use taggit's unique slug index, where a
+        # substring match on the name would scan every tag
+        return Q(Exists(BlogPageTag.objects.filter(
+            content_object=OuterRef('pk'),
+            tag__slug=tag_slug,
+        )))
+    # show_featured_only would need a featured flag on BlogPage; until one
+    # exists every post matches.
+    return Q()
+
+
+def _is_most_read(block_value):
+    return block_value.get('ordering') == 'most_read'
+
+
+def _matches(post, block_value):
+    tag_slug = _tag_slug(block_value)
+    return not tag_slug or any(tag.slug == tag_slug for tag in post.tags.all())
+
+
+def fetch_post_lists(block_values):
+    """
+    Resolve several PostListBlock values with a single posts query.
+
+    Each block contributes a LIMITed subquery of the ids of its newest
+    posts. It runs on the pages table alone, reading the live pages index
+    by publish date and stopping after ``post_count`` rows instead of
+    ranking every post.
+    Tags and the listing rendition of each featured image are prefetched,
+    which keeps the total number of queries constant however many blocks
+    and posts are shown.
+
+    Returns one list of BlogPage instances per block value, in order.
+    """
+    if not block_values:
+        return []
+
+    ordering = [F('first_published_at').desc(nulls_last=True), F('pk').desc()]
+    private = _private_q()
+    selected = Q()
+    for block_value in block_values:
+        if _is_most_read(block_value):
+            # Checked per row with EXISTS rather than joined, so the query
+            # has only the totals table to walk: down its views index,
+            # stopping at post_count
+            listed = Page.objects.live().exact_type(BlogPage).exclude(private).filter(pk=OuterRef('page_id'))
+            top = PageViewTotal.objects.filter(Exists(listed))
+            tag_slug = _tag_slug(block_value)
+            if tag_slug:
+                # Driven from the tag's posts instead, each total looked up
+                # by id and only those sorted: walking the views index for a
+                # rare tag would read most of it before finding post_count
+                top = top.filter(page_id__in=_tagged_ids(tag_slug))
+            top = top.order_by(*MOST_READ_ORDERING).values('page_id')
+        else:
+            top = (
+                Page.objects.live().exact_type(BlogPage).exclude(private)
+                .filter(_block_condition(block_value))
+                .order_by(*ordering)
+                .values('pk')
+            )
+        selected |= Q(pk__in=top[:block_value.get('post_count', 3)])
+
+    posts = list(
+        BlogPage.objects.filter(selected)
+        .only(*POST_LIST_FIELDS)
+        .annotate(views=F('view_total__views'))
+        .select_related('featured_image__placeholder')
+        .prefetch_related(
+            'tags',
+            prefetch_renditions('featured_image', POST_LIST_RENDITION_SET),
+        )
+        .order_by(*ordering)
+    )
+    most_read = sorted(
+        (post for post in posts if post.views is not None),
+        key=lambda post: (-post.views, post.pk),
+    )
+
+    # Every block's top posts are among ``posts``, so filtering the list in
+    # the block's order and cutting it at post_count gives its list
+    return [
+        [
+            post for post in (most_read if _is_most_read(block_value) else posts)
+            if _matches(post, block_value)
+        ][:block_value.get('post_count', 3)]
+        for block_value in block_values
+    ]
+
+
+def get_post_list_batch(page):
+    """
+    [(block value, posts)] for every PostListBlock of ``page``.
+
+    Fetched in one query on first use and memoised on the page, so the
+    template tags and the conditional GET hook share the result.
+    """
+    batch = getattr(page, '_post_list_batch', None)
+    if batch is None:
+        values = post_list_values(page)
+        batch = list(zip(values, fetch_post_lists(values)))
+        if page is not None:
+            page._post_list_batch = batch
+    return batch
@@ -0,0 +1,367 @@
+import hashlib
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.models import Prefetch
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter
+
+_SPEC_RE = re.compile(r'^(?P<op>[a-z]+)-(?P<first>\d+)(?:x(?P<second>\d+))?$')
+
+# Maps collecting renditions found missing while rendering, innermost last
+_missing = ContextVar('missing_renditions', default=())
+
+# Named responsive rendition sets. "spec" is the nominal size used for the
+# plain <img src>; "widths" gives a w-descriptor ladder at the same aspect
+# ratio, "densities" an x-descriptor ladder for fixed-size images.
+# "placeholder": False skips the blurred loading placeholder, for images
+# with transparency.
+RENDITION_SETS = {
+    'hero': {
+        'spec': 'fill-1920x800',
+        'widths': (640, 960, 1280, 1920),
+        'sizes': '100vw',
+    },
+    'intro': {
+        'spec': 'fill-600x400',
+        'widths': (400, 600, 900, 1200),
+        'sizes': '(min-width: 1024px) 600px, 100vw',
+    },
+    'intro_wide': {
+        'spec': 'fill-1200x400',
+        'widths': (640, 960, 1200, 1800),
+        'sizes': '(min-width: 1280px) 1216px, 100vw',
+    },
+    'card': {
+        'spec': 'fill-400x250',
+        'widths': (400, 600, 800),
+        'sizes': '(min-width: 1024px) 400px, (min-width: 640px) 50vw, 100vw',
+    },
+    'avatar': {'spec': 'fill-64x64', 'densities': (1, 2)},
+    'logo': {'spec': 'height-60', 'densities': (1, 2), 'placeholder': False},
+    'blog_featured': {
+        'spec': 'fill-1200x600',
+        'widths': (640, 960, 1200, 1800),
+        'sizes': '(min-width: 896px) 832px, 100vw',
+    },
+    'blog_listing': {
+        'spec': 'fill-800x400',
+        'widths': (400, 800),
+        'sizes': '(min-width: 768px) 768px, 100vw',
+    },
+    'project_featured': {
+        'spec': 'fill-600x400',
+        'widths': (400, 600, 900, 1200),
+        'sizes': '(min-width: 1024px) 50vw, 100vw',
+    },
+    'project_listing': {
+        'spec': 'fill-400x300',
+        'widths': (400, 800),
+        'sizes': '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw',
+    },
+}
+
+# Rendition sets requested by each block template, keyed by block type and
+# by the path of the image within the block value ("cards.image" walks the
+# cards ListBlock). Keep in step with templates/blocks/.
+BLOCK_RENDITIONS = {
+    'hero': {'background_image': ('hero',)},
+    'intro_text': {'image': ('intro', 'intro_wide')},
+    'card_grid': {'cards.image': ('card',)},
+    'quote': {'author_image': ('avatar',)},
+    'logos': {'logos.logo': ('logo',)},
+}
+
+# Rendition sets requested for featured images by the detail and listing
+# templates (blog_page, project_page, index pages and post lists).
+FEATURED_IMAGE_RENDITIONS = {
+    'blog.BlogPage': ('blog_featured', 'blog_listing', 'card'),
+    'pages.ProjectPage': ('project_featured', 'project_listing'),
+}
+
+
+def get_formats():
+    """Modern formats offered as <source> elements ahead of the original format"""
+    return getattr(settings, 'RESPONSIVE_IMAGE_FORMATS', ('avif', 'webp'))
+
+
+def _scaled(spec, factor):
+    match = _SPEC_RE.match(spec)
+    op, first, second = match['op'], int(match['first']), match['second']
+    if second is None:
+        return f'{op}-{round(first * factor)}'
+    return f'{op}-{round(first * factor)}x{round(int(second) * factor)}'
+
+
+def _fits(image, spec):
+    """Whether the image is large enough to produce ``spec`` without upscaling"""
+    match = _SPEC_RE.match(spec)
+    first, second = int(match['first']), match['second']
+    if match['op'] == 'height':
+        return first <= image.height
+    if second is None:
+        return first <= image.width
+    return first <= image.width and int(second) <= image.height
+
+
+def _ladder(name):
+    """(spec, descriptor) pairs of a rendition set, smallest first"""
+    rendition_set = RENDITION_SETS[name]
+    spec = rendition_set['spec']
+    if 'widths' in rendition_set:
+        nominal = int(_SPEC_RE.match(spec)['first'])
+        return [(_scaled(spec, width / nominal), f'{width}w') for width in rendition_set['widths']]
+    return [(_scaled(spec, density), f'{density}x') for density in rendition_set['densities']]
+
+
+def rendition_set_ladder(image, name):
+    """
+    The (spec, descriptor) pairs of a set that suit ``image``.
+
+    Steps the source image is too small for are dropped, but the smallest
+    step is always kept.
+    """
+    ladder = _ladder(name)
+    return [step for step in ladder if _fits(image, step[0])] or ladder[:1]
+
+
+def with_format(spec, image_format):
+    return f'{spec}|format-{image_format}'
+
+
+def rendition_set_specs(name, image=None):
+    """
+    Every filter spec a set can request, in the original and modern formats.
+
+    Given an image, only the steps suiting that image; without one, the full
+    ladder, e.g. for filtering prefetched renditions.
+    """
+    ladder = rendition_set_ladder(image, name) if image is not None else _ladder(name)
+    specs = [spec for spec, _ in ladder]
+    return specs + [with_format(spec, fmt) for fmt in get_formats() for spec in specs]
+
+
+def prefetch_renditions(lookup, *set_names):
+    """
+    Prefetch the renditions of the given sets for the image at ``lookup``.
+
+    ``existing_renditions()`` reads them from ``prefetched_renditions``, so
+    listings render every <picture> without a query per image.
+    """
+    specs = [spec for name in set_names for spec in rendition_set_specs(name)]
+    return Prefetch(
+        f'{lookup}__renditions',
+        queryset=get_image_model().get_rendition_model().objects.filter(filter_spec__in=specs),
+        to_attr='prefetched_renditions',
+    )
+
+
+def _images_at(value, path):
+    head, _, rest = path.partition('.')
+    child = value.get(head) if hasattr(value, 'get') else None
+    if child is None:
+        return
+    if not rest:
+        yield child
+    else:
+        for item in child:
+            yield from _images_at(item, rest)
+
+
+def page_images(page):
+    """(image, rendition set names) for each image the page's templates show"""
+    featured = FEATURED_IMAGE_RENDITIONS.get(page._meta.label)
+    if featured and getattr(page, 'featured_image_id', None):
+        yield page.featured_image, featured
+
+    for block in getattr(page, 'content', None) or []:
+        for path, block_sets in BLOCK_RENDITIONS.get(block.block_type, {}).items():
+            for image in _images_at(block.value, path):
+                yield image, block_sets
+
+
+def page_rendition_sets(page):
+    """Map image id -> names of the rendition sets the page's templates request"""
+    sets = defaultdict(set)
+    for image, names in page_images(page.specific):
+        sets[image.pk].update(names)
+    return sets
+
+
+def prefetch_image_renditions(images):
+    """
+    Load the renditions of many images in one query before they are rendered.
+
+    ``images`` is a list of (image, set names). Images whose renditions are
+    all in Wagtail's rendition cache are left to read it as usual; the rest
+    get ``prefetched_renditions`` from a single query, which is written back
+    to the cache so the next render skips the database.
+    """
+    Rendition = get_image_model().get_rendition_model()
+    wanted = []
+    for image, names in images:
+        specs = {spec for name in names for spec in rendition_set_specs(name, image)}
+        keys = {
+            spec: Rendition.construct_cache_key(image, Filter(spec).get_cache_key(image), spec)
+            for spec in specs
+        }
+        wanted.append((image, keys))
+
+    cached = Rendition.cache_backend.get_many([key for _, keys in wanted for key in keys.values()])
+    cold = [(image, keys) for image, keys in wanted if not cached.keys() >= set(keys.values())]
+    if not cold:
+        return
+
+    found = defaultdict(list)
+    for rendition in Rendition.objects.filter(
+        image_id__in={image.pk for image, _ in cold},
+        filter_spec__in={spec for _, keys in cold for spec in keys},
+    ):
+        found[rendition.image_id].append(rendition)
+
+    cache_additions = {}
+    for image, keys in cold:
+        image.prefetched_renditions = found[image.pk]
+        for rendition in image.prefetched_renditions:
+            key = keys.get(rendition.filter_spec)
+            if key and rendition.focal_point_key == Filter(rendition.filter_spec).get_cache_key(image):
+                cache_additions[key] = rendition
+    if cache_additions:
+        Rendition.cache_backend.set_many(cache_additions)
+
+
+def _claim_queue_slot(image, specs):
+    """Whether these missing renditions weren't queued recently, claiming them if so"""
+    digest = hashlib.md5('|'.join(sorted(specs)).encode('utf-8')).hexdigest()[:12]
+    key = f'renditions:queued:{image.pk}:{digest}'
+    return caches['default'].add(key, True, getattr(settings, 'RENDITION_QUEUE_TIMEOUT', 300))
+
+
+@contextmanager
+def track_missing():
+    """
+    Collect the renditions the enclosed rendering found missing; yields a
+    map of image id -> filter specs.
+
+    Output kept beyond the request (cached pages and blocks, baked files)
+    must not be stored while it is non-empty, or it would keep showing the
+    fallback after the worker has made the renditions.
+    """
+    missing = defaultdict(set)
+    token = _missing.set((*_missing.get(), missing))
+    try:
+        yield missing
+    finally:
+        _missing.reset(token)
+
+
+def existing_renditions(image, specs):
+    """
+    The renditions of ``specs`` that already exist, keyed by spec.
+
+    Unlike ``image.get_renditions()`` nothing is resized here: missing
+    renditions are queued for the task worker and appear on a later render,
+    so a page served before its publish-time task ran stays cheap.
+    """
+    from .tasks import generate_image_renditions_task
+
+    Rendition = image.get_rendition_model()
+    filters = [Filter(spec) for spec in dict.fromkeys(specs)]
+    found = image.find_existing_renditions(*filters)
+    cache_additions = {
+        Rendition.construct_cache_key(image, filter.get_cache_key(image), filter.spec): rendition
+        for filter, rendition in found.items()
+        if not getattr(rendition, '_from_cache', False)
+    }
+    if cache_additions:
+        Rendition.cache_backend.set_many(cache_additions)
+
+    missing = [filter.spec for filter in filters if filter not in found]
+    if missing:
+        for tracked in _missing.get():
+            tracked[image.pk].update(missing)
+        if _claim_queue_slot(image, missing):
+            generate_image_renditions_task.enqueue(image.pk, missing)
+    return {filter.spec: found[filter] for filter in filters if filter in found}
+
+
+def missing_renditions(sets):
+    """
+    Map image id -> filter specs of the given rendition sets not yet rendered.
+
+    Existing renditions are matched on the focal point key as well, so images
+    whose focal point changed since their renditions were made are redone.
+    """
+    Image = get_image_model()
+    images = Image.objects.in_bulk(list(sets))
+    existing = set(
+        Image.get_rendition_model().objects
+        .filter(image_id__in=list(images))
+        .values_list('image_id', 'filter_spec', 'focal_point_key')
+    )
+    missing = {}
+    for image_id, names in sets.items():
+        image = images.get(image_id)
+        if image is None:
+            continue
+        wanted = {
+            spec for name in names for spec in rendition_set_specs(name, image)
+            if (image_id, spec, Filter(spec).get_cache_key(image)) not in existing
+        }
+        if wanted:
+            missing[image_id] = sorted(wanted)
+    return missing
+
+
+def generate_renditions(image_id, specs):
+    """Create the given renditions of one image, opening the source file once"""
+    image = get_image_model().objects.get(pk=image_id)
+    return len(image.get_renditions(*specs))
+
+
+def _init_worker():
+    django.setup()
+
+
+def _generate_in_worker(image_id, specs):
+    try:
+        return image_id, generate_renditions(image_id, specs), None
+    except Exception as e:
+        return image_id, 0, f'{type(e).__name__}: {e}'
+
+
+def generate_in_pool(missing, workers=None):
+    """
+    Generate renditions for {image id: specs} across a pool of processes.
+
+    Yields (image_id, rendition_count, error) as each image completes.
+    """
+    # Children must open their own database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_generate_in_worker, image_id, specs)
+            for image_id, specs in missing.items()
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def iter_pages_with_images():
+    """Live pages of every model that has renditions to pre-generate"""
+    from wagtail.models import Page
+
+    for model in apps.get_models():
+        if not issubclass(model, Page) or model is Page:
+            continue
+        has_content = any(field.name == 'content' for field in model._meta.get_fields())
+        if has_content or model._meta.label in FEATURED_IMAGE_RENDITIONS:
+            yield from model.objects.live().iterator()
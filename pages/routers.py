@@ -0,0 +1,93 @@
+"""
+Send anonymous page reads to a read replica.
+
+``ReplicaMiddleware`` marks a request as replica-safe when it is an
+anonymous GET/HEAD and the replica has every published change; only then
+does ``ReplicaRouter`` route reads to ``DATABASE_REPLICA_ALIAS``. Writes,
+logged-in users (editors, the admin) and everything outside a request stay
+on the primary.
+
+A publish pins reads to the primary until the replica has caught up, so
+neither the editor checking their page nor the page cache refilling right
+after the purge reads stale rows. ``sync_replica`` records when each copy
+started, and the pin lasts until a copy started after the publish
+committed. Replicas that don't report their position (e.g. a Postgres
+standby) are pinned for a fixed ``REPLICA_PIN_SECONDS`` instead.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+WRITTEN_KEY = 'replica:written_at'
+SYNCED_KEY = 'replica:synced_at'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_alias():
+    """The replica's database alias, or None when none is configured"""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def _get_cache():
+    return caches[getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', 'default')]
+
+
+def _note_write():
+    _get_cache().set(WRITTEN_KEY, time.time(), None)
+
+
+def pin_primary():
+    """Keep every read on the primary until the replica has the current transaction"""
+    _note_write()
+    # Again once committed, so a copy started before the commit doesn't count
+    transaction.on_commit(_note_write)
+
+
+def record_sync(started):
+    """Note that the replica holds everything committed before ``started`` (a Unix time)"""
+    _get_cache().set(SYNCED_KEY, started, None)
+
+
+def is_pinned():
+    found = _get_cache().get_many([WRITTEN_KEY, SYNCED_KEY])
+    written_at = found.get(WRITTEN_KEY)
+    if written_at is None:
+        return False
+    synced_at = found.get(SYNCED_KEY)
+    if synced_at is not None:
+        return synced_at <= written_at
+    return time.time() < written_at + getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+
+@contextmanager
+def use_replica():
+    """Let reads in the enclosed code go to the replica"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema from the primary
+        return db != replica_alias()
@@ -0,0 +1,165 @@
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, connections, router
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from wagtail.models import Page, PageViewRestriction
+from wagtail.search import index
+
+# Pages indexed in the dedicated FTS5 table
+SEARCH_MODELS = ('blog.BlogPage', 'pages.ProjectPage')
+
+FTS_TABLE = 'pages_searchentry'
+
+# Control characters FTS5 wraps around matches; swapped for <mark> after
+# the indexed text has been HTML-escaped.
+_MATCH_START = '\x02'
+_MATCH_END = '\x03'
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_enabled():
+    """Whether the FTS5 engine is selected and usable on this database"""
+    return (
+        getattr(settings, 'PAGES_SEARCH_ENGINE', 'wagtail') == 'fts5'
+        and connection.vendor == 'sqlite'
+    )
+
+
+def get_search_models():
+    return [apps.get_model(label) for label in SEARCH_MODELS]
+
+
+def is_search_model(page):
+    return issubclass(page.specific_class, tuple(get_search_models()))
+
+
+def _join(value):
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(item) for item in value if item)
+    return str(value or '')
+
+
+def extract_document(page):
+    """Split a page's declared ``search_fields`` into (title, body) text"""
+    title, body = '', []
+    for field in page.get_search_fields():
+        if not isinstance(field, index.SearchField):
+            continue
+        text = _join(field.get_value(page))
+        if field.field_name == 'title':
+            title = text
+        else:
+            body.append(text)
+    return title, ' '.join(filter(None, body))
+
+
+def title_weight(model):
+    """BM25 weight of the title column, taken from the title field's boost"""
+    for field in model.get_search_fields():
+        if isinstance(field, index.SearchField) and field.field_name == 'title':
+            return float(field.boost or 1)
+    return 1.0
+
+
+def index_page(page):
+    """Add or replace a live page's entry in the FTS5 table"""
+    page = page.specific
+    if not page.live:
+        remove_page(page.pk)
+        return
+    title, body = extract_document(page)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [page.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, body, members_only) VALUES (%s, %s, %s, %s)',
+            [page.pk, title, body, int(getattr(page, 'is_members_only', False))],
+        )
+
+
+def remove_page(page_id):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [page_id])
+
+
+def rebuild_index(batch_size=500):
+    """Re-index every live page of the search models; returns the page count"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    count = 0
+    for model in get_search_models():
+        for page in model.objects.live().iterator(chunk_size=batch_size):
+            index_page(page)
+            count += 1
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return count
+
+
+def build_match_expression(query):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every term is quoted, so user input can't inject FTS5 syntax, and matched
+    as a prefix, so partially typed words still find results.
+    """
+    terms = _TERM_RE.findall(query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _highlighted(text):
+    text = escape(text).replace(_MATCH_START, '<mark>').replace(_MATCH_END, '</mark>')
+    return mark_safe(text)
+
+
+def search(query, include_members_only=False, limit=20, offset=0):
+    """
+    Search the FTS5 table ranked by BM25.
+
+    Returns a list of (page, title_html, snippet_html) tuples; the HTML
+    strings are escaped apart from the <mark> tags around matched terms.
+    Entries of pages that are no longer live, or are now under a view
+    restriction, are dropped in the query, before LIMIT, so a full page of
+    rows means there may be more.
+    """
+    expression = build_match_expression(query)
+    if not expression:
+        return []
+
+    weight = max(title_weight(model) for model in get_search_models())
+    members_clause = '' if include_members_only else 'AND members_only = 0'
+    pages_table = Page._meta.db_table
+    restrictions_table = PageViewRestriction._meta.db_table
+    with connections[router.db_for_read(Page)].cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT {FTS_TABLE}.rowid,
+                   highlight({FTS_TABLE}, 0, %s, %s),
+                   snippet({FTS_TABLE}, 1, %s, %s, '…', 24)
+            FROM {FTS_TABLE}
+            JOIN {pages_table} page ON page.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s {members_clause}
+              AND page.live
+              AND NOT EXISTS (
+                  SELECT 1 FROM {restrictions_table} restriction
+                  JOIN {pages_table} restricted ON restricted.id = restriction.page_id
+                  WHERE substr(page.path, 1, length(restricted.path)) = restricted.path
+              )
+            ORDER BY bm25({FTS_TABLE}, %s, 1.0)
+            LIMIT %s OFFSET %s
+            """,
+            [_MATCH_START, _MATCH_END, _MATCH_START, _MATCH_END,
+             expression, weight, limit, offset],
+        )
+        rows = cursor.fetchall()
+
+    # Only drops a page unpublished between the two queries
+    pages = Page.objects.live().public().specific().in_bulk([row[0] for row in rows])
+    return [
+        (pages[page_id], _highlighted(title), _highlighted(snippet))
+        for page_id, title, snippet in rows
+        if page_id in pages
+    ]
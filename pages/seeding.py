@@ -0,0 +1,234 @@
+"""
+Synthetic content for load tests: realistic StreamField bodies, tags and
+images, inserted into the page tree in batches rather than one
+``add_child()`` (and its half a dozen queries) per page.
+"""
+import io
+import uuid
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.images import ImageFile
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import slugify
+from PIL import Image as PILImage
+from wagtail.images import get_image_model
+from wagtail.models import Page
+
+from .text import count_words, reading_time_minutes
+
+WORDS = """
+    cache query index latency throughput request response template render block page
+    tree path revision publish editor image rendition search ranking token vector
+    python django wagtail sqlite postgres server worker process thread queue task
+    memory disk network deploy release build test benchmark profile trace metric
+    design pattern model view field form signal hook middleware router settings
+    static media asset bundle stream batch shard replica cluster node graph
+""".split()
+
+TAGS = (
+    'python', 'django', 'wagtail', 'sqlite', 'performance', 'caching', 'search',
+    'deployment', 'testing', 'design', 'data', 'tooling', 'web', 'databases',
+    'async', 'images', 'security', 'devops', 'open-source', 'tutorial',
+)
+
+TECH = ('Django', 'Wagtail', 'Python', 'SQLite', 'PostgreSQL', 'Redis', 'Celery',
+        'Tailwind', 'HTMX', 'NumPy', 'Docker', 'nginx')
+
+
+class ContentGenerator:
+    """Deterministic text and StreamField data from a seeded random generator"""
+
+    def __init__(self, rng, image_ids):
+        self.rng = rng
+        self.image_ids = image_ids
+
+    def words(self, count):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(count))
+
+    def sentence(self):
+        return self.words(self.rng.randint(8, 18)).capitalize() + '.'
+
+    def paragraph(self):
+        return ' '.join(self.sentence() for _ in range(self.rng.randint(3, 6)))
+
+    def title(self):
+        return self.words(self.rng.randint(3, 7)).title()
+
+    def image_id(self):
+        return self.rng.choice(self.image_ids) if self.image_ids else None
+
+    def _block(self, block_type, value):
+        return {'type': block_type, 'value': value, 'id': str(uuid.UUID(int=self.rng.getrandbits(128)))}
+
+    def stream(self):
+        """Raw StreamField data and its plain text"""
+        blocks, text = [], []
+        for _ in range(self.rng.randint(2, 5)):
+            paragraphs = [self.paragraph() for _ in range(self.rng.randint(2, 4))]
+            heading = self.title()
+            blocks.append(self._block('intro_text', {
+                'heading': heading,
+                'text': ''.join(f'<p>{paragraph}</p>' for paragraph in paragraphs),
+                'image': self.image_id() if self.rng.random() < 0.3 else None,
+                'image_position': self.rng.choice(['left', 'right', 'top', 'bottom']),
+            }))
+            text += [heading, *paragraphs]
+
+            if self.rng.random() < 0.2:
+                quote = self.sentence()
+                blocks.append(self._block('quote', {
+                    'quote': quote, 'author': self.title(), 'author_title': '', 'author_image': None,
+                    'quote_style': 'pullquote',
+                }))
+                text.append(quote)
+        return blocks, '\n\n'.join(text)
+
+
+def create_images(count, rng):
+    """Create ``count`` gradient JPEGs as Wagtail images"""
+    Image = get_image_model()
+    images = []
+    for i in range(count):
+        start = tuple(rng.randrange(256) for _ in range(3))
+        end = tuple(rng.randrange(256) for _ in range(3))
+        gradient = PILImage.linear_gradient('L').resize((1600, 900))
+        picture = PILImage.composite(PILImage.new('RGB', (1600, 900), end), PILImage.new('RGB', (1600, 900), start), gradient)
+        buffer = io.BytesIO()
+        picture.save(buffer, 'JPEG', quality=80)
+        image = Image(title=f'Seed image {i}', file=ImageFile(buffer, name=f'seed-{i}.jpg'))
+        image.save()
+        images.append(image)
+    return images
+
+
+def bulk_add_children(parent, pages, batch_size=500):
+    """
+    Append unsaved ``pages`` (all of one Page subclass) as children of ``parent``.
+
+    Tree paths are computed in Python from the parent's last child, the
+    wagtailcore_page rows go in with bulk_create and the subclass rows with
+    batched INSERTs, skipping per-page signals, revisions and search
+    indexing. The pages are live without a revision, like imported content.
+    """
+    if not pages:
+        return []
+    model = type(pages[0])
+    content_type = ContentType.objects.get_for_model(model)
+    depth = parent.depth + 1
+    last_child = parent.get_last_child()
+    step = Page._str2int(last_child.path[-Page.steplen:]) if last_child else 0
+
+    for page in pages:
+        step += 1
+        page.path = Page._get_path(parent.path, depth, step)
+        page.depth = depth
+        page.numchild = 0
+        page.url_path = f'{parent.url_path}{page.slug}/'
+        page.content_type = content_type
+        page.locale_id = parent.locale_id
+        page.draft_title = page.title
+        page.live = True
+        page.has_unpublished_changes = False
+
+    page_fields = [field.attname for field in Page._meta.concrete_fields if not field.primary_key]
+    local_fields = model._meta.local_concrete_fields
+    with transaction.atomic():
+        for start in range(0, len(pages), batch_size):
+            batch = pages[start:start + batch_size]
+            rows = Page.objects.bulk_create([
+                Page(**{name: getattr(page, name) for name in page_fields}) for page in batch
+            ])
+            for page, row in zip(batch, rows):
+                page.pk = page.id = page.page_ptr_id = row.pk
+            # bulk_create() doesn't support multi-table inheritance
+            model._base_manager._insert(batch, fields=local_fields)
+        Page.objects.filter(pk=parent.pk).update(numchild=F('numchild') + len(pages))
+    parent.numchild += len(pages)
+    return pages
+
+
+def published_dates(count, rng, days=5 * 365):
+    """``count`` ascending publish dates spread over the last ``days`` days"""
+    now = timezone.now()
+    offsets = sorted(rng.uniform(0, days) for _ in range(count))
+    return [now - timedelta(days=days - offset) for offset in offsets]
+
+
+def build_blog_pages(count, generator, offset=0):
+    """Unsaved BlogPages with their tag names"""
+    from blog.models import BlogPage
+
+    rng = generator.rng
+    pages, tags = [], []
+    for i, published in enumerate(published_dates(count, rng)):
+        title = generator.title()
+        content, text = generator.stream()
+        intro = generator.sentence()
+        words = count_words(text)
+        pages.append(BlogPage(
+            title=title,
+            slug=f'{slugify(title)}-{offset + i}',
+            intro=intro,
+            featured_image_id=generator.image_id(),
+            content=content,
+            body_text=text,
+            word_count=words,
+            reading_time=reading_time_minutes(words),
+            is_members_only=rng.random() < 0.05,
+            first_published_at=published,
+            last_published_at=published,
+        ))
+        tags.append(rng.sample(TAGS, rng.randint(1, 4)))
+    return pages, tags
+
+
+def build_project_pages(count, generator, offset=0):
+    from .models import ProjectPage
+
+    rng = generator.rng
+    pages = []
+    for i, published in enumerate(published_dates(count, rng)):
+        title = generator.title()
+        content, text = generator.stream()
+        words = count_words(text)
+        pages.append(ProjectPage(
+            title=title,
+            slug=f'{slugify(title)}-{offset + i}',
+            summary=generator.sentence(),
+            featured_image_id=generator.image_id(),
+            tech_stack=[
+                {'type': 'tech_item', 'value': tech, 'id': str(uuid.UUID(int=rng.getrandbits(128)))}
+                for tech in rng.sample(TECH, rng.randint(2, 5))
+            ],
+            status=rng.choice(['planning', 'in_progress', 'completed', 'on_hold']),
+            content=content,
+            body_text=text,
+            word_count=words,
+            reading_time=reading_time_minutes(words),
+            first_published_at=published,
+            last_published_at=published,
+        ))
+    return pages
+
+
+def tag_blog_pages(pages, tag_names):
+    """Attach tags to freshly inserted blog pages in two bulk queries"""
+    from taggit.models import Tag
+
+    from blog.models import BlogPageTag
+
+    wanted = {name for names in tag_names for name in names}
+    existing = {tag.name: tag for tag in Tag.objects.filter(name__in=wanted)}
+    Tag.objects.bulk_create(
+        [Tag(name=name, slug=slugify(name)) for name in sorted(wanted - set(existing))],
+        ignore_conflicts=True,
+    )
+    tags = {tag.name: tag.pk for tag in Tag.objects.filter(name__in=wanted)}
+    BlogPageTag.objects.bulk_create([
+        BlogPageTag(content_object_id=page.pk, tag_id=tags[name])
+        for page, names in zip(pages, tag_names)
+        for name in names
+    ], batch_size=1000)
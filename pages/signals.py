@@ -0,0 +1,215 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.images import get_image_model
+from wagtail.models import Page, PageViewRestriction, Site, get_page_models
+from wagtail.signals import page_published, page_slug_changed, page_unpublished, post_page_move
+
+from . import instrumentation, page_cache, page_views, routers, search, sitemaps
+from .block_cache import block_render_cache
+from .menus import invalidate_menus
+from .models import SiteSettings
+from .site_settings import invalidate_site_settings
+from .tasks import (
+    bake_affected_pages_task,
+    bake_all_pages_task,
+    generate_image_placeholder_task,
+    generate_page_renditions_task,
+    update_search_index_task,
+)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if instrumentation.is_enabled():
+        instrumentation.install(connection)
+
+
+@receiver(request_started, dispatch_uid='pages.warm_content_types')
+def warm_content_types(sender, **kwargs):
+    """Load every page content type in one query on the first request,
+    instead of one query per page type as routing resolves ``.specific``"""
+    request_started.disconnect(dispatch_uid='pages.warm_content_types')
+    aliases = {DEFAULT_DB_ALIAS, routers.replica_alias()} - {None}
+    for alias in aliases:
+        ContentType.objects.db_manager(alias).get_for_models(*get_page_models(), for_concrete_models=False)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+@receiver(page_slug_changed)
+@receiver(post_delete, sender=Page)
+def clear_block_render_cache(sender, **kwargs):
+    """Block HTML can embed page links, so drop it whenever the tree changes"""
+    block_render_cache.invalidate()
+
+
+@receiver(post_save, sender=get_image_model())
+def clear_block_render_cache_on_image_save(sender, **kwargs):
+    """Rendered blocks embed rendition URLs that change with the image file"""
+    block_render_cache.invalidate()
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+def invalidate_cached_site_settings(sender, **kwargs):
+    # After commit, so no reader re-caches the old row in between
+    transaction.on_commit(invalidate_site_settings)
+    transaction.on_commit(rebake_all_pages)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+@receiver(post_delete, sender=Page)
+def invalidate_cached_menus(sender, **kwargs):
+    # Once per transaction, however many pages it deletes
+    connection = transaction.get_connection()
+    if not any(func is refresh_menus for _, func, _ in connection.run_on_commit):
+        transaction.on_commit(refresh_menus)
+
+
+def refresh_menus():
+    # Every page embeds the menu, so a change to it purges them all
+    if invalidate_menus():
+        page_cache.purge_layout()
+        rebake_all_pages()
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def purge_sitemap(sender, instance, **kwargs):
+    sitemaps.purge_page(instance)
+
+
+@receiver(post_page_move)
+@receiver(page_slug_changed)
+def purge_sitemap_on_url_change(sender, instance, **kwargs):
+    # Descendants' URLs change with the page's, wherever their shards are
+    sitemaps.purge_page(instance, include_descendants=True)
+
+
+@receiver(post_delete, sender=Page)
+def purge_sitemap_on_delete(sender, instance, **kwargs):
+    sitemaps.purge_pages([instance.pk])
+
+
+@receiver(post_save, sender=PageViewRestriction)
+@receiver(post_delete, sender=PageViewRestriction)
+def purge_sitemap_on_restriction_change(sender, instance, **kwargs):
+    sitemaps.purge_page(instance.page, include_descendants=True)
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def purge_sitemap_on_site_change(sender, **kwargs):
+    sitemaps.purge_all()
+
+
+@receiver(post_save, sender=get_image_model())
+def generate_image_placeholder(sender, instance, **kwargs):
+    generate_image_placeholder_task.enqueue(instance.pk)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+def pin_reads_to_primary(sender, **kwargs):
+    """Read from the primary until the replica has the change"""
+    if routers.replica_alias() is not None:
+        routers.pin_primary()
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def purge_page_cache(sender, instance, **kwargs):
+    page_cache.purge_page(instance)
+
+
+@receiver(post_delete, sender=Page)
+def purge_page_cache_on_delete(sender, instance, **kwargs):
+    # Index pages list their descendants, and send validators built on that
+    page_cache.purge_page(instance)
+
+
+@receiver(post_page_move)
+def purge_page_cache_on_move(sender, instance, parent_page_before, **kwargs):
+    """A move changes the URL of the page and everything below it"""
+    page_cache.purge_page(instance, include_descendants=True)
+    page_cache.purge_page(parent_page_before)
+
+
+@receiver(page_slug_changed)
+def purge_page_cache_on_slug_change(sender, instance, **kwargs):
+    """A new slug changes the URL of the page and everything below it"""
+    page_cache.purge_page(instance, include_descendants=True)
+
+
+@receiver(request_finished)
+def flush_page_views(sender, **kwargs):
+    # After the response has gone out, and only once enough views are buffered
+    page_views.flush_if_due()
+
+
+@receiver(page_published)
+def update_search_index(sender, instance, **kwargs):
+    # Extracting a long StreamField's text is left out of the publish request;
+    # removals below stay inline, so unpublished text disappears at once
+    if search.is_enabled() and search.is_search_model(instance):
+        update_search_index_task.enqueue(instance.pk)
+
+
+@receiver(page_unpublished)
+def remove_from_search_index(sender, instance, **kwargs):
+    if search.is_enabled() and search.is_search_model(instance):
+        search.remove_page(instance.pk)
+
+
+def remove_deleted_page_from_search_index(sender, instance, **kwargs):
+    if search.is_enabled():
+        search.remove_page(instance.pk)
+
+
+# Connected per search model, not to every delete in the project
+for label in search.SEARCH_MODELS:
+    post_delete.connect(remove_deleted_page_from_search_index, sender=label)
+
+
+@receiver(page_published)
+def pregenerate_renditions(sender, instance, **kwargs):
+    """Resize images at publish time instead of on the first reader's request"""
+    generate_page_renditions_task.enqueue(instance.pk)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def rebake_pages(sender, instance, **kwargs):
+    if getattr(settings, 'BAKE_ON_PUBLISH', False):
+        bake_affected_pages_task.enqueue(instance.pk)
+
+
+@receiver(post_page_move)
+def rebake_moved_pages(sender, instance, parent_page_before, **kwargs):
+    if getattr(settings, 'BAKE_ON_PUBLISH', False):
+        bake_affected_pages_task.enqueue(instance.pk, include_descendants=True)
+        bake_affected_pages_task.enqueue(parent_page_before.pk)
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def rebake_on_site_change(sender, **kwargs):
+    # Baked files live under the site's hostname
+    transaction.on_commit(rebake_all_pages)
+
+
+def rebake_all_pages():
+    # The baked counterpart of purge_layout
+    if getattr(settings, 'BAKE_ON_PUBLISH', False):
+        bake_all_pages_task.enqueue()
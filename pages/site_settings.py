@@ -0,0 +1,97 @@
+"""
+Site-wide settings, read from the database once and then served from
+memory.
+
+The SiteSettings snippet is kept in the shared cache and memoised in each
+process for SITE_SETTINGS_PROCESS_TTL seconds. Saving it drops both in the
+saving process; other processes pick the change up when their memo
+expires.
+
+Whatever renders the settings and is cached beyond a request (cached
+pages, page ETags, feeds) keys on their version, a digest of their values,
+so a process still holding the old settings neither serves nor stores
+anything under the new version.
+"""
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_KEY = 'sitesettings'
+
+# (expiry on the monotonic clock, SiteSettings, version)
+_memo = None
+
+
+def _get_cache():
+    return caches[getattr(settings, 'SITE_SETTINGS_CACHE_ALIAS', 'default')]
+
+
+def load_site_settings():
+    """The SiteSettings snippet straight from the database, bypassing both caches"""
+    from .models import SiteSettings
+
+    # Until setup_site has created the row, the field defaults apply
+    return SiteSettings.objects.order_by('pk').first() or SiteSettings()
+
+
+def settings_version(site_settings):
+    values = [getattr(site_settings, field.attname) for field in site_settings._meta.concrete_fields]
+    return hashlib.md5(repr(values).encode('utf-8')).hexdigest()[:12]
+
+
+def _memoised():
+    memo = _memo
+    if memo is not None and memo[0] > time.monotonic():
+        return memo
+    return None
+
+
+def _memoise(site_settings):
+    global _memo
+    ttl = getattr(settings, 'SITE_SETTINGS_PROCESS_TTL', 30)
+    _memo = memo = (time.monotonic() + ttl, site_settings, settings_version(site_settings))
+    return memo
+
+
+def _get_memo():
+    memo = _memoised()
+    if memo is not None:
+        return memo
+    cache = _get_cache()
+    site_settings = cache.get(CACHE_KEY)
+    if site_settings is None:
+        site_settings = load_site_settings()
+        cache.set(CACHE_KEY, site_settings, None)
+    return _memoise(site_settings)
+
+
+def get_site_settings():
+    """The SiteSettings snippet; treat it as read-only"""
+    return _get_memo()[1]
+
+
+def get_site_settings_version():
+    """The version of the settings get_site_settings() returns in this process"""
+    return _get_memo()[2]
+
+
+async def aget_site_settings():
+    """get_site_settings() for async views, which render templates in the event loop"""
+    memo = _memoised()
+    if memo is not None:
+        return memo[1]
+    cache = _get_cache()
+    site_settings = await cache.aget(CACHE_KEY)
+    if site_settings is None:
+        site_settings = await sync_to_async(load_site_settings)()
+        await cache.aset(CACHE_KEY, site_settings, None)
+    return _memoise(site_settings)[1]
+
+
+def invalidate_site_settings():
+    global _memo
+    _memo = None
+    _get_cache().delete(CACHE_KEY)
@@ -0,0 +1,171 @@
+"""
+A sitemap index over the live, public page tree, sharded by page id.
+
+Page ``pk`` belongs to shard ``pk // SITEMAP_SHARD_SIZE``, so a page never
+changes shard and a change to it invalidates that one shard (plus the
+index, whose lastmods move with it); a move or slug change, which rewrites
+the URLs below the page, also invalidates its descendants' shards. Each purge also records when the shard
+and the index changed, so that removing a page advances their lastmod even
+though no remaining page was published later. Shards are read with ``values_list``
+straight from wagtailcore_page, never ``specific()``, and stream out as
+they are built on a cache miss.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F, Max
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+from wagtail.models import Page, Site, get_page_models
+
+KEY_PREFIX = 'sitemap'
+INDEX_KEY = f'{KEY_PREFIX}:index'
+INDEX_CHANGED_KEY = f'{KEY_PREFIX}:changed:index'
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def get_cache():
+    return caches[getattr(settings, 'SITEMAP_CACHE_ALIAS', 'default')]
+
+
+def shard_size():
+    # The sitemap protocol allows at most 50,000 URLs per file
+    return min(getattr(settings, 'SITEMAP_SHARD_SIZE', 10000), 50000)
+
+
+def shard_key(shard):
+    return f'{KEY_PREFIX}:shard:{shard}'
+
+
+def changed_key(shard):
+    return f'{KEY_PREFIX}:changed:{shard}'
+
+
+def listed_pages():
+    """Live pages every visitor can see, without members-only pages"""
+    pages = Page.objects.live().public().filter(depth__gt=1)
+    for model in get_page_models():
+        if 'is_members_only' in {field.name for field in model._meta.local_fields}:
+            pages = pages.exclude(pk__in=model.objects.filter(is_members_only=True).values('pk'))
+    return pages
+
+
+def w3c_datetime(when):
+    return when.replace(microsecond=0).isoformat() if when else None
+
+
+def _latest(*whens):
+    whens = [when for when in whens if when is not None]
+    return max(whens) if whens else None
+
+
+def get_index():
+    """Map shard number -> when it last changed: its latest publish or purge"""
+    cache = get_cache()
+    index = cache.get(INDEX_KEY)
+    if index is None:
+        shards = (
+            listed_pages()
+            .annotate(shard=F('pk') / shard_size())
+            .values('shard')
+            .annotate(lastmod=Max('last_published_at'))
+            .order_by('shard')
+        )
+        shards = {row['shard']: row['lastmod'] for row in shards}
+        changed = cache.get_many([changed_key(shard) for shard in shards])
+        index = {
+            shard: _latest(lastmod, changed.get(changed_key(shard)))
+            for shard, lastmod in shards.items()
+        }
+        cache.set(INDEX_KEY, index, None)
+    return index
+
+
+def index_lastmod(index):
+    """When the index last changed, including purges that emptied a shard"""
+    return _latest(*index.values(), get_cache().get(INDEX_CHANGED_KEY))
+
+
+def render_index(index, build_absolute_uri):
+    entries = []
+    for shard, lastmod in index.items():
+        loc = escape(build_absolute_uri(reverse('sitemap-shard', args=[shard])))
+        lastmod = f'<lastmod>{w3c_datetime(lastmod)}</lastmod>' if lastmod else ''
+        entries.append(f'<sitemap><loc>{loc}</loc>{lastmod}</sitemap>\n')
+    return f'{XML_DECLARATION}<sitemapindex xmlns="{XMLNS}">\n{"".join(entries)}</sitemapindex>\n'
+
+
+def _site_prefixes():
+    """(root path, URL prefix) of every site, the default site first"""
+    serve_prefix = reverse('wagtail_serve', args=('',))
+    return [
+        (root.root_path, root.root_url + serve_prefix)
+        for root in Site.get_site_root_paths()
+    ]
+
+
+def iter_shard(shard):
+    """Chunks of a shard's <urlset>"""
+    size = shard_size()
+    prefixes = _site_prefixes()
+    pages = (
+        listed_pages()
+        .filter(pk__gte=shard * size, pk__lt=(shard + 1) * size)
+        .order_by('pk')
+        .values_list('url_path', 'last_published_at')
+    )
+    yield f'{XML_DECLARATION}<urlset xmlns="{XMLNS}">\n'
+    chunk = []
+    for url_path, last_published_at in pages.iterator(chunk_size=2000):
+        for root_path, prefix in prefixes:
+            if url_path.startswith(root_path):
+                break
+        else:
+            # Not under any site, so it has no URL
+            continue
+        loc = escape(prefix + url_path[len(root_path):])
+        lastmod = f'<lastmod>{w3c_datetime(last_published_at)}</lastmod>' if last_published_at else ''
+        chunk.append(f'<url><loc>{loc}</loc>{lastmod}</url>\n')
+        if len(chunk) >= 500:
+            yield ''.join(chunk)
+            chunk = []
+    chunk.append('</urlset>\n')
+    yield ''.join(chunk)
+
+
+def get_shard(shard):
+    return get_cache().get(shard_key(shard))
+
+
+def stream_shard(shard):
+    """Yield the shard as it is rendered and store it once complete"""
+    parts = []
+    for part in iter_shard(shard):
+        parts.append(part)
+        yield part
+    get_cache().set(shard_key(shard), ''.join(parts).encode('utf-8'), None)
+
+
+def purge_pages(page_ids):
+    """Drop the shards holding these pages, and the index, and note when they changed"""
+    size = shard_size()
+    shards = {pk // size for pk in page_ids}
+    cache = get_cache()
+    now = timezone.now()
+    # Plain sets of one key each, so concurrent purges can't lose each other's
+    cache.set_many({INDEX_CHANGED_KEY: now, **{changed_key(shard): now for shard in shards}}, None)
+    cache.delete_many([INDEX_KEY, *(shard_key(shard) for shard in shards)])
+
+
+def purge_page(page, include_descendants=False):
+    page_ids = [page.pk]
+    if include_descendants:
+        page_ids += page.get_descendants().values_list('pk', flat=True)
+    purge_pages(page_ids)
+
+
+def purge_all():
+    last = Page.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+    purge_pages(range(0, last + 1, shard_size()))
@@ -0,0 +1,54 @@
+"""
+Upkeep for SQLite in WAL mode.
+
+SQLite's automatic checkpoints can't reset the WAL while readers hold old
+snapshots, so on a busy, read-mostly site it keeps growing; and the
+statistics ``PRAGMA optimize`` refreshes for the query planner are only
+updated when someone runs it.
+"""
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+REPORTED_PRAGMAS = ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout')
+
+
+def is_sqlite(connection):
+    return connection.vendor == 'sqlite'
+
+
+def pragmas(connection, names=REPORTED_PRAGMAS):
+    """Current values of the given pragmas on a connection"""
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
+
+
+def checkpoint(connection, mode='PASSIVE'):
+    """
+    Copy the WAL back into the database file.
+
+    Returns (busy, wal_frames, checkpointed_frames). PASSIVE never waits
+    for readers; TRUNCATE also shrinks the WAL file to zero bytes, but has
+    to wait for readers to finish.
+    """
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f'Unknown checkpoint mode {mode!r}')
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA wal_checkpoint({mode})')
+        return tuple(cursor.fetchone())
+
+
+def optimize(connection):
+    """Let SQLite re-analyze the tables whose statistics have gone stale"""
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA optimize')
+
+
+def copy_database(source, target):
+    """Copy one SQLite database over another with the online backup API"""
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection)
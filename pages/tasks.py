@@ -0,0 +1,72 @@
+from django_tasks import task
+from wagtail.images import get_image_model
+from wagtail.models import Page
+
+
+@task()
+def generate_page_renditions_task(page_id):
+    """Pre-generate the renditions a freshly published page will request"""
+    from .renditions import generate_renditions, missing_renditions, page_rendition_sets
+
+    page = Page.objects.get(pk=page_id)
+    for image_id, specs in missing_renditions(page_rendition_sets(page)).items():
+        generate_renditions(image_id, specs)
+
+
+@task()
+def generate_image_renditions_task(image_id, specs):
+    """Generate renditions a render found missing and left out of its <picture>"""
+    from .renditions import generate_renditions
+
+    generate_renditions(image_id, specs)
+
+
+@task()
+def update_search_index_task(page_id):
+    """Index a published page in the FTS5 table, or drop it if it has since gone"""
+    from . import search
+
+    page = Page.objects.filter(pk=page_id).first()
+    if page is None:
+        search.remove_page(page_id)
+    else:
+        search.index_page(page)
+
+
+@task()
+def generate_image_placeholder_task(image_id):
+    """Compute the loading placeholder of a new or replaced image"""
+    from .placeholders import update_placeholders
+
+    update_placeholders(get_image_model().objects.filter(pk=image_id))
+
+
+@task()
+def bake_affected_pages_task(page_id, include_descendants=False):
+    """Re-bake the static HTML a publish, unpublish or move of a page changed"""
+    from . import bake
+
+    root = bake.get_bake_root()
+    manifest = bake.load_manifest(root)
+    affected = bake.affected_page_ids(Page.objects.get(pk=page_id), include_descendants)
+    pages = bake.bakeable_pages(affected)
+    for stale_id in (affected | {page_id}) - {page.pk for page in pages}:
+        bake.update_manifest(root, manifest, stale_id, [])
+    for baked_id, files, _ in bake.bake_pages(pages, workers=0):
+        bake.update_manifest(root, manifest, baked_id, files)
+    bake.save_manifest(root, manifest)
+
+
+@task()
+def bake_all_pages_task():
+    """Re-bake every page, after a change to what all of them render (menu, settings, site)"""
+    from . import bake
+
+    root = bake.get_bake_root()
+    manifest = bake.load_manifest(root)
+    pages = bake.bakeable_pages()
+    for stale_id in set(manifest) - {page.pk for page in pages}:
+        bake.update_manifest(root, manifest, stale_id, [])
+    for baked_id, files, _ in bake.bake_pages(pages, workers=0):
+        bake.update_manifest(root, manifest, baked_id, files)
+    bake.save_manifest(root, manifest)
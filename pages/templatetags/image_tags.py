@@ -0,0 +1,88 @@
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from pages.placeholders import get_placeholder
+from pages.renditions import RENDITION_SETS, existing_renditions, get_formats, rendition_set_ladder, with_format
+
+register = template.Library()
+
+MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+}
+
+
+def _srcset(ladder, renditions, image_format=None):
+    entries = []
+    for spec, descriptor in ladder:
+        rendition = renditions.get(with_format(spec, image_format) if image_format else spec)
+        if rendition is None:
+            continue
+        if descriptor.endswith('w'):
+            # Small sources produce narrower renditions than requested
+            descriptor = f'{rendition.width}w'
+        entries.append(f'{rendition.url} {descriptor}')
+    return ', '.join(dict.fromkeys(entries))
+
+
+@register.simple_tag
+def responsive_image(image, set_name, **attrs):
+    """
+    Render ``image`` as a <picture> of a named rendition set.
+
+    Usage: {% responsive_image value.image "card" class="w-full" %}
+
+    AVIF and WebP sources come first, the original format is the <img>
+    fallback. Extra keyword arguments become <img> attributes; ``alt``
+    defaults to the image title, ``loading`` to lazy and ``sizes`` to the
+    set's own. The image's stored placeholder is inlined as the <img>
+    background, so the layout paints before the image bytes arrive.
+
+    Only renditions that already exist are offered; missing ones are queued
+    for the task worker, and until any exist the <img> shows the original.
+    """
+    if not image:
+        return ''
+
+    ladder = rendition_set_ladder(image, set_name)
+    specs = [spec for spec, _ in ladder]
+    formats = get_formats()
+    renditions = existing_renditions(
+        image, [*specs, *(with_format(spec, fmt) for fmt in formats for spec in specs)]
+    )
+
+    nominal = RENDITION_SETS[set_name]['spec']
+    fallback = renditions.get(nominal) or next(
+        (renditions[spec] for spec in reversed(specs) if spec in renditions), image,
+    )
+    src = fallback.file.url if fallback is image else fallback.url
+    sizes = attrs.pop('sizes', RENDITION_SETS[set_name].get('sizes'))
+    img_attrs = {
+        'src': src,
+        'srcset': _srcset(ladder, renditions) or None,
+        'sizes': sizes,
+        'width': fallback.width,
+        'height': fallback.height,
+        'alt': image.title,
+        'loading': 'lazy',
+        'decoding': 'async',
+        **attrs,
+    }
+
+    placeholder = RENDITION_SETS[set_name].get('placeholder', True) and get_placeholder(image)
+    if placeholder:
+        img_attrs['style'] = (
+            f'background: {placeholder.color} url("{placeholder.data_uri}") center / cover no-repeat;'
+            f'{attrs.get("style", "")}'
+        )
+
+    srcsets = [(fmt, _srcset(ladder, renditions, fmt)) for fmt in formats]
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}"{}>',
+        (
+            (MIME_TYPES.get(fmt, f'image/{fmt}'), srcset, flatatt({'sizes': sizes}))
+            for fmt, srcset in srcsets if srcset
+        ),
+    )
+    return format_html('<picture>{}<img{}></picture>', sources, flatatt(img_attrs))
@@ -0,0 +1,58 @@
+"""Fixtures shared by the test suites of the project's apps"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from wagtail.models import Page, Site
+
+from blog.models import BlogPage
+
+from .models import BlogIndexPage, HomePage, ProjectIndexPage
+
+# Every cache alias in memory, so tests neither read nor leave files in cache/
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'test-{alias}'}
+    for alias in settings.CACHES
+}
+
+# Tasks run where they are enqueued, once the transaction commits
+IMMEDIATE_TASKS = {'default': {'BACKEND': 'django_tasks.backends.immediate.ImmediateBackend'}}
+
+
+def clear_caches():
+    for alias in TEST_CACHES:
+        caches[alias].clear()
+
+
+@override_settings(CACHES=TEST_CACHES, RESPONSIVE_IMAGE_FORMATS=(), REQUEST_INSTRUMENTATION_ENABLED=False)
+class SiteTestCase(TestCase):
+    """A default site with a blog of three posts and an empty projects index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.home = Page.get_first_root_node().add_child(instance=HomePage(title='Home', slug='test-home'))
+        Site.objects.filter(is_default_site=True).update(root_page=cls.home)
+        cls.blog_index = cls.home.add_child(instance=BlogIndexPage(title='Blog', slug='blog', show_in_menus=True))
+        cls.project_index = cls.home.add_child(
+            instance=ProjectIndexPage(title='Projects', slug='projects', show_in_menus=True),
+        )
+        now = timezone.now()
+        cls.posts = [
+            cls.blog_index.add_child(instance=BlogPage(
+                title=f'Post {i}', slug=f'post-{i}', intro=f'Intro {i}',
+                first_published_at=now - timedelta(days=i), last_published_at=now - timedelta(days=i),
+            ))
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        clear_caches()
+
+    def publish(self, page, **changes):
+        page = page.specific.__class__.objects.get(pk=page.pk)
+        for name, value in changes.items():
+            setattr(page, name, value)
+        page.save_revision().publish()
+        return page
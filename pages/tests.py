@@ -1,3 +1,1095 @@
-from django.test import TestCase
+import base64
+import gzip
+import os
+import random
+import re
+import runpy
+import shutil
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import brotli
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.db import DatabaseError, connection
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse, HttpResponseNotFound, HttpResponseNotModified
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.models import Page, PageViewRestriction, Site
+
+from blog.models import BlogPage
+from blog.related import rebuild_related_posts
+
+from . import (
+    bake, instrumentation, menus, page_cache, page_views, routers, search, signals, site_settings, sqlite,
+)
+from .block_cache import GENERATION_KEY, BlockRenderCache, get_generation_cache
+from .middleware import PageViewMiddleware
+from .models import (
+    BlogIndexPage, HomePage, ImagePlaceholder, PageViewDay, PageViewTotal, ProjectIndexPage, ProjectPage, SiteSettings,
+)
+from .pagination import KeysetPaginator
+from .placeholders import get_placeholder, prefetch_placeholders, update_placeholders
+from .post_lists import fetch_post_lists, get_post_list_batch
+from .renditions import (
+    iter_pages_with_images, missing_renditions, page_rendition_sets, rendition_set_ladder, rendition_set_specs,
+    track_missing,
+)
+from .seeding import (
+    ContentGenerator, build_blog_pages, build_project_pages, bulk_add_children, create_images, tag_blog_pages,
+)
+from .tasks import generate_image_renditions_task, generate_page_renditions_task
+from .templatetags.block_tags import get_blog_posts
+from .templatetags.image_tags import responsive_image
+from .testing import IMMEDIATE_TASKS, TEST_CACHES, SiteTestCase, clear_caches
+from .text import reading_time_minutes
+
+# A plan step reading a whole table or index. Walking an index in order
+# ("SCAN t USING INDEX i") is allowed: the listing queries stop at a LIMIT.
+_FULL_SCAN_RE = re.compile(r'^SCAN (\w+)\b(?! USING (INDEX|INTEGER PRIMARY KEY))')
+
+# Tables that stay small however much content there is
+SMALL_TABLES = {'wagtailcore_pageviewrestriction'}
+
+# Subquery table aliases, as in FROM "wagtailcore_page" U0
+_ALIAS_RE = re.compile(r'"(\w+)" (U\d+)\b')
+
+@skipUnless(connection.vendor == 'sqlite', 'Reads SQLite query plans')
+class ListingQueryPlanTests(TestCase):
+    """The listing queries use indexes rather than full scans at 100k pages"""
+
+    POSTS = 90_000
+    PROJECTS = 10_000
+
+    @classmethod
+    def setUpTestData(cls):
+        root = Page.get_first_root_node()
+        cls.blog_index = root.add_child(instance=BlogIndexPage(title='Blog', slug='blog'))
+        cls.project_index = root.add_child(instance=ProjectIndexPage(title='Projects', slug='projects'))
+
+        now = timezone.now()
+        posts = bulk_add_children(cls.blog_index, [
+            BlogPage(title=f'Post {i}', slug=f'post-{i}', intro='',
+                     first_published_at=now - timedelta(minutes=i), last_published_at=now)
+            for i in range(cls.POSTS)
+        ], batch_size=5000)
+        tag_blog_pages(posts, [['python'] if i % 100 == 0 else ['notes'] for i in range(cls.POSTS)])
+        PageViewTotal.objects.bulk_create(
+            [PageViewTotal(page_id=post.pk, views=i % 1000) for i, post in enumerate(posts)],
+            batch_size=5000,
+        )
+        bulk_add_children(cls.project_index, [
+            ProjectPage(title=f'Project {i}', slug=f'project-{i}', summary='',
+                        first_published_at=now - timedelta(minutes=i), last_published_at=now)
+            for i in range(cls.PROJECTS)
+        ], batch_size=5000)
+
+        # Give the planner real statistics, as `sqlite_maintenance` does
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def query_plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertNoFullScans(self, queries, allowed=()):
+        """``allowed`` lists full-scan plan steps a test has shown to be bounded"""
+        self.assertTrue(queries)
+        for query in queries:
+            steps = self.query_plan(query['sql'])
+            tables = {alias: table for table, alias in _ALIAS_RE.findall(query['sql'])}
+            for step in steps:
+                match = _FULL_SCAN_RE.match(step)
+                if match and step not in allowed and tables.get(match.group(1), match.group(1)) not in SMALL_TABLES:
+                    self.fail(f'Full scan ({step}) in:\n{query["sql"]}\nPlan:\n' + '\n'.join(steps))
+
+    def listing_queries(self, index, key, **params):
+        request = RequestFactory().get('/', params)
+        with CaptureQueriesContext(connection) as queries:
+            context = index.get_context(request)
+        return context[key], queries.captured_queries
+
+    def test_blog_index_pages(self):
+        listing, queries = self.listing_queries(self.blog_index, 'blog_posts')
+        self.assertEqual(len(listing), self.blog_index.posts_per_page)
+        self.assertNoFullScans(queries)
+
+        listing, queries = self.listing_queries(self.blog_index, 'blog_posts', after=listing.next_cursor)
+        self.assertTrue(listing.has_previous)
+        self.assertNoFullScans(queries)
+
+    def test_project_index_pages(self):
+        listing, queries = self.listing_queries(self.project_index, 'projects')
+        self.assertEqual(len(listing), self.project_index.projects_per_page)
+        self.assertNoFullScans(queries)
+
+    def test_post_lists(self):
+        with CaptureQueriesContext(connection) as queries:
+            latest, tagged = fetch_post_lists([{'post_count': 3}, {'post_count': 3, 'tag_filter': 'Python'}])
+        self.assertEqual([post.title for post in latest], ['Post 0', 'Post 1', 'Post 2'])
+        self.assertEqual([post.title for post in tagged], ['Post 0', 'Post 100', 'Post 200'])
+        self.assertNoFullScans(queries.captured_queries)
+
+    def test_most_read_post_lists(self):
+        with CaptureQueriesContext(connection) as queries:
+            [most_read] = fetch_post_lists([{'post_count': 3, 'ordering': 'most_read'}])
+        self.assertEqual([post.title for post in most_read], ['Post 999', 'Post 1999', 'Post 2999'])
+        # Read top down from the views index rather than sorting every post;
+        # nearly every total belongs to a listed post, so the LIMIT stops
+        # the walk after a few rows
+        self.assertNoFullScans(
+            queries.captured_queries, allowed={'SCAN V0 USING COVERING INDEX pages_pageviewtotal_views_idx'},
+        )
+
+    def test_tagged_most_read_post_lists(self):
+        with CaptureQueriesContext(connection) as queries:
+            [tagged] = fetch_post_lists([{'post_count': 3, 'ordering': 'most_read', 'tag_filter': 'Python'}])
+        self.assertEqual([post.title for post in tagged], ['Post 900', 'Post 1900', 'Post 2900'])
+        # Only the tag's posts are read and sorted, never the views index
+        self.assertNoFullScans(queries.captured_queries)
+        posts_query = next(query['sql'] for query in queries.captured_queries if 'pages_pageviewtotal' in query['sql'])
+        plan = self.query_plan(posts_query)
+        self.assertTrue(any('USING INDEX blog_blogpagetag_tag_id' in step for step in plan))
+        self.assertFalse([step for step in plan if 'pages_pageviewtotal_views_idx' in step])
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.blog_index = Page.get_first_root_node().add_child(instance=BlogIndexPage(title='Blog', slug='blog'))
+        noon = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        # Posts 1-3 share a publish date, so ties are broken by id
+        dates = [noon, noon - timedelta(days=1), noon - timedelta(days=1), noon - timedelta(days=1),
+                 noon - timedelta(days=2), None]
+        cls.posts = bulk_add_children(cls.blog_index, [
+            BlogPage(title=f'Post {i}', slug=f'post-{i}', intro='', first_published_at=published,
+                     last_published_at=published)
+            for i, published in enumerate(dates)
+        ])
+        # Newest first; the undated post is never listed
+        cls.order = [cls.posts[i].title for i in (0, 3, 2, 1, 4)]
+
+    def paginator(self):
+        return KeysetPaginator(
+            BlogPage.objects.all(), 2, keys=Page.objects.live().exact_type(BlogPage).descendant_of(self.blog_index),
+        )
+
+    def titles(self, page):
+        return [post.title for post in page]
+
+    def test_walks_forward_across_ties(self):
+        paginator = self.paginator()
+        pages = [paginator.page()]
+        while pages[-1].has_next:
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+        self.assertEqual([self.titles(page) for page in pages], [self.order[0:2], self.order[2:4], self.order[4:]])
+        self.assertEqual([page.has_previous for page in pages], [False, True, True])
+        self.assertIsNone(pages[-1].next_cursor)
+
+    def test_walks_back_to_the_first_page(self):
+        paginator = self.paginator()
+        second = paginator.page(after=paginator.page().next_cursor)
+        third = paginator.page(after=second.next_cursor)
+        back = paginator.page(before=third.previous_cursor)
+        self.assertEqual(self.titles(back), self.order[2:4])
+        self.assertTrue(back.has_previous and back.has_next)
+        first = paginator.page(before=back.previous_cursor)
+        self.assertEqual(self.titles(first), self.order[0:2])
+        self.assertFalse(first.has_previous)
+        self.assertIsNone(first.previous_cursor)
+
+    def test_malformed_cursor_gives_the_first_page(self):
+        encoded = [base64.urlsafe_b64encode(raw).decode('ascii') for raw in (b'yesterday|1', b'2026-01-01T00:00|x')]
+        for cursor in ['not-a-cursor', *encoded]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.titles(self.paginator().page(after=cursor)), self.order[0:2])
+
+    def test_index_page_uses_its_page_size(self):
+        BlogIndexPage.objects.filter(pk=self.blog_index.pk).update(posts_per_page=3)
+        index = BlogIndexPage.objects.get(pk=self.blog_index.pk)
+        first = index.get_context(RequestFactory().get('/'))['blog_posts']
+        second = index.get_context(RequestFactory().get('/', {'after': first.next_cursor}))['blog_posts']
+        self.assertEqual(self.titles(first) + self.titles(second), self.order)
+
+
+class PlainTextTests(SiteTestCase):
+    CONTENT = [
+        ('intro_text', {'heading': 'Why', 'text': '<p>Because <b>plain</b> text</p>', 'image_position': 'left'}),
+        ('faq', {'heading': 'FAQ', 'faqs': [{'question': 'Is it fast?', 'answer': '<p>Yes.</p>'}]}),
+    ]
+
+    def stored(self, page):
+        return BlogPage.objects.values_list('body_text', 'word_count', 'reading_time').get(pk=page.pk)
+
+    def test_save_stores_text_of_every_block(self):
+        post = self.publish(self.posts[0], content=self.CONTENT)
+        self.assertEqual(self.stored(post), ('Why\n\nBecause plain text\n\nFAQ\n\nIs it fast?\n\nYes.', 9, 1))
+
+    def test_saving_other_fields_keeps_the_text(self):
+        post = self.publish(self.posts[0], content=self.CONTENT)
+        BlogPage.objects.filter(pk=post.pk).update(word_count=0)
+        post.title = 'Renamed'
+        post.save(update_fields=['title'])
+        self.assertEqual(self.stored(post)[1], 0)
+        post.save(update_fields=['content'])
+        self.assertEqual(self.stored(post)[1], 9)
+
+    def test_reading_time(self):
+        self.assertEqual([reading_time_minutes(words) for words in (0, 1, 200, 201)], [0, 1, 1, 2])
+
+    def test_backfill(self):
+        post = self.publish(self.posts[0], content=self.CONTENT)
+        BlogPage.objects.filter(pk=post.pk).update(body_text='', word_count=0, reading_time=0)
+        call_command('backfill_plain_text', batch_size=2, stdout=StringIO())
+        self.assertEqual(self.stored(post)[1:], (9, 1))
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Tunes SQLite')
+class SqliteProductionModeTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # The settings module as a production server loads it
+        with mock.patch.dict(os.environ, {'SQLITE_PRODUCTION_MODE': '1'}):
+            production = runpy.run_path(str(Path(settings.BASE_DIR) / 'aquiles_site' / 'settings.py'))
+        handler = ConnectionHandler({
+            'default': {**production['DATABASES']['default'], 'NAME': str(Path(directory) / 'db.sqlite3')},
+        })
+        self.connection = handler['default']
+        self.addCleanup(self.connection.close)
+
+    def test_connections_are_tuned(self):
+        self.assertEqual(sqlite.pragmas(self.connection), {
+            'journal_mode': 'wal', 'synchronous': 1, 'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024, 'busy_timeout': 5000,
+        })
+        self.assertEqual(self.connection.settings_dict['CONN_MAX_AGE'], 600)
+
+    def test_checkpoint_empties_the_wal(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE t (x)')
+            cursor.executemany('INSERT INTO t VALUES (%s)', [(i,) for i in range(100)])
+        busy, frames, copied = sqlite.checkpoint(self.connection, 'TRUNCATE')
+        self.assertEqual((busy, frames, copied), (0, 0, 0))
+        with self.assertRaises(ValueError):
+            sqlite.checkpoint(self.connection, 'SOMETIMES')
+
+    def test_maintenance_command(self):
+        stdout = StringIO()
+        with mock.patch(
+            'pages.management.commands.sqlite_maintenance.connections', {'default': self.connection},
+        ):
+            call_command('sqlite_maintenance', '--mode', 'TRUNCATE', '--show-pragmas', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertRegex(output, r'journal_mode +wal')
+        self.assertIn('Checkpointed', output)
+        self.assertIn('Ran PRAGMA optimize', output)
+
+
+@override_settings(CACHES=TEST_CACHES, SITE_SETTINGS_PROCESS_TTL=30)
+class SiteSettingsTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.enterContext(mock.patch.object(site_settings, '_memo', None))
+
+    def expire_memo(self):
+        # As in another process, or this one after SITE_SETTINGS_PROCESS_TTL
+        site_settings._memo = None
+
+    def test_defaults_until_the_row_exists(self):
+        self.assertEqual(site_settings.get_site_settings().site_name, 'Aquiles Personal Website')
+
+    def test_read_once_then_from_memory_and_the_shared_cache(self):
+        SiteSettings.objects.create(site_name='Aquiles')
+        with self.assertNumQueries(1):
+            self.assertEqual(site_settings.get_site_settings().site_name, 'Aquiles')
+            site_settings.get_site_settings()
+        self.expire_memo()
+        with self.assertNumQueries(0):
+            self.assertEqual(site_settings.get_site_settings().site_name, 'Aquiles')
+            self.assertEqual(async_to_sync(site_settings.aget_site_settings)().site_name, 'Aquiles')
+
+    def test_memo_expires(self):
+        row = SiteSettings.objects.create(site_name='Before')
+        site_settings.get_site_settings()
+        # Changed in another process, which dropped the shared entry
+        SiteSettings.objects.filter(pk=row.pk).update(site_name='After')
+        clear_caches()
+        self.assertEqual(site_settings.get_site_settings().site_name, 'Before')
+        with mock.patch('time.monotonic', return_value=time.monotonic() + 31):
+            self.assertEqual(site_settings.get_site_settings().site_name, 'After')
+
+    def test_save_invalidates_after_commit(self):
+        row = SiteSettings.objects.create(site_name='Before')
+        old_version = site_settings.get_site_settings_version()
+        row.site_name = 'After'
+        with self.captureOnCommitCallbacks(execute=True):
+            row.save()
+            self.assertEqual(site_settings.get_site_settings().site_name, 'Before')
+        self.assertEqual(site_settings.get_site_settings().site_name, 'After')
+        self.assertNotEqual(site_settings.get_site_settings_version(), old_version)
+
+    def test_version_follows_the_values(self):
+        version = site_settings.settings_version
+        self.assertEqual(version(SiteSettings(site_name='A')), version(SiteSettings(site_name='A')))
+        self.assertNotEqual(version(SiteSettings(site_name='A')), version(SiteSettings(site_name='B')))
+
+
+class PostListTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        tag_blog_pages(cls.posts, [['Python'], ['Notes'], ['Python', 'Notes']])
+        PageViewTotal.objects.bulk_create([
+            PageViewTotal(page_id=cls.posts[1].pk, views=9), PageViewTotal(page_id=cls.posts[2].pk, views=4),
+        ])
+
+    def titles(self, *values):
+        return [[post.title for post in posts] for posts in fetch_post_lists(values)]
+
+    def test_latest_tagged_and_most_read(self):
+        self.assertEqual(
+            self.titles({'post_count': 2}, {'tag_filter': 'python'}, {'ordering': 'most_read'}),
+            [['Post 0', 'Post 1'], ['Post 0', 'Post 2'], ['Post 1', 'Post 2']],
+        )
+
+    def test_query_count_does_not_grow_with_blocks(self):
+        def count(values):
+            with CaptureQueriesContext(connection) as queries:
+                for posts in fetch_post_lists(values):
+                    for post in posts:
+                        [tag.slug for tag in post.tags.all()]
+            return len(queries)
+
+        self.assertEqual(
+            count([{'post_count': 1}]),
+            count([{'post_count': 3}, {'tag_filter': 'notes'}, {'ordering': 'most_read', 'tag_filter': 'python'}]),
+        )
+
+    def test_private_posts_are_left_out(self):
+        PageViewRestriction.objects.create(page=self.posts[0], restriction_type=PageViewRestriction.LOGIN)
+        self.assertEqual(self.titles({'post_count': 3}), [['Post 1', 'Post 2']])
+
+    def test_page_batch_is_fetched_once(self):
+        page = HomePage.objects.get(pk=self.home.pk)
+        page.content = [('post_list', {'post_count': 1}), ('post_list', {'tag_filter': 'notes'})]
+        values = [block.value for block in page.content]
+        self.assertEqual([len(posts) for _, posts in get_post_list_batch(page)], [1, 2])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [get_blog_posts({'page': page}, value)[0].title for value in values], ['Post 0', 'Post 1'],
+            )
+
+
+@override_settings(
+    REQUEST_INSTRUMENTATION_ENABLED=True,
+    QUERY_BUDGETS_RAISE=True,
+    # Every request renders, with nothing cached from an earlier one
+    PAGE_CACHE_ENABLED=False,
+    CACHES=TEST_CACHES,
+    RESPONSIVE_IMAGE_FORMATS=(),
+)
+class QueryBudgetTests(TestCase):
+    """Seeded pages render within their QUERY_BUDGETS, so an N+1 fails the suite"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        images = create_images(3, rng)
+        generator = ContentGenerator(rng, [image.pk for image in images])
+
+        home = Page.get_first_root_node().add_child(instance=HomePage(title='Home', slug='budget-home'))
+        Site.objects.filter(is_default_site=True).update(root_page=home)
+        blog_index = home.add_child(instance=BlogIndexPage(title='Blog', slug='blog', show_in_menus=True))
+        project_index = home.add_child(instance=ProjectIndexPage(title='Projects', slug='projects', show_in_menus=True))
+
+        posts, tag_names = build_blog_pages(12, generator)
+        bulk_add_children(blog_index, posts)
+        tag_blog_pages(posts, tag_names)
+        bulk_add_children(project_index, build_project_pages(4, generator))
+
+        # What the publish-time tasks would have done
+        rebuild_related_posts()
+        update_placeholders(images)
+        for page in iter_pages_with_images():
+            generate_page_renditions_task.call(page.pk)
+
+    def setUp(self):
+        clear_caches()
+
+    def budgeted_urls(self):
+        urls = ['/cms/', '/cms/blog/', '/cms/projects/']
+        urls += [page.url for page in Page.objects.type(BlogPage, ProjectPage).live().specific()]
+        return urls
+
+    def test_pages_render_within_budget(self):
+        budgets = [re.compile(pattern) for pattern, _ in settings.QUERY_BUDGETS]
+        for url in self.budgeted_urls():
+            with self.subTest(url=url):
+                self.assertTrue(any(budget.match(url) for budget in budgets))
+                # A request over its budget raises QueryBudgetExceeded
+                with self.assertLogs('pages.instrumentation', 'INFO') as logs:
+                    response = self.client.get(url)
+                self.assertIn(response.status_code, (200, 302))
+                self.assertIn('queries=', logs.output[-1])
+
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'
+
+
+class BotDetectionTests(TestCase):
+    def request(self, **headers):
+        return RequestFactory().get('/', headers=headers)
+
+    def test_browsers_are_not_bots(self):
+        self.assertFalse(page_views.is_bot(self.request(user_agent=BROWSER_USER_AGENT)))
+
+    def test_bots_scripts_and_prefetches(self):
+        for headers in [
+            {},
+            {'user_agent': 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'},
+            {'user_agent': 'curl/8.5.0'},
+            {'user_agent': 'python-requests/2.32.3'},
+            {'user_agent': BROWSER_USER_AGENT, 'sec_purpose': 'prefetch;prerender'},
+            {'user_agent': BROWSER_USER_AGENT, 'purpose': 'prefetch'},
+        ]:
+            with self.subTest(headers=headers):
+                self.assertTrue(page_views.is_bot(self.request(**headers)))
+
+    @override_settings(PAGE_VIEWS_BOT_PATTERN=r'firefox')
+    def test_custom_pattern(self):
+        self.assertTrue(page_views.is_bot(self.request(user_agent=BROWSER_USER_AGENT)))
+
+
+@override_settings(PAGE_VIEWS_ENABLED=True)
+@mock.patch('pages.page_views.record')
+class PageViewMiddlewareTests(TestCase):
+    def count(self, response=None, method='get', page_id=3, user_agent=BROWSER_USER_AGENT):
+        request = getattr(RequestFactory(), method)('/', headers={'user_agent': user_agent})
+        if page_id is not None:
+            request.viewed_page_id = page_id
+        middleware = PageViewMiddleware(lambda request: response)
+        middleware.count(request, response or HttpResponse())
+
+    def test_counts_full_responses_and_revalidations(self, record):
+        self.count()
+        self.count(HttpResponseNotModified())
+        self.assertEqual(record.call_args_list, [mock.call(3), mock.call(3)])
+
+    def test_ignores_uncounted_requests(self, record):
+        self.count(page_id=None)
+        self.count(method='post')
+        self.count(HttpResponseNotFound())
+        self.count(user_agent='Googlebot/2.1')
+        with self.settings(PAGE_VIEWS_ENABLED=False):
+            self.count()
+        record.assert_not_called()
+
+
+class ViewBufferTests(TestCase):
+    def test_drain_empties_the_buffer(self):
+        buffer = page_views.ViewBuffer()
+        buffer.add(1, date(2026, 1, 1))
+        buffer.add(1, date(2026, 1, 1), views=2)
+        buffer.add(2, date(2026, 1, 1))
+        self.assertEqual(buffer.drain(), {(1, date(2026, 1, 1)): 3, (2, date(2026, 1, 1)): 1})
+        self.assertEqual(len(buffer), 0)
+
+    def test_failed_flush_keeps_counts(self):
+        buffer = page_views.ViewBuffer()
+        buffer.add(1, date(2026, 1, 1), views=2)
+        with mock.patch.object(page_views, 'view_buffer', buffer), \
+                mock.patch.object(page_views, 'write_counts', side_effect=DatabaseError('locked')), \
+                self.assertLogs('pages.page_views', 'ERROR'):
+            self.assertEqual(page_views.flush(), 0)
+        # Views recorded since are added to the ones put back
+        buffer.add(1, date(2026, 1, 1))
+        self.assertEqual(buffer.drain(), {(1, date(2026, 1, 1)): 3})
+
+
+@override_settings(PAGE_VIEWS_FLUSH_MAX_VIEWS=3, PAGE_VIEWS_FLUSH_INTERVAL=30)
+@mock.patch.object(page_views, 'write_counts', return_value=0)
+class FlushOnRequestTests(TestCase):
+    def setUp(self):
+        self.buffer = page_views.ViewBuffer()
+        self.enterContext(mock.patch.object(page_views, 'view_buffer', self.buffer))
+
+    def finish_request(self):
+        request_finished.send(sender=self.__class__)
+
+    def test_flushes_once_enough_views_are_buffered(self, write_counts):
+        self.buffer.add(1, date(2026, 1, 1), views=2)
+        self.finish_request()
+        write_counts.assert_not_called()
+        self.buffer.add(2, date(2026, 1, 1))
+        self.finish_request()
+        write_counts.assert_called_once_with({(1, date(2026, 1, 1)): 2, (2, date(2026, 1, 1)): 1})
+
+    def test_flushes_a_buffer_older_than_the_interval(self, write_counts):
+        with mock.patch('time.monotonic', return_value=100):
+            self.buffer.add(1, date(2026, 1, 1))
+        with mock.patch('time.monotonic', return_value=129):
+            self.finish_request()
+        write_counts.assert_not_called()
+        with mock.patch('time.monotonic', return_value=130):
+            self.finish_request()
+        write_counts.assert_called_once()
+
+    def test_failed_flush_waits_for_new_views(self, write_counts):
+        write_counts.side_effect = DatabaseError('locked')
+        self.buffer.add(1, date(2026, 1, 1), views=3)
+        with self.assertLogs('pages.page_views', 'ERROR'):
+            self.finish_request()
+        self.finish_request()
+        self.assertEqual(write_counts.call_count, 1)
+        self.assertEqual(len(self.buffer), 1)
+
+class WriteCountsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        root = Page.get_first_root_node()
+        cls.first = root.add_child(instance=Page(title='First', slug='first'))
+        cls.second = root.add_child(instance=Page(title='Second', slug='second'))
+
+    def days(self):
+        return {
+            (page_id, day): views
+            for page_id, day, views in PageViewDay.objects.values_list('page_id', 'date', 'views')
+        }
+
+    def totals(self):
+        return dict(PageViewTotal.objects.values_list('page_id', 'views'))
+
+    def test_upserts_daily_and_total_views(self):
+        monday, tuesday = date(2026, 1, 5), date(2026, 1, 6)
+        written = page_views.write_counts({
+            (self.first.pk, monday): 2,
+            (self.first.pk, tuesday): 3,
+            (self.second.pk, monday): 1,
+        })
+        self.assertEqual(written, 6)
+        self.assertEqual(self.days(), {
+            (self.first.pk, monday): 2, (self.first.pk, tuesday): 3, (self.second.pk, monday): 1,
+        })
+        self.assertEqual(self.totals(), {self.first.pk: 5, self.second.pk: 1})
+
+        # Existing rows are added to, not replaced
+        page_views.write_counts({(self.first.pk, tuesday): 4})
+        self.assertEqual(self.days()[self.first.pk, tuesday], 7)
+        self.assertEqual(self.totals(), {self.first.pk: 9, self.second.pk: 1})
+
+    def test_skips_deleted_pages(self):
+        deleted_id = self.second.pk
+        self.second.delete()
+        written = page_views.write_counts({(self.first.pk, date(2026, 1, 5)): 1, (deleted_id, date(2026, 1, 5)): 4})
+        self.assertEqual(written, 1)
+        self.assertEqual(self.totals(), {self.first.pk: 1})
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PageCacheTests(SiteTestCase):
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response['X-Page-Cache']
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.get('/cms/blog/'), 'MISS')
+        self.assertEqual(self.get('/cms/blog/'), 'HIT')
+
+    def test_unknown_query_params_share_the_entry(self):
+        self.assertEqual(self.get('/cms/blog/'), 'MISS')
+        self.assertEqual(self.get('/cms/blog/', utm_source='feed', x='123'), 'HIT')
+        self.assertEqual(self.get('/cms/blog/', before='abc'), 'MISS')
+
+    def test_publish_purges_the_page_and_its_ancestors(self):
+        post = self.posts[0]
+        for url in (post.url, '/cms/blog/', '/cms/projects/'):
+            self.get(url)
+        self.publish(post, title='Renamed')
+        self.assertEqual(self.get(post.url), 'MISS')
+        self.assertEqual(self.get('/cms/blog/'), 'MISS')
+        self.assertEqual(self.get('/cms/projects/'), 'HIT')
+
+    def test_slug_change_purges_descendants(self):
+        # Out of the menu, whose change would purge every page anyway
+        Page.objects.filter(pk=self.blog_index.pk).update(show_in_menus=False)
+        menus.invalidate_menus()
+        post = self.posts[0]
+        self.get(post.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publish(self.blog_index, slug='writing')
+        # The post's entry under its old URL is no longer served; Wagtail's
+        # redirect to the new one is
+        self.assertRedirects(
+            self.client.get(post.url), '/cms/writing/post-0/', status_code=301, fetch_redirect_response=False,
+        )
+        self.assertEqual(self.get('/cms/writing/post-0/'), 'MISS')
+
+    @mock.patch('pages.tasks.generate_image_renditions_task')
+    def test_pages_missing_renditions_are_not_stored(self, task):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        [image] = create_images(1, random.Random(0))
+        post = self.publish(self.posts[0], featured_image=image)
+        clear_caches()
+        self.assertEqual(self.get(post.url), 'MISS')
+        self.assertEqual(self.get(post.url), 'MISS')
+        generate_page_renditions_task.call(post.pk)
+        self.assertEqual(self.get(post.url), 'MISS')
+        self.assertEqual(self.get(post.url), 'HIT')
+
+    def test_lost_generation_is_a_miss(self):
+        post = self.posts[0]
+        self.get(post.url)
+        self.publish(post, title='Renamed')
+        # The entry stored before the publish outlives the purge's generation,
+        # as when the generation cache is cleared or loses keys
+        page_cache.get_generation_cache().clear()
+        response = self.client.get(post.url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Renamed')
+
+    @override_settings(PAGE_CACHE_STATS_INTERVAL=0)
+    @mock.patch.object(page_cache, '_counts', Counter())
+    def test_stats(self):
+        self.get('/cms/blog/')
+        self.get('/cms/blog/')
+        self.assertEqual(page_cache.stats(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+
+@override_settings(ALLOWED_HOSTS=['testserver', 'other.test'])
+class MenuTests(SiteTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Site.objects.create(hostname='other.test', port=80, root_page=cls.project_index)
+        cls.project_index.add_child(instance=ProjectPage(
+            title='Rocket', slug='rocket', summary='A rocket', show_in_menus=True,
+        ))
+
+    def menu(self, host):
+        return menus.get_menu_html(RequestFactory().get('/', headers={'host': host}))
+
+    def test_each_site_has_its_own_menu(self):
+        self.assertIn('Blog', self.menu('testserver'))
+        self.assertIn('Rocket', self.menu('other.test'))
+        with mock.patch.object(menus, '_render') as render:
+            self.assertIn('Blog', self.menu('testserver'))
+            self.assertIn('Rocket', self.menu('other.test'))
+        render.assert_not_called()
+
+    def test_invalidation_drops_every_site(self):
+        self.menu('testserver')
+        self.menu('other.test')
+        menus.invalidate_menus()
+        with mock.patch.object(menus, '_render', return_value='') as render:
+            self.menu('testserver')
+            self.menu('other.test')
+        self.assertEqual(render.call_count, 2)
+
+    def test_deleting_a_subtree_refreshes_once(self):
+        # Without the callbacks the fixtures queued, which never run inside
+        # the test's transaction
+        with mock.patch.object(connection, 'run_on_commit', []):
+            Page.objects.get(pk=self.blog_index.pk).delete()
+            queued = [func for _, func, _ in connection.run_on_commit]
+        self.assertEqual(queued.count(signals.refresh_menus), 1)
+
+
+@override_settings(PAGES_SEARCH_ENGINE='fts5', TASKS=IMMEDIATE_TASKS)
+class SearchTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publish(self.posts[0], title='Rust in production', intro='Notes')
+            self.publish(self.posts[1], title='Notes', intro='Lessons from rust')
+            self.publish(self.posts[2], title='Gardening', intro='Tomatoes, rust on the old greenhouse and a wet spring')
+
+    def found(self, query, **kwargs):
+        return [page.pk for page, _, _ in search.search(query, **kwargs)]
+
+    def test_publish_indexes_the_page(self):
+        self.assertEqual(self.found('tomato'), [self.posts[2].pk])
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.found('rust'), [post.pk for post in self.posts])
+
+    def test_matches_are_highlighted(self):
+        [(_, title, _)] = search.search('garden')
+        self.assertEqual(title, '<mark>Gardening</mark>')
+
+    def test_unpublish_removes_the_page(self):
+        self.posts[0].specific.unpublish()
+        self.assertEqual(self.found('rust'), [self.posts[1].pk, self.posts[2].pk])
+
+    def test_stale_entries_do_not_take_a_results_slot(self):
+        # Unpublished without the signal, leaving its entry behind
+        Page.objects.filter(pk=self.posts[0].pk).update(live=False)
+        self.assertEqual(self.found('rust', limit=1), [self.posts[1].pk])
+
+    def test_restricted_sections_are_left_out(self):
+        PageViewRestriction.objects.create(page=self.blog_index, restriction_type=PageViewRestriction.LOGIN)
+        self.assertEqual(self.found('rust'), [])
+
+    def test_members_only_pages_need_membership(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publish(self.posts[2], is_members_only=True)
+        self.assertEqual(self.found('tomato'), [])
+        self.assertEqual(self.found('tomato', include_members_only=True), [self.posts[2].pk])
+
+    def test_view_pages_past_stale_entries(self):
+        Page.objects.filter(pk=self.posts[1].pk).update(live=False)
+        with mock.patch('pages.views.SEARCH_RESULTS_PER_PAGE', 1):
+            first = self.client.get('/search/', {'q': 'rust'}).context
+            second = self.client.get('/search/', {'q': 'rust', 'page': 2}).context
+        self.assertEqual([page.pk for page, _, _ in first['results']], [self.posts[0].pk])
+        self.assertTrue(first['has_next'])
+        self.assertEqual([page.pk for page, _, _ in second['results']], [self.posts[2].pk])
+        self.assertFalse(second['has_next'])
+
+
+class ConditionalGetTests(SiteTestCase):
+    def revalidate(self, url, response):
+        return self.client.get(url, headers={'if_none_match': response['ETag']})
+
+    def test_unchanged_index_answers_304(self):
+        response = self.client.get('/cms/blog/')
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertEqual(self.revalidate('/cms/blog/', response).status_code, 304)
+
+    def test_publishing_a_child_changes_the_index(self):
+        response = self.client.get('/cms/blog/')
+        self.publish(self.posts[1], title='Renamed')
+        revalidated = self.revalidate('/cms/blog/', response)
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertNotEqual(revalidated['ETag'], response['ETag'])
+        self.assertContains(revalidated, 'Renamed')
+
+    def test_unpublishing_a_child_changes_the_index(self):
+        response = self.client.get('/cms/blog/')
+        self.posts[2].unpublish()
+        self.assertEqual(self.revalidate('/cms/blog/', response).status_code, 200)
+
+    def test_restricted_pages_are_left_to_the_privacy_check(self):
+        post = self.posts[0]
+        response = self.client.get(post.url)
+        PageViewRestriction.objects.create(
+            page=self.blog_index, restriction_type=PageViewRestriction.PASSWORD, password='secret',
+        )
+        revalidated = self.revalidate(post.url, response)
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertFalse(revalidated.has_header('ETag'))
+        self.assertContains(revalidated, 'password')
+
+
+# Bake requests each page under its site's hostname, as the web server would
+@override_settings(ALLOWED_HOSTS=['testserver', 'localhost'])
+class BakeTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.enterContext(override_settings(BAKE_ROOT=self.root))
+
+    def test_bakes_a_page_with_compressed_variants(self):
+        post = self.posts[0].specific
+        [(page_id, files, error)] = bake.bake_pages([post], workers=0)
+        self.assertEqual((page_id, error), (post.pk, None))
+        html_name, gzip_name, brotli_name = files
+        self.assertTrue(html_name.endswith('/cms/blog/post-0/index.html'))
+        html = (self.root / html_name).read_bytes()
+        self.assertIn(b'Post 0', html)
+        self.assertEqual(gzip.decompress((self.root / gzip_name).read_bytes()), html)
+        self.assertEqual(brotli.decompress((self.root / brotli_name).read_bytes()), html)
+
+    @mock.patch('pages.tasks.generate_image_renditions_task')
+    def test_bake_generates_missing_renditions(self, task):
+        self.enterContext(override_settings(MEDIA_ROOT=self.root / 'media'))
+        [image] = create_images(1, random.Random(0))
+        post = self.publish(self.posts[0], featured_image=image)
+        [(_, files, error)] = bake.bake_pages([post], workers=0)
+        self.assertIsNone(error)
+        self.assertTrue(image.renditions.exists())
+        self.assertNotIn(image.file.url.encode(), (self.root / files[0]).read_bytes())
+
+    def test_restricted_pages_are_not_baked(self):
+        PageViewRestriction.objects.create(
+            page=self.blog_index, restriction_type=PageViewRestriction.PASSWORD, password='secret',
+        )
+        baked = {page.pk for page in bake.bakeable_pages()}
+        self.assertIn(self.home.pk, baked)
+        self.assertTrue(baked.isdisjoint({self.blog_index.pk, *(post.pk for post in self.posts)}))
+
+    @override_settings(BAKE_ON_PUBLISH=True)
+    def test_settings_change_rebakes_every_page(self):
+        with mock.patch('pages.signals.bake_all_pages_task') as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                SiteSettings.objects.create()
+        task.enqueue.assert_called_once_with()
+
+
+@override_settings(CACHES=TEST_CACHES, RESPONSIVE_IMAGE_FORMATS=('webp',))
+class ResponsiveImageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        [cls.image] = create_images(1, random.Random(0))
+
+    def setUp(self):
+        clear_caches()
+
+    @mock.patch('pages.tasks.generate_image_renditions_task')
+    def test_missing_renditions_are_queued_not_generated(self, task):
+        html = responsive_image(self.image, 'card')
+        self.assertIn(f'src="{self.image.file.url}"', html)
+        self.assertNotIn('<source', html)
+        self.assertFalse(self.image.renditions.exists())
+        task.enqueue.assert_called_once_with(self.image.pk, rendition_set_specs('card', self.image))
+
+        # Queued once, however often the image is rendered meanwhile
+        responsive_image(self.image, 'card')
+        task.enqueue.assert_called_once()
+
+    @mock.patch('pages.tasks.generate_image_renditions_task')
+    def test_missing_renditions_are_tracked(self, task):
+        with track_missing() as missing:
+            responsive_image(self.image, 'card')
+        self.assertEqual(missing, {self.image.pk: set(rendition_set_specs('card', self.image))})
+
+    def test_generated_renditions_are_offered(self):
+        generate_image_renditions_task.call(self.image.pk, rendition_set_specs('card', self.image))
+        with self.assertNumQueries(1):
+            html = responsive_image(self.image, 'card')
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn('400w', html)
+        self.assertNotIn(self.image.file.url, html)
+
+
+    def test_ladder_skips_steps_wider_than_the_image(self):
+        # The seed images are 1600x900
+        self.assertEqual(rendition_set_ladder(self.image, 'hero'), [
+            ('fill-640x267', '640w'), ('fill-960x400', '960w'), ('fill-1280x533', '1280w'),
+        ])
+        self.assertEqual(rendition_set_ladder(self.image, 'avatar'), [('fill-64x64', '1x'), ('fill-128x128', '2x')])
+
+    def test_small_images_keep_the_smallest_step(self):
+        icon = SimpleNamespace(width=100, height=100)
+        self.assertEqual(rendition_set_ladder(icon, 'card'), [('fill-400x250', '400w')])
+
+    @override_settings(RESPONSIVE_IMAGE_FORMATS=('avif', 'webp'))
+    def test_specs_cover_every_format(self):
+        self.assertEqual(rendition_set_specs('avatar'), [
+            'fill-64x64', 'fill-128x128',
+            'fill-64x64|format-avif', 'fill-128x128|format-avif',
+            'fill-64x64|format-webp', 'fill-128x128|format-webp',
+        ])
+
+    def test_page_sets_and_missing_renditions(self):
+        page = HomePage(title='Home', content=[
+            ('hero', {'title': 'Hi', 'background_image': self.image}),
+            ('card_grid', {'cards': [{'title': 'A', 'description': 'B', 'image': self.image}]}),
+        ])
+        sets = page_rendition_sets(page)
+        self.assertEqual(sets, {self.image.pk: {'hero', 'card'}})
+        generate_image_renditions_task.call(self.image.pk, rendition_set_specs('card', self.image))
+        self.assertEqual(missing_renditions(sets), {self.image.pk: sorted(rendition_set_specs('hero', self.image))})
+
+
+@override_settings(CACHES=TEST_CACHES, TASKS=IMMEDIATE_TASKS)
+class PlaceholderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+    def setUp(self):
+        clear_caches()
+
+    def create_image(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            [image] = create_images(1, random.Random(0))
+        return image
+
+    def test_saving_an_image_stores_its_placeholder(self):
+        image = self.create_image()
+        placeholder = ImagePlaceholder.objects.get(image=image)
+        # The seed images are 16:9
+        self.assertEqual((placeholder.width, placeholder.height), (16, 9))
+        self.assertRegex(placeholder.color, r'^#[0-9a-f]{6}$')
+        self.assertTrue(placeholder.data_uri.startswith('data:image/svg+xml;charset=utf-8,'))
+        self.assertLess(len(placeholder.data_uri), 2000)
+
+    def test_only_changed_images_are_recomputed(self):
+        image = self.create_image()
+        self.assertEqual(update_placeholders([image]), 0)
+        self.assertEqual(update_placeholders([image], force=True), 1)
+        ImagePlaceholder.objects.filter(image=image).update(source='an older file')
+        self.assertEqual(update_placeholders([image]), 1)
+
+    def test_lookups_are_cached(self):
+        image = self.create_image()
+        with self.assertNumQueries(1):
+            placeholder = get_placeholder(image)
+            self.assertEqual(get_placeholder(image), placeholder)
+
+    def test_misses_are_cached_until_a_placeholder_is_stored(self):
+        [image] = create_images(1, random.Random(0))
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_placeholder(image))
+            self.assertIsNone(get_placeholder(image))
+        update_placeholders([image])
+        self.assertIsNotNone(get_placeholder(image))
+
+    def test_prefetch_reads_every_image_at_once(self):
+        images = [self.create_image() for _ in range(3)]
+        with self.assertNumQueries(1):
+            prefetch_placeholders(images)
+            self.assertTrue(all(get_placeholder(image) for image in images))
+
+@override_settings(SITEMAP_SHARD_SIZE=1)
+class SitemapTests(SiteTestCase):
+    def shard(self, page):
+        response = self.client.get(f'/sitemap-{page.pk}.xml')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_shards_list_page_urls(self):
+        index = self.client.get('/sitemap.xml')
+        self.assertContains(index, f'/sitemap-{self.posts[0].pk}.xml')
+        self.assertIn(b'<loc>http://localhost/cms/blog/post-0/</loc>', self.shard(self.posts[0]))
+
+    def test_unpublish_drops_the_shard(self):
+        self.shard(self.posts[0])
+        self.client.get('/sitemap.xml')
+        self.posts[0].unpublish()
+        self.assertNotContains(self.client.get('/sitemap.xml'), f'/sitemap-{self.posts[0].pk}.xml')
+        self.assertEqual(self.client.get(f'/sitemap-{self.posts[0].pk}.xml').status_code, 404)
+
+    def test_slug_change_purges_descendant_shards(self):
+        self.shard(self.posts[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publish(self.blog_index, slug='writing')
+        self.assertIn(b'<loc>http://localhost/cms/writing/post-0/</loc>', self.shard(self.posts[0]))
+
+
+@override_settings(CACHES=TEST_CACHES, REPLICA_PIN_SECONDS=10)
+class ReplicaPinTests(TestCase):
+    def setUp(self):
+        clear_caches()
+
+    def test_unpinned_without_publishes(self):
+        self.assertFalse(routers.is_pinned())
+
+    def test_publish_pins_until_a_later_sync(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            routers.pin_primary()
+        routers.record_sync(time.time() - 1)
+        self.assertTrue(routers.is_pinned())
+        with mock.patch('time.time', return_value=time.time() + 60):
+            # However long the replica lags
+            self.assertTrue(routers.is_pinned())
+        routers.record_sync(time.time() + 1)
+        self.assertFalse(routers.is_pinned())
+
+    def test_sync_started_before_the_commit_keeps_the_pin(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            routers.pin_primary()
+            routers.record_sync(time.time())
+        self.assertTrue(routers.is_pinned())
+
+    def test_replica_without_sync_position_is_pinned_for_a_while(self):
+        routers.pin_primary()
+        self.assertTrue(routers.is_pinned())
+        with mock.patch('time.time', return_value=time.time() + 11):
+            self.assertFalse(routers.is_pinned())
+
+
+@override_settings(CACHES=TEST_CACHES, BLOCK_RENDER_CACHE_CHECK_INTERVAL=0)
+class BlockRenderCacheTests(TestCase):
+    def setUp(self):
+        clear_caches()
+
+    def test_hits_and_misses_are_counted(self):
+        cache = BlockRenderCache()
+        self.assertIsNone(cache.get('key'))
+        cache.set('key', '<p>Hello</p>')
+        self.assertEqual(cache.get('key'), '<p>Hello</p>')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'entries': 1, 'hit_ratio': 0.5})
+
+    def test_invalidation_reaches_other_processes(self):
+        this_process, other_process = BlockRenderCache(), BlockRenderCache()
+        other_process.set('key', '<p>Old</p>')
+        self.assertEqual(other_process.get('key'), '<p>Old</p>')
+        this_process.invalidate()
+        self.assertIsNone(other_process.get('key'))
+
+    def test_stale_entries_live_until_the_next_check(self):
+        other_process = BlockRenderCache()
+        other_process.get('key')
+        other_process.set('key', '<p>Old</p>')
+        with override_settings(BLOCK_RENDER_CACHE_CHECK_INTERVAL=60):
+            BlockRenderCache().invalidate()
+            self.assertEqual(other_process.get('key'), '<p>Old</p>')
+
+    def test_request_metrics_report_block_cache_lookups(self):
+        metrics = instrumentation.RequestMetrics()
+        metrics.count_block_cache(hit=True)
+        metrics.count_block_cache(hit=False)
+        self.assertEqual(
+            (metrics.as_dict()['block_cache_hits'], metrics.as_dict()['block_cache_misses']), (1, 1),
+        )
+        self.assertIn('blockcache;desc="1 hits, 1 misses"', metrics.server_timing())
+
+
+class BlockRenderCacheInvalidationTests(SiteTestCase):
+    def generation(self):
+        return get_generation_cache().get(GENERATION_KEY)
+
+    def test_slug_change_invalidates(self):
+        # Saved without publishing, so only page_slug_changed is sent
+        page = BlogIndexPage.objects.get(pk=self.blog_index.pk)
+        page.slug = 'writing'
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save()
+        self.assertIsNotNone(self.generation())
+
+    def test_move_invalidates(self):
+        self.posts[0].move(self.project_index, pos='last-child')
+        self.assertIsNotNone(self.generation())
+
+    def test_new_placeholders_invalidate(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with self.settings(MEDIA_ROOT=media_root):
+            [image] = create_images(1, random.Random(0))
+            clear_caches()
+            update_placeholders([image])
+        self.assertIsNotNone(self.generation())
@@ -0,0 +1,77 @@
+import math
+
+from django.db import models
+from wagtail import blocks
+from wagtail.rich_text import get_text_for_indexing
+
+WORDS_PER_MINUTE = 200
+
+
+def _block_text(block, value):
+    """Yield the human-readable text of a block value, skipping choices, URLs and media"""
+    if value is None:
+        return
+    if isinstance(block, blocks.RichTextBlock):
+        yield get_text_for_indexing(value.source)
+    elif isinstance(block, (blocks.CharBlock, blocks.TextBlock)):
+        if value:
+            yield value
+    elif isinstance(block, blocks.StructBlock):
+        for name, child_block in block.child_blocks.items():
+            yield from _block_text(child_block, value.get(name))
+    elif isinstance(block, blocks.ListBlock):
+        for item in value:
+            yield from _block_text(block.child_block, item)
+    elif isinstance(block, blocks.StreamBlock):
+        for child in value:
+            yield from _block_text(child.block, child.value)
+
+
+def extract_plain_text(stream_value):
+    """Plain text of a StreamField value, one paragraph per text fragment"""
+    if not stream_value:
+        return ''
+    return '\n\n'.join(
+        text.strip() for text in _block_text(stream_value.stream_block, stream_value)
+        if text.strip()
+    )
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def reading_time_minutes(word_count):
+    if not word_count:
+        return 0
+    return max(1, math.ceil(word_count / WORDS_PER_MINUTE))
+
+
+class PlainTextBodyMixin(models.Model):
+    """
+    Store the plain text, word count and reading time of the ``content``
+    StreamField, refreshed whenever the content itself is saved, so listings
+    and feeds never have to parse the StreamField JSON.
+    """
+
+    body_text = models.TextField(blank=True, editable=False, help_text="Plain text of the content")
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False, help_text="Estimated reading time in minutes")
+
+    PLAIN_TEXT_FIELDS = ('body_text', 'word_count', 'reading_time')
+
+    class Meta:
+        abstract = True
+
+    def update_plain_text(self):
+        self.body_text = extract_plain_text(self.content)
+        self.word_count = count_words(self.body_text)
+        self.reading_time = reading_time_minutes(self.word_count)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.update_plain_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.PLAIN_TEXT_FIELDS}
+        return super().save(*args, **kwargs)
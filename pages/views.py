@@ -1,3 +1,92 @@
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from wagtail.models import Page
 
-# Create your views here.
+from accounts.membership import is_member
+
+from . import search, sitemaps
+
+SITEMAP_CONTENT_TYPE = 'application/xml; charset=utf-8'
+
+SEARCH_RESULTS_PER_PAGE = 20
+
+
+def search_view(request):
+    """Public search over blog posts and projects"""
+    query = request.GET.get('q', '').strip()
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page_number = 1
+    offset = (page_number - 1) * SEARCH_RESULTS_PER_PAGE
+
+    results = []
+    if query:
+        if search.is_enabled():
+            results = search.search(
+                query,
+                include_members_only=is_member(request.user),
+                limit=SEARCH_RESULTS_PER_PAGE + 1,
+                offset=offset,
+            )
+        else:
+            pages = (
+                Page.objects.live().public()
+                .type(*search.get_search_models())
+                .specific()
+                .search(query)[offset:offset + SEARCH_RESULTS_PER_PAGE + 1]
+            )
+            results = [
+                (page, page.title, getattr(page, 'intro', '') or getattr(page, 'summary', ''))
+                for page in pages
+                if is_member(request.user) or not getattr(page, 'is_members_only', False)
+            ]
+
+    context = {
+        'query': query,
+        'results': results[:SEARCH_RESULTS_PER_PAGE],
+        'page_number': page_number,
+        'has_next': len(results) > SEARCH_RESULTS_PER_PAGE,
+    }
+    return render(request, 'pages/search_results.html', context)
+
+
+@require_safe
+def sitemap_index_view(request):
+    """Sitemap index listing one sitemap per shard of page ids"""
+    index = sitemaps.get_index()
+    lastmod = sitemaps.index_lastmod(index)
+    last_modified = int(lastmod.timestamp()) if lastmod else None
+
+    response = get_conditional_response(request, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(
+            sitemaps.render_index(index, request.build_absolute_uri),
+            content_type=SITEMAP_CONTENT_TYPE,
+        )
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+@require_safe
+def sitemap_view(request, shard):
+    """One shard of the sitemap, streamed while it is first rendered"""
+    index = sitemaps.get_index()
+    if shard not in index:
+        raise Http404
+    last_modified = int(index[shard].timestamp()) if index[shard] else None
+
+    response = get_conditional_response(request, last_modified=last_modified)
+    if response is None:
+        body = sitemaps.get_shard(shard)
+        if body is None:
+            response = StreamingHttpResponse(sitemaps.stream_shard(shard), content_type=SITEMAP_CONTENT_TYPE)
+        else:
+            response = HttpResponse(body, content_type=SITEMAP_CONTENT_TYPE)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseForbidden
+from django.utils.cache import get_conditional_response
+from wagtail import hooks
+
+from accounts.membership import is_member
+
+from . import conditional, page_cache, page_views, placeholders, renditions
+
+
+@hooks.register('before_serve_page')
+def require_membership(page, request, serve_args, serve_kwargs):
+    """Serve members-only posts and projects to members only"""
+    if not getattr(page, 'is_members_only', False) or is_member(request.user):
+        return None
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    return HttpResponseForbidden("Access denied. Members only.")
+
+
+@hooks.register('before_serve_page')
+def mark_page_cacheable(page, request, serve_args, serve_kwargs):
+    """Let the page cache middleware store this response for anonymous readers"""
+    if page_cache.is_cacheable_page(page) and not request.user.is_authenticated:
+        request.page_cache_tags = page_cache.tag_generations(page_cache.page_tags(page))
+
+
+@hooks.register('before_serve_page')
+def mark_page_view(page, request, serve_args, serve_kwargs):
+    """Let PageViewMiddleware count this view; registered before the 304 shortcut"""
+    if page_views.is_counted_page(page):
+        request.viewed_page_id = page.pk
+
+
+@hooks.register('before_serve_page')
+def answer_conditional_get(page, request, serve_args, serve_kwargs):
+    """Answer revalidations with 304 before the page's templates are rendered"""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    # Flash messages make the next render differ from the cached copy
+    if getattr(settings, 'MESSAGE_COOKIE_NAME', 'messages') in request.COOKIES:
+        return None
+    # Wagtail's privacy check only runs after these hooks; leave restricted
+    # pages to it, without validators that would let them skip it
+    if conditional.is_restricted(page):
+        return None
+
+    etag, last_modified = conditional.page_validators(page, request)
+    request.page_validators = (etag, last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        conditional.set_validator_headers(response, etag, last_modified)
+    return response
+
+
+@hooks.register('before_serve_page')
+def prefetch_page_images(page, request, serve_args, serve_kwargs):
+    """Load the renditions and placeholders of all the page's images together, not one image at a time"""
+    images = list(renditions.page_images(page))
+    if images:
+        renditions.prefetch_image_renditions(images)
+        placeholders.prefetch_placeholders([image for image, _ in images])